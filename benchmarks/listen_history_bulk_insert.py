@@ -0,0 +1,108 @@
+"""
+Benchmark of inserting a large listen history into the DB: the previous path (one dictionary per listen, inserted
+with ``DB.insert``) versus ``DB.bulk_insert`` (tuples streamed from the DataFrame's columns in a single transaction,
+with tuned pragmas), with and without rebuilding the table's secondary indexes after the load.
+
+Each scenario loads the same synthetic listen history into a new, empty DB file in a temporary folder.
+
+Run from the project's folder:
+    python -m benchmarks.listen_history_bulk_insert [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from logic.db import db_names as SPDBNM
+from logic.db.db import DB
+from logic.frontend import log
+
+DEFAULT_ROWS = 1000000
+
+COLUMNS_NAMES = [SPDBNM.TRACKS_LISTEN_HISTORY.USERNAME,
+                 SPDBNM.TRACKS_LISTEN_HISTORY.TIMESTAMP,
+                 SPDBNM.TRACKS_LISTEN_HISTORY.TRACK_ID,
+                 SPDBNM.TRACKS_LISTEN_HISTORY.MS_PLAYED,
+                 SPDBNM.TRACKS_LISTEN_HISTORY.REASON_START,
+                 SPDBNM.TRACKS_LISTEN_HISTORY.REASON_END,
+                 SPDBNM.TRACKS_LISTEN_HISTORY.SKIPPED,
+                 SPDBNM.TRACKS_LISTEN_HISTORY.PLATFORM,
+                 SPDBNM.TRACKS_LISTEN_HISTORY.CONN_COUNTRY,
+                 SPDBNM.TRACKS_LISTEN_HISTORY.URI,
+                 SPDBNM.TRACKS_LISTEN_HISTORY.SHUFFLE,
+                 SPDBNM.TRACKS_LISTEN_HISTORY.OFFLINE,
+                 SPDBNM.TRACKS_LISTEN_HISTORY.INCOGNITO_MODE]
+
+
+def make_listen_history(rows: int) -> pd.DataFrame:
+    """
+    Builds a synthetic listen history, prepared for insertion (like ``DB.insert_listen_history`` prepares it).
+
+    Parameters:
+        rows: Amount of listens.
+
+    Returns:
+        DataFrame of object columns, named as the listen history table's columns.
+    """
+    rng = np.random.default_rng(0)
+    tracks_ids = np.array([f"{track_number:022d}" for track_number in range(50000)], dtype = object)
+    time_stamps = pd.Timestamp('2017-01-01') + pd.to_timedelta(np.arange(rows) * 90, unit = 's')
+    track_ids = tracks_ids[rng.integers(0, len(tracks_ids), rows)]
+
+    return pd.DataFrame({
+        SPDBNM.TRACKS_LISTEN_HISTORY.USERNAME    : np.array(['user_a', 'user_b'], dtype = object)[
+            rng.integers(0, 2, rows)],
+        SPDBNM.TRACKS_LISTEN_HISTORY.TIMESTAMP   : time_stamps.strftime(DB.TIMESTAMP_FORMAT).astype(object),
+        SPDBNM.TRACKS_LISTEN_HISTORY.TRACK_ID    : track_ids,
+        SPDBNM.TRACKS_LISTEN_HISTORY.MS_PLAYED   : rng.integers(0, 300000, rows).astype(object),
+        SPDBNM.TRACKS_LISTEN_HISTORY.REASON_START: np.array(['trackdone', 'clickrow'], dtype = object)[
+            rng.integers(0, 2, rows)],
+        SPDBNM.TRACKS_LISTEN_HISTORY.REASON_END  : np.array(['trackdone', 'fwdbtn'], dtype = object)[
+            rng.integers(0, 2, rows)],
+        SPDBNM.TRACKS_LISTEN_HISTORY.SKIPPED     : '',
+        SPDBNM.TRACKS_LISTEN_HISTORY.PLATFORM    : np.array(['android', 'windows', 'ios'], dtype = object)[
+            rng.integers(0, 3, rows)],
+        SPDBNM.TRACKS_LISTEN_HISTORY.CONN_COUNTRY: np.array(['IL', 'US'], dtype = object)[rng.integers(0, 2, rows)],
+        SPDBNM.TRACKS_LISTEN_HISTORY.URI         : 'spotify:track:' + track_ids,
+        SPDBNM.TRACKS_LISTEN_HISTORY.SHUFFLE     : rng.integers(0, 2, rows).astype(bool).astype(object),
+        SPDBNM.TRACKS_LISTEN_HISTORY.OFFLINE     : False,
+        SPDBNM.TRACKS_LISTEN_HISTORY.INCOGNITO_MODE: False})
+
+
+def insert_dicts(db: DB, listen_history_df: pd.DataFrame) -> None:
+    """The previous insertion path of the listen history, kept here for comparison."""
+    db.insert(table_name = SPDBNM.TRACKS_LISTEN_HISTORY.TBL_NAME,
+              values = listen_history_df.to_dict('records'),
+              columns_names = COLUMNS_NAMES,
+              commit = True)
+
+
+def insert_bulk(db: DB, listen_history_df: pd.DataFrame, rebuild_indexes: bool) -> None:
+    db.bulk_insert(table_name = SPDBNM.TRACKS_LISTEN_HISTORY.TBL_NAME,
+                   rows = zip(*[listen_history_df[column_name] for column_name in COLUMNS_NAMES]),
+                   columns_names = COLUMNS_NAMES,
+                   commit = True,
+                   rebuild_indexes = rebuild_indexes)
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    listen_history_df = make_listen_history(rows)
+    log.set_level(log.WARNING)
+
+    scenarios = {'Dicts + DB.insert (previous)'   : lambda db: insert_dicts(db, listen_history_df),
+                 'Bulk insert'                    : lambda db: insert_bulk(db, listen_history_df, False),
+                 'Bulk insert + rebuilt indexes'  : lambda db: insert_bulk(db, listen_history_df, True)}
+
+    with tempfile.TemporaryDirectory() as folder_path:
+        for scenario_number, (name, scenario) in enumerate(scenarios.items()):
+            SPDBNM.DB_FILE_NAME = os.path.join(folder_path, f"bulk_insert_{scenario_number}.db")
+            db = DB()
+
+            start = time.perf_counter()
+            scenario(db)
+            elapsed_s = time.perf_counter() - start
+
+            db.close()
+            print(f"{name:<30}: {elapsed_s:7.2f} s, {rows / elapsed_s:12,.0f} rows per second")
@@ -0,0 +1,66 @@
+"""
+Benchmark of the memory allocated when the analytics get the listen history: a full copy of the listen history
+DataFrame (as ``Logic.get_listen_history_df`` used to return), versus a no-copy projection of it
+(``SpotifyDataSet.get_listen_history_view``).
+
+Reads the listen history from the local DB (see ``config.DB_FILE_NAME``).
+
+Run from the project's folder:
+    python -m benchmarks.listen_history_memory
+"""
+import tracemalloc
+from collections.abc import Callable
+import pandas as pd
+from logic.db.db import DB
+from logic.db import db_names as SPDBNM
+from logic.model.sp_data_set import SpotifyDataSet
+from logic.model.sp_data_set_names import SPDT as SPDTNM
+
+# The columns used by ``SpotifyDataSet.agg_unique_tracks_by_listens``:
+AGG_COLUMNS = [SPDBNM.V_KNOWN_LISTEN_HISTORY.TRACK_KNOWN_ID,
+               SPDBNM.V_KNOWN_LISTEN_HISTORY.TRACK_NAME,
+               SPDBNM.V_KNOWN_LISTEN_HISTORY.ALBUM_KNOWN_ID,
+               SPDBNM.V_KNOWN_LISTEN_HISTORY.ALBUM_NAME,
+               SPDBNM.V_KNOWN_LISTEN_HISTORY.ALBUM_ARTIST_ID,
+               SPDBNM.V_KNOWN_LISTEN_HISTORY.ALBUM_ARTIST_NAME,
+               SPDBNM.V_KNOWN_LISTEN_HISTORY.MS_PLAYED]
+
+
+def measure_peak_mb(func: Callable[[], object]) -> float:
+    """
+    Measures the peak memory allocated while calling the given function.
+
+    Parameters:
+        func: Function to call.
+
+    Returns:
+        Peak allocated memory, in megabytes.
+    """
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return peak / (1 << 20)
+
+
+def agg_tracks(tracks_df: pd.DataFrame) -> pd.DataFrame:
+    tracks_df = tracks_df[tracks_df[SPDTNM.MS_PLAYED].ne(0)]
+
+    return tracks_df.groupby(SPDTNM.TRACK_KNOWN_ID, observed = True).agg(
+        times_listened = (SPDTNM.TRACK_KNOWN_ID, 'count'),
+        total_listen_time = (SPDTNM.MS_PLAYED, 'sum'))
+
+
+if __name__ == '__main__':
+    spdt = SpotifyDataSet(db_handler = DB())
+    print(f"Listen history: {len(spdt.listen_history_df)} records, "
+          f"{SpotifyDataSet.get_memory_usage_mb(spdt.listen_history_df):.2f} MB.")
+
+    scenarios = {'Full copy'                 : lambda: spdt.listen_history_df.copy(),
+                 'View (all columns)'        : lambda: spdt.get_listen_history_view(),
+                 'Full copy + aggregation'   : lambda: agg_tracks(spdt.listen_history_df.copy()),
+                 'Projection + aggregation'  : lambda: agg_tracks(spdt.get_listen_history_view(AGG_COLUMNS))}
+
+    for name, scenario in scenarios.items():
+        print(f"{name:<26}: peak {measure_peak_mb(scenario):9.2f} MB")
@@ -0,0 +1,73 @@
+"""
+Benchmark of the per-call overhead of ``log.write``: the previous implementation (which extracted the whole call
+stack on every message to find the caller) versus the current one, for messages that are written (as text and as
+JSON lines) and for messages that are filtered out by the log level.
+
+The messages are printed to ``os.devnull``, so only the logging overhead is measured.
+
+Run from the project's folder:
+    python -m benchmarks.log_overhead
+"""
+import contextlib
+import datetime as dt
+import os
+import timeit
+import traceback
+from logic.frontend import log
+
+CALLS = 20000
+
+
+def write_with_stack_extraction(message: str) -> None:
+    """The previous implementation of ``log.write``, kept here for comparison."""
+    trace = traceback.extract_stack()
+
+    try:
+        last_call = next(item.name for item in trace if item.line.startswith('log.write('))
+        formatted_msg = "LOG: {0}\t: \tin: {1}\t:\t{2}".format(str(dt.datetime.now()), last_call, message)
+
+    except StopIteration:
+        formatted_msg = 'LOG ERROR'
+
+    print(formatted_msg)
+
+
+def insert_records_stack_extraction() -> None:
+    write_with_stack_extraction(log.INSERTING_RECORDS.format("``tracks``", 50))
+
+
+def insert_records() -> None:
+    log.write(log.INSERTING_RECORDS.format("``tracks``", 50), level = log.DEBUG)
+
+
+def measure_us_per_call(func) -> float:
+    """
+    Measures the average duration of a single call to the given function.
+
+    Parameters:
+        func: Function to call.
+
+    Returns:
+        Average duration of a call, in microseconds.
+    """
+    return timeit.timeit(func, number = CALLS) / CALLS * 1e6
+
+
+if __name__ == '__main__':
+    results = {}
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        results['Stack extraction (previous)'] = measure_us_per_call(insert_records_stack_extraction)
+
+        log.set_level(log.DEBUG)
+        log.set_format(log.TEXT_FORMAT)
+        results['Written, text'] = measure_us_per_call(insert_records)
+
+        log.set_format(log.JSON_FORMAT)
+        results['Written, JSON lines'] = measure_us_per_call(insert_records)
+
+        log.set_level(log.INFO)
+        results['Filtered out by level'] = measure_us_per_call(insert_records)
+
+    for name, us_per_call in results.items():
+        print(f"{name:<28}: {us_per_call:8.2f} us per call")
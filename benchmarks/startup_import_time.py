@@ -0,0 +1,61 @@
+"""
+Benchmark of the application's startup: the import time of its entry point and main modules (measured with
+``python -X importtime`` in a fresh interpreter each time), and which heavy dependencies each of them loads.
+
+Run from the project's folder:
+    python -m benchmarks.startup_import_time
+"""
+import subprocess
+import sys
+
+# Modules whose import time is measured (each in a fresh interpreter):
+MODULES = ['main',
+           'logic.app_logic',
+           'logic.model.spotify_api_client',
+           'logic.frontend.plotting']
+
+# Heavy dependencies that are reported when a module loads them:
+HEAVY_DEPENDENCIES = ['pandas', 'numpy', 'tekore', 'httpx', 'matplotlib', 'seaborn', 'tkinter', 'pyarrow']
+
+REPEATS = 5
+
+
+def measure_import(module_name: str) -> tuple[float, list[str]] | None:
+    """
+    Imports the given module in a fresh interpreter, with ``-X importtime``.
+
+    Parameters:
+        module_name: Name of the module to import.
+
+    Returns:
+        Tuple of the module's cumulative import time (in seconds) and the heavy dependencies it loaded,
+        or None if the module could not be imported (e.g. a missing optional dependency).
+    """
+    code = (f"import sys, {module_name}; "
+            f"print(','.join(m for m in {HEAVY_DEPENDENCIES!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output = True,
+                            text = True)
+
+    if result.returncode != 0:
+        return None
+
+    # Each stderr line is: "import time: <self us> | <cumulative us> | <indented module name>":
+    cumulative_us = next(int(line.split('|')[1])
+                         for line in reversed(result.stderr.splitlines())
+                         if line.split('|')[-1].strip() == module_name)
+    loaded_dependencies = [name for name in result.stdout.strip().split(',') if name != '']
+
+    return cumulative_us / 1e6, loaded_dependencies
+
+
+if __name__ == '__main__':
+    for module_name in MODULES:
+        measurements = [measure_import(module_name) for _ in range(REPEATS)]
+
+        if measurements[0] is None:
+            print(f"{module_name:<34}: could not be imported (missing dependency?)")
+            continue
+
+        best_s = min(seconds for seconds, _ in measurements)
+        print(f"{module_name:<34}: {best_s:6.3f} s (best of {REPEATS}), loads: {', '.join(measurements[0][1])}")
@@ -1,4 +1,5 @@
-# When executing for the first time, LISTEN_HISTORY_SRC should be = 'json':
+# When executing for the first time, LISTEN_HISTORY_SRC should be = 'json'.
+# When adding newly downloaded JSON files to an existing DB, LISTEN_HISTORY_SRC should be = 'json_incremental':
 LISTEN_HISTORY_SRC = 'db'
 
 # Default paths and prefixes for the data files:
@@ -6,5 +7,52 @@ JSON_FILE_PATH = 'data/personal_data/raw_json'
 JSON_FILE_PREFIX = 'endsong'
 DB_FILE_NAME = "data/personal_data/my_spotify_data.db"
 DB_SCHEMA_FILE_NAME = "logic/db/my_spotify_data_db_scheme.sql"
+# Bulk loads of at least this amount of rows drop the table's secondary indexes and rebuild them after the load:
+DB_BULK_REBUILD_INDEXES_MIN_ROWS = 100000
+# Bulk loads convert this amount of rows at a time into the DB's values:
+DB_BULK_INSERT_CHUNK_SIZE = 50000
 
+# Reading the listen history JSON files:
+# Amount of listen records to parse at a time from each file, or None for reading each file as a whole.
+JSON_CHUNK_SIZE = 10000
+# Amount of worker processes for reading the JSON files in parallel: None = one per CPU, 1 = read serially.
+JSON_READ_WORKERS = None
 
+# Columnar snapshot of the listen history, for fast loading on later starts (requires the optional package pyarrow).
+# It is rewritten whenever the data in the DB (or the DB schema) changes:
+LISTEN_HISTORY_SNAPSHOT_ON = True
+LISTEN_HISTORY_SNAPSHOT_FILE_NAME = "data/personal_data/listen_history.feather"
+
+# Local cache of the Spotify API's responses:
+API_CACHE_FILE_NAME = "data/personal_data/api_cache.db"
+# Amount of days each type of cached entity is kept before it is fetched again from the API:
+API_CACHE_TTL_DAYS = {'track'         : 30,
+                      'album'         : 30,
+                      'artist'        : 7,
+                      'audio_features': 365}
+API_CACHE_MAX_ENTRIES = 500000
+
+# Spotify API requests:
+# Maximal amount of concurrent requests, for operations that can only request a single entity at a time:
+API_MAX_WORKERS = 8
+# Maximal amount of times to retry a request that was rate-limited by the API:
+API_MAX_RETRIES = 5
+# Amount of entities to fetch and save in each batch of the enrichment pipeline (progress is saved after each batch):
+ENRICHMENT_BATCH_SIZE = 1000
+# Whether to fetch from the API only the tracks, albums and artists that are missing from the local DB:
+ENRICHMENT_SKIP_EXISTING = True
+# Whether to send independent API requests concurrently, using the asynchronous API client:
+API_ASYNC = True
+# Artists' discographies saved in the local DB are fetched again from the API after this amount of days:
+DISCOGRAPHY_MAX_AGE_DAYS = 30
+
+# Logging:
+# Minimal level of the messages written to the log: 'DEBUG', 'INFO', 'WARNING' or 'ERROR'.
+LOG_LEVEL = 'INFO'
+# Format of the log: 'text' for human-readable lines, or 'json' for JSON lines.
+LOG_FORMAT = 'text'
+
+# Run metrics (wall time per stage, API requests and retries, inserted rows):
+METRICS_ON = True
+# Folder in which a JSON report of the metrics is written at the end of each run:
+METRICS_REPORT_PATH = "data/personal_data/metrics"
@@ -1,13 +1,25 @@
-from logic.model.spotify_api_client import SpotifyAPIClient as spapi
+from __future__ import annotations
 from logic import general_utils as utl
 from logic.db.db import DB
 from logic.db import db_names as SPDBNM
 from logic.model.sp_data_set import SpotifyDataSet
+from logic.model import linkage_resolver
 from logic.model.sp_data_set_names import SPDT as SPDTNM
-from logic.frontend import plotting_names as PLTNM, log
-import numpy as np
+from logic.model.sp_data_set_names import PATH as SPDTPATH
+from logic.frontend import plotting_names as PLTNM, log, metrics
+import asyncio
+import config
+from collections.abc import Callable
+import os
 import pandas as pd
-import tekore as tk
+import sqlite3
+from typing import TYPE_CHECKING
+
+# Tekore and the API clients are imported only when the Spotify API is actually used, so working offline from the DB
+# starts faster:
+if TYPE_CHECKING:
+    import tekore as tk
+    from logic.model.spotify_api_client import SpotifyAPIClient as spapi
 
 
 class Logic:
@@ -20,7 +32,8 @@ class Logic:
             Represents the user's listen data and other Spotify data.
 
         _spapi: SpotifyAPIClient
-            Client for accessing the Spotify API.
+            Client for accessing the Spotify API. Created on first use, so working offline from the DB
+            requires no token.
 
         _db: DB
             Handles the local database.
@@ -28,6 +41,41 @@ class Logic:
 
     HISTORY_FROM_DB = 'db'
     HISTORY_FROM_JSON = 'json'
+    HISTORY_FROM_JSON_INCREMENTAL = 'json_incremental'
+
+    # Whether the full details of an Album's Track were saved (the popularity is only filled from a FullTrack,
+    # unlike the SimpleTracks of the artists' discographies):
+    ALBUM_TRACK_IS_FULL_CONDITION = f"""EXISTS (SELECT 1
+                                                FROM {SPDBNM.TRACKS.TBL_NAME}
+                                                WHERE {SPDBNM.TRACKS.TBL_NAME}.{SPDBNM.TRACKS.ID} =
+                                                      {SPDBNM.ALBUMS_TRACKS.TBL_NAME}.{SPDBNM.ALBUMS_TRACKS.TRACK_ID}
+                                                  AND {SPDBNM.TRACKS.POPULARITY} IS NOT NULL)"""
+
+    # For each stage of the enrichment pipeline, where to look for entities that already exist in the DB:
+    # (table, key column, additional condition).
+    # A Known Track was fetched as a relinked track only if its up-to-date album was already assigned to it and its
+    # full details were saved, and an Album was fetched only if its availability was already filled.
+    ENRICHMENT_STAGES_EXISTING_KEYS = {
+        SPDBNM.IMPORT_CHECKPOINTS.STAGE_ORIGINAL_TRACKS: (SPDBNM.LINKED_TRACKS.TBL_NAME,
+                                                         SPDBNM.LINKED_TRACKS.FROM_ID,
+                                                         None),
+        SPDBNM.IMPORT_CHECKPOINTS.STAGE_RELINKED_TRACKS: (SPDBNM.ALBUMS_TRACKS.TBL_NAME,
+                                                         SPDBNM.ALBUMS_TRACKS.TRACK_ID,
+                                                         ALBUM_TRACK_IS_FULL_CONDITION),
+        SPDBNM.IMPORT_CHECKPOINTS.STAGE_AUDIO_FEATURES : (SPDBNM.TRACKS_AUDIO_FEATURES.TBL_NAME,
+                                                         SPDBNM.TRACKS_AUDIO_FEATURES.TRACK_ID,
+                                                         None),
+        SPDBNM.IMPORT_CHECKPOINTS.STAGE_ALBUMS         : (SPDBNM.ALBUMS.TBL_NAME,
+                                                         SPDBNM.ALBUMS.ID,
+                                                         f"{SPDBNM.ALBUMS.IS_AVAILABLE} IS NOT NULL"),
+        SPDBNM.IMPORT_CHECKPOINTS.STAGE_ARTISTS        : (SPDBNM.ARTISTS.TBL_NAME,
+                                                         SPDBNM.ARTISTS.ID,
+                                                         None)}
+
+    # Album groups (values of ``tk.model.AlbumGroup``) that make up an artist's discography, unless requested
+    # otherwise:
+    DEFAULT_DISCOGRAPHY_ALBUM_GROUPS = ['album',
+                                        'appears_on']
 
     # region Utility Methods
 
@@ -57,23 +105,28 @@ class Logic:
     # region Saving data
 
     @staticmethod
-    def _add_track_to_list_to_save(full_track: tk.model.FullTrack,
-                                   all_tracks_list: list[dict]) -> None:
+    def _add_track_to_save(full_track: tk.model.FullTrack | tk.model.SimpleTrack,
+                           all_tracks: dict[str, dict]) -> None:
         """
         From a given :class:`tk.model.FullTrack` object, takes the **Track** attributes and adds them to a given
-        list of named dictionaries.
+        dictionary of named dictionaries, keyed by the track's ID (so a track that is added again replaces itself).
 
         **This changes the given collection (inplace = True)**.
 
         Parameters:
-            full_track: FullTrack object, from which to take the relevant attributes.
+            full_track: FullTrack object, from which to take the relevant attributes. Can also be a SimpleTrack,
+                in which case the attributes that only a FullTrack has (popularity and ISRC) are left empty.
 
-            all_tracks_list: List of all the tracks that are supposed to later be saved into the DB.
+            all_tracks: Dictionary of all the tracks that are supposed to later be saved into the DB.
 
         Returns:
             None - This method changed the given collection.
         """
+        import tekore as tk
+
         if full_track is not None:
+            is_full_track = isinstance(full_track, tk.model.FullTrack)
+
             # Building a named dictionary from the given FullTrack:
             track_dict_to_insert = {SPDBNM.TRACKS.ID          : full_track.id,
                                     SPDBNM.TRACKS.NAME        : full_track.name,
@@ -81,30 +134,30 @@ class Logic:
                                     SPDBNM.TRACKS.DISC_NUMBER : full_track.disc_number,
                                     SPDBNM.TRACKS.TRACK_NUMBER: full_track.track_number,
                                     SPDBNM.TRACKS.EXPLICIT    : full_track.explicit,
-                                    SPDBNM.TRACKS.POPULARITY  : full_track.popularity,
+                                    SPDBNM.TRACKS.POPULARITY  : full_track.popularity if is_full_track else None,
                                     SPDBNM.TRACKS.IS_LOCAL    : full_track.is_local,
                                     SPDBNM.TRACKS.IS_PLAYABLE : full_track.is_playable,
-                                    SPDBNM.TRACKS.ISRC        : full_track.external_ids['isrc'] if len(
-                                        full_track.external_ids) > 0 else None,
+                                    SPDBNM.TRACKS.ISRC        : full_track.external_ids.get(
+                                        'isrc') if is_full_track else None,
                                     SPDBNM.TRACKS.HREF        : full_track.href,
                                     SPDBNM.TRACKS.URI         : full_track.uri,
                                     SPDBNM.TRACKS.PREVIEW_URL : full_track.preview_url}
 
-            all_tracks_list.append(track_dict_to_insert)
+            all_tracks[full_track.id] = track_dict_to_insert
 
     @staticmethod
-    def _add_track_audio_features_to_list_to_save(track_features: tk.model.AudioFeatures,
-                                                  all_tracks_audio_features_list: list[dict]) -> None:
+    def _add_track_audio_features_to_save(track_features: tk.model.AudioFeatures,
+                                          all_tracks_audio_features: dict[str, dict]) -> None:
         """
         From a given :class:`tk.model.AudioFeatures` object, takes its attributes and adds them to a given
-        list of named dictionaries.
+        dictionary of named dictionaries, keyed by the track's ID.
 
         **This changes the given collection (inplace = True)**.
 
         Parameters:
             track_features: AudioFeatures object, from which to take the relevant attributes.
 
-            all_tracks_audio_features_list: List of all tracks' audio features that are supposed
+            all_tracks_audio_features: Dictionary of all tracks' audio features that are supposed
             to later be saved into the DB.
 
         Returns:
@@ -127,62 +180,71 @@ class Logic:
                 SPDBNM.TRACKS_AUDIO_FEATURES.SPEECHINESS     : track_features.speechiness,
                 SPDBNM.TRACKS_AUDIO_FEATURES.VALENCE         : track_features.valence}
 
-            all_tracks_audio_features_list.append(track_features_dict_to_insert)
+            all_tracks_audio_features[track_features.id] = track_features_dict_to_insert
 
     @staticmethod
-    def _add_album_to_list_to_save(full_track: tk.model.FullTrack,
-                                   all_albums_list: list[dict],
-                                   all_albums_ids: set) -> None:
+    def _add_album_to_save(full_track: tk.model.FullTrack,
+                           all_albums: dict[str, dict]) -> None:
         """
         From a given :class:`tk.model.FullTrack` object, takes the **Album** attributes and adds them to a given
-        list of named dictionaries. Also adds the AlbumID to another given set.
+        dictionary of named dictionaries, keyed by the album's ID (its keys are later used for fetching missing data).
 
-        **This changes the given collections (inplace = True)**.
+        **This changes the given collection (inplace = True)**.
 
         Parameters:
             full_track: FullTrack object, from which to take the relevant attributes.
 
-            all_albums_list: List of named dicts, each dict contains an album that is supposed to be saved into the
+            all_albums: Dictionary of named dicts, each dict contains an album that is supposed to be saved into the
                 DB later.
 
-            all_albums_ids: Set of all Album IDs, later used for fetching missing data.
-
         Returns:
-            None - This method changed the given collections.
+            None - This method changed the given collection.
         """
         # Regardless to whether the track or album are linked or not, building a collection of all Albums:
-        album_dict_to_insert = {SPDBNM.ALBUMS.ID                    : full_track.album.id,
-                                SPDBNM.ALBUMS.NAME                  : full_track.album.name,
-                                SPDBNM.ALBUMS.TOTAL_TRACKS          : full_track.album.total_tracks,
-                                SPDBNM.ALBUMS.RELEASE_DATE          : full_track.album.release_date,
-                                SPDBNM.ALBUMS.RELEASE_DATE_PRECISION: full_track.album.release_date_precision.value,
-                                SPDBNM.ALBUMS.ALBUM_TYPE            : full_track.album.album_type.value,
-                                SPDBNM.ALBUMS.IS_AVAILABLE          : None,
-                                SPDBNM.ALBUMS.HREF                  : full_track.album.href,
-                                SPDBNM.ALBUMS.URI                   : full_track.album.uri}
-
-        all_albums_list.append(album_dict_to_insert)
-        all_albums_ids.add(full_track.album.id)
+        all_albums[full_track.album.id] = Logic._get_album_dict_to_save(full_track.album)
 
     @staticmethod
-    def _add_artists_to_list_to_save(full_track: tk.model.FullTrack,
-                                     all_artists_list: list[dict] = None,
-                                     all_artists_ids: set = None,
-                                     all_artists_albums_list: list[dict] = None) -> None:
+    def _get_album_dict_to_save(album: tk.model.Album) -> dict:
+        """
+        From a given :class:`tk.model.Album` object, takes the **Album** attributes into a named dictionary.
+        The album's availability is left empty, to be filled later, so the dict must not replace an album that
+        already exists in the DB.
+
+        Parameters:
+            album: Album object, from which to take the relevant attributes.
+
+        Returns:
+            Named dictionary of the album's attributes.
+        """
+        return {SPDBNM.ALBUMS.ID                    : album.id,
+                SPDBNM.ALBUMS.NAME                  : album.name,
+                SPDBNM.ALBUMS.TOTAL_TRACKS          : album.total_tracks,
+                SPDBNM.ALBUMS.RELEASE_DATE          : album.release_date,
+                SPDBNM.ALBUMS.RELEASE_DATE_PRECISION: album.release_date_precision.value,
+                SPDBNM.ALBUMS.ALBUM_TYPE            : album.album_type.value,
+                SPDBNM.ALBUMS.IS_AVAILABLE          : None,
+                SPDBNM.ALBUMS.HREF                  : album.href,
+                SPDBNM.ALBUMS.URI                   : album.uri}
+
+    @staticmethod
+    def _add_artists_to_save(full_track: tk.model.FullTrack,
+                             all_artists: dict[str, dict] = None,
+                             all_artists_ids: set = None,
+                             all_artists_albums: dict[tuple[str, str], dict] = None) -> None:
         """
         From a given :class:`tk.model.FullTrack` object, takes the **Artists** attributes
-        (:class:`tk.model.SimpleArtist`) and adds them to a given list of named dictionaries.
-        Also, adds the Artist's Album to another list of named dicts.
+        (:class:`tk.model.SimpleArtist`) and adds them to a given dictionary of named dictionaries, keyed by the
+        artist's ID. Also, adds the Artist's Album to another dictionary of named dicts, keyed by both IDs.
 
         **This changes the given collections (inplace = True)**.
 
         Parameters:
             full_track: FullTrack object, from which to take the relevant attributes.
 
-            all_artists_list: List of dicts, each dict contains an Artist that is supposed to be saved into the DB
+            all_artists: Dictionary of dicts, each dict contains an Artist that is supposed to be saved into the DB
                 later.
 
-            all_artists_albums_list: List of dicts, each dict contains a link between the Artist and their Album.
+            all_artists_albums: Dictionary of dicts, each dict contains a link between the Artist and their Album.
 
             all_artists_ids: Set of all Artist IDs, later used for fetching missing data.
 
@@ -191,14 +253,14 @@ class Logic:
         """
         # Building a collection of all Artists:
         for simple_artist in full_track.artists:
-            if all_artists_list is not None:
-                Logic._add_artist_dict_to_list(artist = simple_artist,
-                                               all_artists_list = all_artists_list)
+            if all_artists is not None:
+                Logic._add_artist_to_save(artist = simple_artist,
+                                          all_artists = all_artists)
 
             if all_artists_ids is not None:
                 all_artists_ids.add(simple_artist.id)
 
-            if all_artists_albums_list is not None:
+            if all_artists_albums is not None:
                 # Building a collection of all Albums-of-Artists.
                 # Only the track's Artists that also belong to the Track's Album's Artists (except when related to it
                 # with 'Appears On' relationship) are collected.
@@ -209,35 +271,37 @@ class Logic:
                                                    SPDBNM.ARTISTS_ALBUMS.ALBUM_ID   : full_track.album.id,
                                                    SPDBNM.ARTISTS_ALBUMS.ALBUM_GROUP: None}
 
-                    all_artists_albums_list.append(artist_album_dict_to_insert)
+                    all_artists_albums[(simple_artist.id, full_track.album.id)] = artist_album_dict_to_insert
 
     @staticmethod
-    def _add_artist_dict_to_list(artist: tk.model.Artist,
-                                 all_artists_list: list[dict],
-                                 all_genres_set: set = None,
-                                 all_artists_genres: list[dict] = None) -> None:
+    def _add_artist_to_save(artist: tk.model.Artist,
+                            all_artists: dict[str, dict],
+                            all_genres_set: set = None,
+                            all_artists_genres: dict[tuple[str, str], dict] = None) -> None:
         """
         From a given :class:`tk.model.Artist` object, takes its attributes and adds them to the given
-        list of dictionaries ``all_artists_list``.
+        dictionary of dictionaries ``all_artists``, keyed by the artist's ID.
 
         If ``artist`` is a :class:`tk.model.FullArtist`, this also builds a set of Genres' names (independent),
-        and builds another list linking the artist to its genres.
+        and builds another dictionary linking the artist to its genres, keyed by both.
 
         **This changes the given collections (inplace = True)**.
 
         Parameters:
             artist: SimpleArtist or FullArtist object, from which to take the relevant attributes.
 
-            all_artists_list: List of dicts, each dict contains an Artist that is supposed to be saved into the DB
+            all_artists: Dictionary of dicts, each dict contains an Artist that is supposed to be saved into the DB
                 later.
 
             all_genres_set: Set of strings, containing the genre names that are in the artist's attributes.
 
-            all_artists_genres: List of dicts, each dict linking the artist to one of its genres.
+            all_artists_genres: Dictionary of dicts, each dict linking the artist to one of its genres.
 
         Returns:
             None - This method changed the given collections.
         """
+        import tekore as tk
+
         match artist:
             case tk.model.SimpleArtist() as artist:
                 artist_dict_to_insert = {SPDBNM.ARTISTS.ID             : artist.id,
@@ -258,8 +322,8 @@ class Logic:
                 if all_genres_set is not None:
                     for genre in artist.genres:
                         all_genres_set.add(genre)
-                        all_artists_genres.append({SPDBNM.ARTISTS_GENRES.ARTIST_ID : artist.id,
-                                                   SPDBNM.ARTISTS_GENRES.GENRE_NAME: genre})
+                        all_artists_genres[(artist.id, genre)] = {SPDBNM.ARTISTS_GENRES.ARTIST_ID : artist.id,
+                                                                  SPDBNM.ARTISTS_GENRES.GENRE_NAME: genre}
 
             case tk.model.LocalArtist() as artist:
                 # Not supported at the moment
@@ -269,7 +333,7 @@ class Logic:
                 artist_dict_to_insert = None
 
         if artist_dict_to_insert is not None:
-            all_artists_list.append(artist_dict_to_insert)
+            all_artists[artist.id] = artist_dict_to_insert
 
     def save_listen_history_to_csv(self, filename: str = 'all_tracks_raw_{0}.csv') -> None:
         """
@@ -286,268 +350,725 @@ class Logic:
 
         utl.write_df_to_file(self.spdt.listen_history_df, track_file_name)
 
-    def collect_data_and_save(self, to_csv_also: bool = False):
+    def _fetch_concurrently(self, *requests: tuple[str, str | set | list | pd.Series]) -> list:
         """
-        Collects all listen history, extracts its data into models (tracks, artists, etc.),
-        fetches additional data from the API, and saves it all in the local DB.
-        Then, replaces the inner :class:`SPDT.SpotifyDataSet` dataset manager with a new manager
-        containing all the updated data.
+        Sends independent API requests, and returns their results.
+
+        When ``config.API_ASYNC`` is on, all the requests (and all the chunks of each request) are sent concurrently
+        using :class:`AsyncSpotifyAPIClient`. Otherwise, they are sent one after another using the synchronous client.
 
         Parameters:
-            to_csv_also: Whether to also save the listen history to a CSV file, after saving into the DB.
+            requests: Tuples, each containing the name of an API client method that fetches models by IDs
+                (e.g. 'get_full_tracks'), and the IDs to send to that method.
+
+        Returns:
+            List of the requests' results, in the order of the given requests.
+        """
+        if not config.API_ASYNC:
+            return [getattr(self.spapi, method_name)(ids) for method_name, ids in requests]
+
+        from logic.model.async_spotify_api_client import AsyncSpotifyAPIClient
+
+        async def fetch_all() -> list:
+            async_client = AsyncSpotifyAPIClient(self.spapi)
+
+            try:
+                return list(await asyncio.gather(*[getattr(async_client, method_name)(ids)
+                                                   for method_name, ids in requests]))
+
+            finally:
+                await async_client.close()
+
+        return asyncio.run(fetch_all())
+
+    def _save_original_tracks(self, full_tracks: tk.model.ModelList[tk.model.FullTrack]) -> None:
+        """
+        Saves a batch of the listened tracks (the "original" tracks, as they appear in the listen history) into the
+        DB, along with their linkage to their Known Tracks, their Albums and their Artists' Albums.
+        Then, adds the discovered Known Tracks, Albums and Artists to the queues of the next stages.
+
+        Parameters:
+            full_tracks: FullTracks fetched for the original tracks' IDs.
 
         Returns:
             None.
         """
-        all_tracks_list_to_insert = []
-        all_linked_tracks_list_to_insert = []
-        all_tracks_features_list_to_insert = []
-        all_linked_albums_list_to_insert = []
-        all_artists_list_to_insert = []
-        all_genres_set_to_insert = set()
-        all_artists_genres_list_to_insert = []
-        all_albums_list_to_insert = []
-        all_albums_tracks_list_to_insert = []
-        all_artists_albums_list_to_insert = []
-
-        map_known_tracks_to_albums = {}
-        map_albums_to_tracks = {}
+        # The records to insert, keyed by their tables' primary keys (so each record is inserted once):
+        tracks_to_insert = {}
+        linked_tracks_to_insert = {}
+        albums_to_insert = {}
+        albums_tracks_to_insert = {}
+        artists_albums_to_insert = {}
+
+        artists_ids_set = set()
+        ids_of_non_linked_tracks = set()
         known_ids_of_linked_tracks = set()
-        map_linked_to_known_tracks = {}
-        map_linked_to_known_albums = {}
-        all_known_tracks_ids_set = set()
-        all_suspected_album_ids = set()
-        all_albums_ids_set = set()
-        all_artists_ids_set = set()
 
-        try:
-            log.write(log.GETTING_ORIGINAL_TRACKS)
+        for full_track in full_tracks:
+            if full_track is None:
+                continue
+
+            Logic._add_track_to_save(full_track, tracks_to_insert)
+
+            # A Track sometimes change its ID, because of many reasons. The old TrackID is then regarded as
+            # a 'LinkedFrom' Track, which is Relinked to its current, up-to-date, 'Known' Track, this linkage can be
+            # fetched from the API. The problem is, *Albums* too can be Relinked, but the API does not supply this
+            # information in a direct or confident way.
+            # I need this linkage, OldAlbumID <-> KnownAlbumID, to correctly count the unique albums
+            # in the listen history.
+            #
+            # The API *does* give me the following information (in the ``full_tracks`` object):
+            # 1. Linkage between an obsolete LinkedFrom TrackID and its 'suspected as obsolete' AlbumID;
+            # 2. Linkage between an obsolete LinkedFrom TrackID and its up-to-date 'Known' TrackID;
+            # 3. Linkage between a Known TrackID and its up-to-date AlbumID.
+            #
+            # Therefore, all those links are saved in the DB (tables `albums_tracks` and `linked_tracks`) by the
+            # tracks' stages, and the linkage stage then goes along the link chain, for each OldAlbumID:
+            # OldAlbumID -> LinkedFromTrackID -> KnownTrackID -> KnownAlbumID,
+            # and saves the mapping of each OldAlbumID to its KnownAlbumID in the DB table `linked_albums`.
+            if full_track.linked_from is None:
+                # --Non-Linked track, which means its Album is also not Linked--
+                ids_of_non_linked_tracks.add(full_track.id)
+
+                # "Fake-linking" the Track ID to itself, to maintain consistency later in the DB:
+                linked_tracks_to_insert[full_track.id] = {SPDBNM.LINKED_TRACKS.FROM_ID    : full_track.id,
+                                                          SPDBNM.LINKED_TRACKS.RELINKED_ID: full_track.id}
+
+                # Assigning the Track ID to the Album ID:
+                albums_tracks_to_insert[(full_track.album.id, full_track.id)] = {
+                    SPDBNM.ALBUMS_TRACKS.ALBUM_ID: full_track.album.id,
+                    SPDBNM.ALBUMS_TRACKS.TRACK_ID: full_track.id}
+
+            else:
+                # --Linked Track, which means its Album is also suspected as Linked--
+                known_ids_of_linked_tracks.add(full_track.id)
+
+                # Linking the Track's LinkedFrom ID to the Track ID:
+                linked_tracks_to_insert[full_track.linked_from.id] = {
+                    SPDBNM.LINKED_TRACKS.FROM_ID    : full_track.linked_from.id,
+                    SPDBNM.LINKED_TRACKS.RELINKED_ID: full_track.id}
+
+                # Linking the (suspected as linked) Album ID to the Track's LinkedFrom ID:
+                albums_tracks_to_insert[(full_track.album.id, full_track.linked_from.id)] = {
+                    SPDBNM.ALBUMS_TRACKS.ALBUM_ID: full_track.album.id,
+                    SPDBNM.ALBUMS_TRACKS.TRACK_ID: full_track.linked_from.id}
+
+            Logic._add_album_to_save(full_track, albums_to_insert)
+
+            Logic._add_artists_to_save(full_track = full_track,
+                                       all_artists_ids = artists_ids_set,
+                                       all_artists_albums = artists_albums_to_insert)
+
+        self.db.insert_tracks(list(tracks_to_insert.values()))
+        self.db.insert_linked_tracks(list(linked_tracks_to_insert.values()))
+        # Not replacing existing albums, so the availability already filled for them is kept:
+        self.db.insert_albums(list(albums_to_insert.values()), replace = False)
+        self.db.insert_albums_tracks(list(albums_tracks_to_insert.values()))
+        # Not replacing existing links, so the album groups saved with the artists' discographies are kept:
+        self.db.insert_artists_albums(list(artists_albums_to_insert.values()), replace = False)
+
+        # A non-linked FullTrack already contains the up-to-date KnownAlbumID I need, so there's no need to fetch
+        # it again as a Relinked Track:
+        self.db.mark_checkpoints_done(SPDBNM.IMPORT_CHECKPOINTS.STAGE_RELINKED_TRACKS, ids_of_non_linked_tracks)
+        self.db.enqueue_checkpoints(SPDBNM.IMPORT_CHECKPOINTS.STAGE_RELINKED_TRACKS, known_ids_of_linked_tracks)
+
+        # Getting the Audio Features for all the unique known tracks:
+        self.db.enqueue_checkpoints(SPDBNM.IMPORT_CHECKPOINTS.STAGE_AUDIO_FEATURES,
+                                    ids_of_non_linked_tracks.union(known_ids_of_linked_tracks))
+        self.db.enqueue_checkpoints(SPDBNM.IMPORT_CHECKPOINTS.STAGE_ALBUMS, list(albums_to_insert))
+        self.db.enqueue_checkpoints(SPDBNM.IMPORT_CHECKPOINTS.STAGE_ARTISTS, artists_ids_set)
+
+    def _save_relinked_tracks(self, known_full_tracks: tk.model.ModelList[tk.model.FullTrack]) -> None:
+        """
+        Saves a batch of Known Tracks, which other listened tracks were relinked to, into the DB, along with their
+        (up-to-date) Albums and their Artists' Albums. Then, adds the discovered Albums and Artists to the queues of
+        the next stages.
 
-            full_tracks = self.spapi.get_full_tracks(self.spdt.listen_history_df[SPDTNM.TRACK_ID])
-
-            for full_track in full_tracks:
-                Logic._add_track_to_list_to_save(full_track, all_tracks_list_to_insert)
-
-                # A Track sometimes change its ID, because of many reasons. The old TrackID is then regarded as
-                # a 'LinkedFrom' Track, which is Relinked to its current, up-to-date, 'Known' Track, this linkage can be
-                # fetched from the API. The problem is, *Albums* too can be Relinked, but the API does not supply this
-                # information in a direct or confident way.
-                # I need this linkage, OldAlbumID <-> KnownAlbumID, to correctly count the unique albums
-                # in the listen history.
-                #
-                # The API *does* give me the following information (in the ``full_tracks`` object):
-                # 1. Linkage between an obsolete LinkedFrom TrackID and its 'suspected as obsolete' AlbumID;
-                # 2. Linkage between an obsolete LinkedFrom TrackID and its up-to-date 'Known' TrackID;
-                # 3. Linkage between a Known TrackID and its up-to-date AlbumID.
-                #
-                # Therefore, my plan is to go along the link chain as follows:
-                # 1. Collect all those links: LinkedFromTrackIDs <-> OldAlbumIDs,
-                #                             LinkedFromTrackIDs <-> KnownTrackIDs,
-                #                             KnownTrackIDs <-> KnownAlbumIDs;
-                # 2. For each OldAlbumID:
-                # 2.a. Find its tracks in the list of LinkedFromTrackIDs;
-                # 2.b. For the found LinkedFromTrackID, get the KnownTrackID;
-                # 2.c. For the found KnownTrackID, get the KnownAlbumID and write it for the current OldAlbumID.
-                # 3. End up with a mapping of each OldAlbumID to its KnownAlbumID, and
-                #    insert it to the DB table `linked_albums`.
-                if full_track.linked_from is None:
-                    # The track is considered as Known, as it is:
-                    all_known_tracks_ids_set.add(full_track.id)
-
-                    # --Non-Linked track, which means its Album is also not Linked--
-                    # "Fake-linking" the Track ID to itself, to maintain consistency later in the DB:
-                    linked_track_dict_to_insert = {SPDBNM.LINKED_TRACKS.FROM_ID    : full_track.id,
-                                                   SPDBNM.LINKED_TRACKS.RELINKED_ID: full_track.id}
-
-                    # "Fake-linking" the Album ID to itself, to maintain consistency later in the DB:
-                    linked_album_dict_to_insert = {SPDBNM.LINKED_ALBUMS.FROM_ID    : full_track.album.id,
-                                                   SPDBNM.LINKED_ALBUMS.RELINKED_ID: full_track.album.id}
-
-                    all_linked_albums_list_to_insert.append(linked_album_dict_to_insert)
-
-                    # Assigning the Track ID to the Album ID:
-                    album_track_dict_to_insert = {SPDBNM.ALBUMS_TRACKS.ALBUM_ID: full_track.album.id,
-                                                  SPDBNM.ALBUMS_TRACKS.TRACK_ID: full_track.id}
-
-                    # ----- Comment is obsolete and awaiting deletion. Code itself is up-to-date. ----
-                    # -- A track *is not supposed* to belong to more than one album. I hope I don't override
-                    # -- an existing TrackID Key with a different AlbumID Value:
-                    map_known_tracks_to_albums[full_track.id] = full_track.album.id
-
-                    utl.add_to_mapping_of_sets(mapping = map_albums_to_tracks,
-                                               key = full_track.album.id,
-                                               value = full_track.id)
-
-                    map_linked_to_known_tracks[full_track.id] = full_track.id
-
-                    # If the current FullTrack is for the KnownID of a track that was previously determined as
-                    # relinked to another LinkedFromTrack, it means that this FullTrack object contains the up-to-date
-                    # KnownAlbumID I need. Thus, I don't need to fetch it later, so I remove it:
-                    if known_ids_of_linked_tracks is not None and full_track.id in known_ids_of_linked_tracks:
-                        known_ids_of_linked_tracks.discard(full_track.id)
-
-                else:
-                    # --Linked Track, which means its Album is also suspected as Linked--
-                    # Linking the Track's LinkedFrom ID to the Track ID:
-                    linked_track_dict_to_insert = {SPDBNM.LINKED_TRACKS.FROM_ID    : full_track.linked_from.id,
-                                                   SPDBNM.LINKED_TRACKS.RELINKED_ID: full_track.id}
-
-                    # Linking the (suspected as linked) Album ID to the Track's LinkedFrom ID:
-                    album_track_dict_to_insert = {SPDBNM.ALBUMS_TRACKS.ALBUM_ID: full_track.album.id,
-                                                  SPDBNM.ALBUMS_TRACKS.TRACK_ID: full_track.linked_from.id}
-
-                    utl.add_to_mapping_of_sets(mapping = map_albums_to_tracks,
-                                               key = full_track.album.id,
-                                               value = full_track.linked_from.id)
-
-                    map_linked_to_known_tracks[full_track.linked_from.id] = full_track.id
-
-                    known_ids_of_linked_tracks.add(full_track.id)
-
-                    # Trying to use a previously-saved link, to build the mapping during the loop:
-                    known_album_id = map_linked_to_known_albums.get(full_track.album.id)
-
-                    if known_album_id is None:
-                        # Trying to go along the link chain:
-                        track_known_id = map_linked_to_known_tracks[full_track.linked_from.id]
-                        known_album_id = map_known_tracks_to_albums.get(track_known_id)
-
-                    if known_album_id is None:
-                        all_suspected_album_ids.add(full_track.album.id)
-
-                    else:
-                        map_linked_to_known_albums[full_track.album.id] = known_album_id
-
-                        linked_album_dict_to_insert = {SPDBNM.LINKED_ALBUMS.FROM_ID    : full_track.album.id,
-                                                       SPDBNM.LINKED_ALBUMS.RELINKED_ID: known_album_id}
-
-                        all_linked_albums_list_to_insert.append(linked_album_dict_to_insert)
-
-                all_linked_tracks_list_to_insert.append(linked_track_dict_to_insert)
-                all_albums_tracks_list_to_insert.append(album_track_dict_to_insert)
-
-                Logic._add_album_to_list_to_save(full_track, all_albums_list_to_insert, all_albums_ids_set)
-
-                Logic._add_artists_to_list_to_save(full_track = full_track,
-                                                   # all_artists_list = all_artists_list_to_insert,
-                                                   all_artists_ids = all_artists_ids_set,
-                                                   all_artists_albums_list = all_artists_albums_list_to_insert)
-
-            # I've collected the ID's of only the tracks that are Relinked from other tracks.
-            # Here, fetching FullTrack attributes only for those relinked tracks (their IDs were just discovered
-            # looping over the original FullTracks list, and now I need the rest of their attributes):
-            log.write(log.GETTING_RELINKED_TRACKS)
-            known_full_tracks = self.spapi.get_full_tracks(tracks_ids = known_ids_of_linked_tracks)
+        Parameters:
+            known_full_tracks: FullTracks fetched for the Known Tracks' IDs.
+
+        Returns:
+            None.
+        """
+        # The records to insert, keyed by their tables' primary keys (so each record is inserted once):
+        tracks_to_insert = {}
+        albums_to_insert = {}
+        albums_tracks_to_insert = {}
+        artists_albums_to_insert = {}
+
+        artists_ids_set = set()
+
+        for known_full_track in known_full_tracks:
+            if known_full_track is None:
+                continue
 
-            # Getting the Audio Features for all the unique known tracks:
-            all_known_tracks_ids_set.union(known_ids_of_linked_tracks)
+            Logic._add_track_to_save(known_full_track, tracks_to_insert)
 
-            tracks_audio_features = self.spapi.get_tracks_audio_features(all_known_tracks_ids_set)
+            albums_tracks_to_insert[(known_full_track.album.id, known_full_track.id)] = {
+                SPDBNM.ALBUMS_TRACKS.ALBUM_ID: known_full_track.album.id,
+                SPDBNM.ALBUMS_TRACKS.TRACK_ID: known_full_track.id}
 
-            for track_features in tracks_audio_features:
-                Logic._add_track_audio_features_to_list_to_save(track_features, all_tracks_features_list_to_insert)
+            Logic._add_album_to_save(known_full_track, albums_to_insert)
 
-            # Building lists of the Tracks, Artists and Albums:
-            for known_full_track in known_full_tracks:
-                map_known_tracks_to_albums[known_full_track.id] = known_full_track.album.id
+            Logic._add_artists_to_save(known_full_track,
+                                       all_artists_ids = artists_ids_set,
+                                       all_artists_albums = artists_albums_to_insert)
 
-                utl.add_to_mapping_of_sets(mapping = map_albums_to_tracks,
-                                           key = known_full_track.album.id,
-                                           value = known_full_track.id)
+        self.db.insert_tracks(list(tracks_to_insert.values()))
+        # Not replacing existing albums, so the availability already filled for them is kept:
+        self.db.insert_albums(list(albums_to_insert.values()), replace = False)
+        self.db.insert_albums_tracks(list(albums_tracks_to_insert.values()))
+        # Not replacing existing links, so the album groups saved with the artists' discographies are kept:
+        self.db.insert_artists_albums(list(artists_albums_to_insert.values()), replace = False)
 
-                Logic._add_track_to_list_to_save(known_full_track, all_tracks_list_to_insert)
+        self.db.enqueue_checkpoints(SPDBNM.IMPORT_CHECKPOINTS.STAGE_ALBUMS, list(albums_to_insert))
+        self.db.enqueue_checkpoints(SPDBNM.IMPORT_CHECKPOINTS.STAGE_ARTISTS, artists_ids_set)
 
-                Logic._add_album_to_list_to_save(known_full_track, all_albums_list_to_insert, all_albums_ids_set)
+    def _save_linkage(self, listened_tracks_ids: set | list) -> set[str]:
+        """
+        Resolves the linkage of the given listened tracks and their albums to their Known Tracks and Known Albums
+        (see :mod:`logic.model.linkage_resolver`), and saves it into the DB.
+
+        Only the links that resolving the given tracks depends on are read from the DB (the links of the tracks
+        that are linked to them through any chain), along with the albums of those tracks, so the work depends on
+        the amount of the given tracks rather than on the whole listen history. The links of all the other tracks
+        were already resolved when they were saved.
+
+        The listened tracks whose links lead to tracks that were themselves relinked later are relinked to the end of
+        the chain, and the albums are saved with their Known Albums in the **Linked Albums** DB-table.
+
+        Parameters:
+            listened_tracks_ids: IDs of the listened tracks whose links were saved (e.g. the tracks of the newly
+                imported listens).
+
+        Returns:
+            Set of the IDs of the listened tracks whose saved links were changed.
+        """
+        tracks_links = self.db.get_tracks_links(listened_tracks_ids, include_connected = True)
+        known_tracks_ids_map = linkage_resolver.resolve_tracks(tracks_links)
 
-                Logic._add_artists_to_list_to_save(known_full_track,
-                                                   # all_artists_list = all_artists_list_to_insert,
-                                                   all_artists_ids = all_artists_ids_set,
-                                                   all_artists_albums_list = all_artists_albums_list_to_insert)
+        relinked_tracks_ids = {linked_from_id for linked_from_id, relinked_id in tracks_links
+                               if known_tracks_ids_map[linked_from_id] != relinked_id}
 
-            # Mapping the rest of the unmapped OldAlbumIDs to their KnownAlbumIDs:
-            for suspected_album_id in all_suspected_album_ids:
-                known_album_id = map_linked_to_known_albums.get(suspected_album_id)
+        self.db.insert_linked_tracks([{SPDBNM.LINKED_TRACKS.FROM_ID    : linked_from_id,
+                                       SPDBNM.LINKED_TRACKS.RELINKED_ID: known_tracks_ids_map[linked_from_id]}
+                                      for linked_from_id in relinked_tracks_ids])
 
-                if known_album_id is None:
-                    # Trying to go along the link chain, this time using the tracks that belong to the album:
-                    for album_track in map_albums_to_tracks.get(suspected_album_id):
-                        track_known_id = map_linked_to_known_tracks[album_track]
-                        known_album_id = map_known_tracks_to_albums.get(track_known_id)
+        resolved_tracks_ids = set(known_tracks_ids_map)
+        albums_tracks = set(self.db.get_linked_tracks_albums(resolved_tracks_ids))
 
-                        if known_album_id is not None:
-                            # By now, I don't really need to map the found KnownAlbumID,
-                            # as it will not be searched anymore:
-                            map_linked_to_known_albums[suspected_album_id] = known_album_id
+        # The albums' other tracks keep their saved (already resolved) links, and the albums of the Known Tracks
+        # they're linked to are candidate Known Albums as well:
+        other_tracks_ids = {track_id for _, track_id in albums_tracks} - resolved_tracks_ids
+        other_known_tracks_ids_map = linkage_resolver.resolve_tracks(self.db.get_tracks_links(other_tracks_ids))
+        known_tracks_ids_map = {**other_known_tracks_ids_map, **known_tracks_ids_map}
 
-                            linked_album_dict_to_insert = {SPDBNM.LINKED_ALBUMS.FROM_ID    : suspected_album_id,
-                                                           SPDBNM.LINKED_ALBUMS.RELINKED_ID: known_album_id}
+        albums_tracks.update(self.db.get_linked_tracks_albums(
+            {known_tracks_ids_map.get(track_id, track_id) for track_id in other_tracks_ids} - resolved_tracks_ids))
 
-                            all_linked_albums_list_to_insert.append(linked_album_dict_to_insert)
+        known_albums_ids_map = linkage_resolver.resolve_albums(albums_tracks, known_tracks_ids_map)
 
-                        break
+        self.db.insert_linked_albums([{SPDBNM.LINKED_ALBUMS.FROM_ID    : album_id,
+                                       SPDBNM.LINKED_ALBUMS.RELINKED_ID: known_album_id}
+                                      for album_id, known_album_id in known_albums_ids_map.items()])
 
-                else:
-                    # By now, I don't really need to map the found KnownAlbumID, as it will not be searched anymore:
-                    map_linked_to_known_albums[suspected_album_id] = known_album_id
+        return relinked_tracks_ids
 
-                    linked_album_dict_to_insert = {SPDBNM.LINKED_ALBUMS.FROM_ID    : suspected_album_id,
-                                                   SPDBNM.LINKED_ALBUMS.RELINKED_ID: known_album_id}
+    def _save_tracks_audio_features(self, tracks_audio_features: tk.model.ModelList[tk.model.AudioFeatures]) -> None:
+        """
+        Saves a batch of tracks' Audio Features into the DB.
+
+        Parameters:
+            tracks_audio_features: AudioFeatures fetched for the Known Tracks' IDs.
+
+        Returns:
+            None.
+        """
+        tracks_features_to_insert = {}
+
+        for track_features in tracks_audio_features:
+            Logic._add_track_audio_features_to_save(track_features, tracks_features_to_insert)
+
+        self.db.insert_tracks_audio_features(list(tracks_features_to_insert.values()))
+
+    def _save_albums_availability(self, full_albums: tk.model.ModelList[tk.model.FullAlbum]) -> None:
+        """
+        Fills the attribute ``is_available`` for a batch of albums that were already saved in the DB.
+
+        Parameters:
+            full_albums: FullAlbums fetched for the albums' IDs.
+
+        Returns:
+            None.
+        """
+        albums_availability = {full_album.id: len(full_album.available_markets) > 0
+                               for full_album in full_albums if full_album is not None}
+
+        self.db.update_albums_availability(albums_availability)
+
+    def _save_full_artists(self, full_artists: tk.model.ModelList[tk.model.FullArtist]) -> None:
+        """
+        Saves a batch of Artists into the DB, including their Genres.
+
+        Parameters:
+            full_artists: FullArtists fetched for the artists' IDs.
+
+        Returns:
+            None.
+        """
+        artists_to_insert = {}
+        genres_set_to_insert = set()
+        artists_genres_to_insert = {}
+
+        for full_artist in full_artists:
+            Logic._add_artist_to_save(artist = full_artist,
+                                      all_artists = artists_to_insert,
+                                      all_genres_set = genres_set_to_insert,
+                                      all_artists_genres = artists_genres_to_insert)
+
+        self.db.insert_artists(list(artists_to_insert.values()))
+        self.db.insert_genres([{SPDBNM.GENRES.GENRE_NAME: genre_name} for genre_name in genres_set_to_insert])
+        self.db.insert_artists_genres(list(artists_genres_to_insert.values()))
+
+    def _skip_existing_ids(self, stage: str, batch_ids: list[str]) -> list[str]:
+        """
+        Marks the IDs in a batch of an enrichment stage that already exist in the DB as done, so they are not fetched
+        from the API again.
+
+        Parameters:
+            stage: Name of the stage (one of the stages in :class:`SPDBNM.IMPORT_CHECKPOINTS`).
+
+            batch_ids: IDs of the stage's current batch.
+
+        Returns:
+            List of the batch's IDs that are missing from the DB.
+        """
+        table_name, column_name, condition = Logic.ENRICHMENT_STAGES_EXISTING_KEYS[stage]
+        existing_ids = self.db.get_existing_ids(table_name, column_name, batch_ids, condition)
+
+        if len(existing_ids) > 0:
+            log.write(log.FOUND_IN_DB.format(len(existing_ids), len(batch_ids), stage))
+            self.db.mark_checkpoints_done(stage, existing_ids)
+
+        return [entity_id for entity_id in batch_ids if entity_id not in existing_ids]
+
+    def _run_enrichment_stages(self, *stages: tuple[str, str, Callable[[tk.model.ModelList], None]],
+                               skip_existing: bool = False) -> None:
+        """
+        Runs stages of the enrichment pipeline until their queues (in the DB) are empty.
+
+        The stages are run side by side: each time, a batch of pending IDs is taken from each stage's queue, the
+        batches are fetched from the API together, each stage saves its fetched models, and then the batches are
+        marked as done - all in a single DB transaction. Thus, an interrupted run loses at most the current batches,
+        and a rerun resumes from there. If saving a batch fails, the error is raised before the batch is marked as
+        done (and the caller rolls the transaction back).
+
+        Parameters:
+            stages: Tuples, each containing the stage's name (one of the stages in
+                :class:`SPDBNM.IMPORT_CHECKPOINTS`), the name of the API client method that fetches the stage's
+                models by IDs, and the method that saves the fetched models into the DB.
+
+            skip_existing: Whether to fetch only the entities that are missing from the DB (see
+                :attr:`ENRICHMENT_STAGES_EXISTING_KEYS`).
+
+        Returns:
+            None.
+        """
+        while True:
+            batches = []
+            is_any_pending = False
+
+            for stage, fetch_method_name, save_func in stages:
+                batch_ids = self.db.get_pending_checkpoints(stage, limit = config.ENRICHMENT_BATCH_SIZE)
+
+                if len(batch_ids) == 0:
+                    continue
+
+                is_any_pending = True
+                log.write(log.ENRICHMENT_STAGE_BATCH.format(stage,
+                                                            len(batch_ids),
+                                                            self.db.count_pending_checkpoints(stage)))
+
+                if skip_existing:
+                    batch_ids = self._skip_existing_ids(stage, batch_ids)
+
+                if len(batch_ids) > 0:
+                    batches.append((stage, fetch_method_name, save_func, batch_ids))
+
+            if not is_any_pending:
+                break
+
+            if len(batches) > 0:
+                fetched_batches = self._fetch_concurrently(*[(fetch_method_name, batch_ids)
+                                                             for _, fetch_method_name, _, batch_ids in batches])
+
+                for (stage, _, save_func, batch_ids), fetched_models in zip(batches, fetched_batches):
+                    save_func(fetched_models)
+                    self.db.mark_checkpoints_done(stage, batch_ids)
+
+            self.db.commit()
+
+    @metrics.timed
+    def collect_data_and_save(self,
+                              to_csv_also: bool = False,
+                              skip_existing: bool = config.ENRICHMENT_SKIP_EXISTING) -> bool:
+        """
+        Collects all listen history, extracts its data into models (tracks, artists, etc.),
+        fetches additional data from the API, and saves it all in the local DB.
+        Then, replaces the inner :class:`SPDT.SpotifyDataSet` dataset manager with a new manager
+        containing all the updated data (only the requested slice of the listen history, if any).
+
+        The data is fetched and saved in stages (original tracks, relinked tracks and audio features,
+        albums and artists, and finally the albums' linkage), batch by batch, and the progress of each stage is
+        saved in the DB. If the run is interrupted (e.g. the API becomes unavailable), the next run resumes
+        from the last saved batch instead of starting over.
+
+        Parameters:
+            to_csv_also: Whether to also save the listen history to a CSV file, after saving into the DB.
 
-                    all_linked_albums_list_to_insert.append(linked_album_dict_to_insert)
+            skip_existing: Whether to fetch from the API only the entities that are missing from the DB,
+                instead of refreshing all of them.
 
-            # Keeping only the unique values in each list:
-            all_tracks_list_unq = utl.get_unique_dicts(all_tracks_list_to_insert)
-            all_linked_tracks_list_unq = utl.get_unique_dicts(all_linked_tracks_list_to_insert)
-            all_tracks_features_list_unq = utl.get_unique_dicts(all_tracks_features_list_to_insert)
-            all_linked_albums_list_unq = utl.get_unique_dicts(all_linked_albums_list_to_insert)
-            all_albums_list_unq = utl.get_unique_dicts(all_albums_list_to_insert)
-            all_albums_tracks_list_unq = utl.get_unique_dicts(all_albums_tracks_list_to_insert)
-            all_artists_albums_list_unq = utl.get_unique_dicts(all_artists_albums_list_to_insert)
+        Returns:
+            Whether the data was saved successfully (False if the API became unavailable, in which case the next run
+            resumes from the last saved batch).
 
-            # Filling attribute `is_available` for each album:
-            full_albums = self.spapi.get_full_albums(all_albums_ids_set)
-            albums_availability = {_full_album.id: len(_full_album.available_markets) > 0 for _full_album in
-                                   full_albums}
+        Raises:
+            sqlite3.Error: if the data could not be saved into the DB (the current batches are rolled back, and remain
+                pending for the next run).
+        """
+        import tekore as tk
 
-            for i, full_album in enumerate(all_albums_list_unq):
-                all_albums_list_unq[i][SPDBNM.ALBUMS.IS_AVAILABLE] = albums_availability[full_album[SPDBNM.ALBUMS.ID]]
+        pending_count = self.db.count_pending_checkpoints()
 
-            # Fetching Artists' attributes, including their Genres:
-            full_artists = self.spapi.get_full_artists(all_artists_ids_set)
+        if pending_count > 0:
+            log.write(log.RESUMING_ENRICHMENT.format(pending_count))
 
-            for full_artist in full_artists:
-                Logic._add_artist_dict_to_list(artist = full_artist,
-                                               all_artists_list = all_artists_list_to_insert,
-                                               all_genres_set = all_genres_set_to_insert,
-                                               all_artists_genres = all_artists_genres_list_to_insert)
+        listened_tracks_ids = utl.get_unique_vals_list(self.spdt.listen_history_df[SPDTNM.TRACK_ID])
 
-            all_artists_list_unq = utl.get_unique_dicts(all_artists_list_to_insert)
-            all_artists_genres_list_unq = utl.get_unique_dicts(all_artists_genres_list_to_insert)
+        # Tracks that were already done by an interrupted run remain done:
+        self.db.enqueue_checkpoints(SPDBNM.IMPORT_CHECKPOINTS.STAGE_ORIGINAL_TRACKS, listened_tracks_ids, commit = True)
 
-            # Inserting all values to the corresponding DB-tables:
+        try:
+            log.write(log.GETTING_ORIGINAL_TRACKS)
+            self._run_enrichment_stages((SPDBNM.IMPORT_CHECKPOINTS.STAGE_ORIGINAL_TRACKS,
+                                         'get_full_tracks',
+                                         self._save_original_tracks),
+                                        skip_existing = skip_existing)
+
+            # Fetching FullTrack attributes only for the Known Tracks that other tracks were relinked to (their IDs
+            # were just discovered in the original FullTracks, and now I need the rest of their attributes),
+            # along with the Audio Features of all the known tracks:
+            log.write(log.GETTING_RELINKED_TRACKS)
+            self._run_enrichment_stages((SPDBNM.IMPORT_CHECKPOINTS.STAGE_RELINKED_TRACKS,
+                                         'get_full_tracks',
+                                         self._save_relinked_tracks),
+                                        (SPDBNM.IMPORT_CHECKPOINTS.STAGE_AUDIO_FEATURES,
+                                         'get_tracks_audio_features',
+                                         self._save_tracks_audio_features),
+                                        skip_existing = skip_existing)
+
+            # Fetching the Albums (for their availability) and the Artists (for their Genres):
+            self._run_enrichment_stages((SPDBNM.IMPORT_CHECKPOINTS.STAGE_ALBUMS,
+                                         'get_full_albums',
+                                         self._save_albums_availability),
+                                        (SPDBNM.IMPORT_CHECKPOINTS.STAGE_ARTISTS,
+                                         'get_full_artists',
+                                         self._save_full_artists),
+                                        skip_existing = skip_existing)
+
+            # Mapping all the OldAlbumIDs to their KnownAlbumIDs, and finally inserting the listens themselves:
+            relinked_tracks_ids = self._save_linkage(listened_tracks_ids)
             self.db.insert_listen_history(self.spdt.listen_history_df)
-            self.db.insert_tracks(all_tracks_list_unq)
-            self.db.insert_linked_tracks(all_linked_tracks_list_unq)
-            self.db.insert_tracks_audio_features(all_tracks_features_list_unq)
-            self.db.insert_linked_albums(all_linked_albums_list_unq)
-            self.db.insert_artists(all_artists_list_unq)
-            self.db.insert_genres([{SPDBNM.GENRES.GENRE_NAME: genre_name} for genre_name in all_genres_set_to_insert])
-            self.db.insert_artists_genres(all_artists_genres_list_unq)
-            self.db.insert_albums(all_albums_list_unq)
-            self.db.insert_albums_tracks(all_albums_tracks_list_unq)
-            self.db.insert_artists_albums(all_artists_albums_list_unq)
+
+            if skip_existing:
+                # Only the inserted listens, and the listens of tracks whose links were changed, are refreshed:
+                first_listens_timestamps = self.spdt.listen_history_df.groupby(SPDTNM.USERNAME,
+                                                                               observed = True)[SPDTNM.TIMESTAMP].min()
+
+                self.db.refresh_known_listen_history(from_timestamps = first_listens_timestamps.to_dict(),
+                                                     tracks_ids = relinked_tracks_ids)
+
+            else:
+                # The entities that were fetched again might have changed any of the listens:
+                self.db.refresh_known_listen_history()
+
+            self.db.clear_checkpoints()
 
             self.db.commit()
 
         except tk.ServiceUnavailable as ex:
-            log.write(log.API_SERVICE_UNAVAILABLE.format(ex))
+            # The interrupted batches' changes are discarded, so the batches remain pending for the next run:
+            self.db.rollback()
+
+            log.write(log.API_SERVICE_UNAVAILABLE.format(ex), level = log.ERROR)
+            log.write(log.ENRICHMENT_INTERRUPTED.format(self.db.count_pending_checkpoints()), level = log.WARNING)
+
+            return False
+
+        except sqlite3.Error:
+            # A batch that could not be saved is not marked as done either, so it's fetched again on the next run:
+            self.db.rollback()
 
-            return
+            log.write(log.ENRICHMENT_INTERRUPTED.format(self.db.count_pending_checkpoints()), level = log.WARNING)
+
+            raise
+
+        finally:
+            # Not through the lazy ``spapi`` property, which would build the client (and read the token) just to log
+            # its statistics, and might raise here and hide the original error:
+            if self._spapi is not None and self._spapi.cache is not None:
+                self._spapi.cache.log_stats()
 
         if to_csv_also:
             self.save_listen_history_to_csv('known_listen_history_{0}.csv')
 
-        self._spdt = SpotifyDataSet(db_handler = self.db)
+        self._spdt = SpotifyDataSet(db_handler = self.db, **self._listen_history_slice)
+
+        return True
+
+    def _get_new_listen_history_files(self, data_dir: str) -> tuple[list[str], list[dict]]:
+        """
+        Compares the Listen History JSON files in the given folder to the files that were already imported into
+        the DB, by their size, modification time and content hash.
+
+        Parameters:
+            data_dir: Directory of the JSON files.
+
+        Returns:
+            Tuple of two items: [0] = names of the files that were not imported yet (new or changed files),
+                [1] = details of all the files in the folder, ready for insertion into the DB.
+        """
+        imported_files = self.db.get_imported_files()
+        imported_hashes = {imported_file[SPDBNM.IMPORTED_FILES.CONTENT_HASH] for imported_file in
+                           imported_files.values()}
+
+        new_filenames = []
+        all_files_to_insert = []
+
+        for filename in SpotifyDataSet.get_listen_history_files(data_dir):
+            file_path = data_dir + '/' + filename
+            file_stat = os.stat(file_path)
+            imported_file = imported_files.get(file_path)
+
+            file_dict_to_insert = {SPDBNM.IMPORTED_FILES.FILE_PATH   : file_path,
+                                   SPDBNM.IMPORTED_FILES.FILE_SIZE   : file_stat.st_size,
+                                   SPDBNM.IMPORTED_FILES.FILE_MTIME  : file_stat.st_mtime,
+                                   SPDBNM.IMPORTED_FILES.CONTENT_HASH: None}
+
+            if imported_file is not None \
+                    and imported_file[SPDBNM.IMPORTED_FILES.FILE_SIZE] == file_stat.st_size \
+                    and imported_file[SPDBNM.IMPORTED_FILES.FILE_MTIME] == file_stat.st_mtime:
+                # The file wasn't changed since it was imported, so there's no need to read it (nor hash it):
+                file_dict_to_insert[SPDBNM.IMPORTED_FILES.CONTENT_HASH] = imported_file[
+                    SPDBNM.IMPORTED_FILES.CONTENT_HASH]
+
+            else:
+                file_dict_to_insert[SPDBNM.IMPORTED_FILES.CONTENT_HASH] = utl.get_file_hash(file_path)
+
+                # A file that was only touched, renamed or copied has the same content as an imported file:
+                if file_dict_to_insert[SPDBNM.IMPORTED_FILES.CONTENT_HASH] not in imported_hashes:
+                    new_filenames.append(filename)
+
+            all_files_to_insert.append(file_dict_to_insert)
+
+        return new_filenames, all_files_to_insert
+
+    @metrics.timed
+    def import_new_listen_history(self, data_dir: str = SPDTPATH.JSON_FILE_PATH) -> None:
+        """
+        Incrementally imports the Listen History JSON files: reads only the files that were not imported yet,
+        keeps only the listens that are newer than the latest listen of each user in the DB, and then fetches
+        additional data from the API and saves it all in the local DB (see :meth:`collect_data_and_save`)
+        only for those new listens.
+
+        Finally, replaces the inner :class:`SPDT.SpotifyDataSet` dataset manager with a new manager
+        containing the whole listen history from the DB (only the requested slice of it, if any).
+
+        Parameters:
+            data_dir: Directory of the JSON files to import.
+
+        Returns:
+            None.
+        """
+        new_filenames, all_files_to_insert = self._get_new_listen_history_files(data_dir)
+        is_saved = True
+
+        if len(new_filenames) == 0:
+            log.write(log.NO_NEW_LISTEN_HISTORY_FILES)
+
+        else:
+            log.write(log.IMPORTING_NEW_LISTEN_HISTORY_FILES.format(len(new_filenames)))
+
+            self._spdt = SpotifyDataSet(db_handler = None,
+                                        data_dir = data_dir,
+                                        json_filenames = new_filenames)
+            self.spdt.keep_listens_from(self.db.get_last_listen_timestamps())
+
+            if len(self.spdt.listen_history_df) == 0:
+                log.write(log.NO_NEW_LISTENS)
+
+            else:
+                log.write(log.IMPORTING_NEW_LISTENS.format(len(self.spdt.listen_history_df)))
+
+                is_saved = self.collect_data_and_save(to_csv_also = False)
+
+        # Only after the listens were saved, the files are considered as imported:
+        if is_saved:
+            self.db.insert_imported_files(all_files_to_insert, commit = True)
+
+        self._spdt = SpotifyDataSet(db_handler = self.db, **self._listen_history_slice)
+
+    @staticmethod
+    def _get_album_groups_names(album_groups: list[str | tk.model.AlbumGroup] = None) -> list[str]:
+        """
+        Returns the sorted, unique names of the given album groups.
+
+        Parameters:
+            album_groups: List of album groups (names or AlbumGroup objects). If None, the default album groups
+                of a discography are used.
+
+        Returns:
+            List of the album groups' names.
+        """
+        import tekore as tk
+
+        if album_groups is None:
+            album_groups = Logic.DEFAULT_DISCOGRAPHY_ALBUM_GROUPS
+
+        return sorted({tk.model.AlbumGroup(album_group).value for album_group in album_groups})
+
+    def _save_artists_discographies(self,
+                                    artists_tracks: dict[
+                                        str, list[tuple[tk.model.SimpleAlbum, list[tk.model.SimpleTrack]]]],
+                                    album_groups_names: list[str]) -> set[str]:
+        """
+        Saves the fetched discographies of artists into the DB: their albums (with each album's group), the albums'
+        tracks, and the tracks' artists. Then, marks the artists' discographies as fetched (now).
+
+        Albums and tracks that already exist in the DB are kept as they are, since they might contain more details
+        than the discographies do.
+
+        Parameters:
+            artists_tracks: Dictionary mapping each artist's ID to their albums and their tracks, as returned by
+                ``artists_get_all_tracks``.
+
+            album_groups_names: Names of the album groups that were fetched.
+
+        Returns:
+            Set of the IDs of the albums whose rows in the known listen history might have changed: albums that got
+            new tracks, or whose artists (the album artists, i.e. not those the album only appears on) changed.
+        """
+        # The records to insert, keyed by their tables' primary keys (so each record is inserted once):
+        tracks_to_insert = {}
+        albums_to_insert = {}
+        albums_tracks_to_insert = {}
+        artists_albums_to_insert = {}
+        tracks_artists_to_insert = {}
+
+        for artist_id, albums in artists_tracks.items():
+            for album, album_tracks in albums:
+                albums_to_insert[album.id] = Logic._get_album_dict_to_save(album)
+
+                artists_albums_to_insert[(artist_id, album.id)] = {
+                    SPDBNM.ARTISTS_ALBUMS.ARTIST_ID  : artist_id,
+                    SPDBNM.ARTISTS_ALBUMS.ALBUM_ID   : album.id,
+                    SPDBNM.ARTISTS_ALBUMS.ALBUM_GROUP: album.album_group.value}
+
+                for simple_track in album_tracks:
+                    Logic._add_track_to_save(simple_track, tracks_to_insert)
+
+                    albums_tracks_to_insert[(album.id, simple_track.id)] = {
+                        SPDBNM.ALBUMS_TRACKS.ALBUM_ID: album.id,
+                        SPDBNM.ALBUMS_TRACKS.TRACK_ID: simple_track.id}
+
+                    for track_artist in simple_track.artists:
+                        tracks_artists_to_insert[(simple_track.id, track_artist.id)] = {
+                            SPDBNM.TRACKS_ARTISTS.TRACK_ID : simple_track.id,
+                            SPDBNM.TRACKS_ARTISTS.ARTIST_ID: track_artist.id}
+
+        album_groups = SPDBNM.ARTISTS_DISCOGRAPHY_FETCHES.ALBUM_GROUPS_SEPARATOR.join(album_groups_names)
+
+        saved_albums_tracks = self.db.get_albums_tracks(list(albums_to_insert.keys()))
+        saved_albums_artists_groups = self.db.get_albums_artists_groups(list(albums_to_insert.keys()))
+
+        changed_albums_ids = {album_id for album_id, _ in albums_tracks_to_insert.keys() - saved_albums_tracks}
+
+        for artist_album, artist_album_record in artists_albums_to_insert.items():
+            # Only the album artists are joined to the known listen history (a missing row counts as a non-album
+            # artist):
+            is_album_artist = (artist_album_record[SPDBNM.ARTISTS_ALBUMS.ALBUM_GROUP] !=
+                               SPDBNM.ARTISTS_ALBUMS.ALBUM_GROUP_APPEARS_ON)
+            was_album_artist = (saved_albums_artists_groups.get(artist_album,
+                                                                SPDBNM.ARTISTS_ALBUMS.ALBUM_GROUP_APPEARS_ON) !=
+                                SPDBNM.ARTISTS_ALBUMS.ALBUM_GROUP_APPEARS_ON)
+
+            if is_album_artist != was_album_artist:
+                changed_albums_ids.add(artist_album[1])
+
+        self.db.insert_tracks(list(tracks_to_insert.values()), replace = False)
+        self.db.insert_albums(list(albums_to_insert.values()), replace = False)
+        self.db.insert_albums_tracks(list(albums_tracks_to_insert.values()), replace = False)
+        self.db.insert_artists_albums(list(artists_albums_to_insert.values()))
+        self.db.insert_tracks_artists(list(tracks_artists_to_insert.values()))
+        self.db.insert_artists_discography_fetches(
+            [{SPDBNM.ARTISTS_DISCOGRAPHY_FETCHES.ARTIST_ID   : artist_id,
+              SPDBNM.ARTISTS_DISCOGRAPHY_FETCHES.ALBUM_GROUPS: album_groups} for artist_id in artists_tracks.keys()])
+
+        return changed_albums_ids
+
+    @metrics.timed
+    def update_artists_discographies(self,
+                                     artists_ids: str | set | list | pd.Series,
+                                     album_groups: list[str | tk.model.AlbumGroup] = None,
+                                     max_age_days: int = config.DISCOGRAPHY_MAX_AGE_DAYS) -> None:
+        """
+        Makes sure that the discographies of the given artists are saved in the DB and are up-to-date.
+
+        Only the discographies that are missing from the DB, that were fetched more than ``max_age_days`` ago, or
+        that were fetched without some of the given album groups, are fetched from the API. If all of them are
+        up-to-date, the API is not called at all.
+
+        Parameters:
+            artists_ids: IDs of the desired artists.
+
+            album_groups: List with the desired types of albums.
+                Possible values: 'album', 'appears_on', 'compilation', 'single'.
+                Default: ['album', 'appears_on'].
+
+            max_age_days: Maximal age (in days) of a discography in the DB that is still considered up-to-date.
+
+        Returns:
+            None.
+
+        Raises:
+            tk.ServiceUnavailable: if Spotify's API service is unavailable.
+        """
+        album_groups_names = Logic._get_album_groups_names(album_groups)
+        unique_artists_list = utl.get_unique_vals_list(artists_ids)
+        fresh_album_groups = self.db.get_fresh_discographies_album_groups(unique_artists_list, max_age_days)
+
+        stale_artists_ids = [artist_id for artist_id in unique_artists_list
+                             if not set(album_groups_names).issubset(fresh_album_groups.get(artist_id, set()))]
+
+        log.write(log.STALE_DISCOGRAPHIES.format(len(stale_artists_ids), len(unique_artists_list)))
+
+        if len(stale_artists_ids) > 0:
+            # Re-fetching also the album groups that are still fresh, so they are not lost from the fetch record:
+            fetch_album_groups_names = sorted(set(album_groups_names).union(
+                *[fresh_album_groups.get(artist_id, set()) for artist_id in stale_artists_ids]))
+
+            artists_tracks = self.spapi.artists_get_all_tracks(artists_ids = stale_artists_ids,
+                                                               album_groups = fetch_album_groups_names)
+
+            changed_albums_ids = self._save_artists_discographies(artists_tracks, fetch_album_groups_names)
+
+            # The saved albums and album groups might change the albums and artists of their tracks' listens:
+            if len(changed_albums_ids) > 0:
+                self.db.refresh_known_listen_history(
+                    tracks_ids = self.db.get_albums_listened_tracks_ids(changed_albums_ids))
+
+            self.db.commit()
 
     # endregion Saving data
 
@@ -555,7 +1076,12 @@ class Logic:
 
     # region Initialization
 
-    def __init__(self, listen_history_from: str = HISTORY_FROM_DB):
+    def __init__(self,
+                 listen_history_from: str = HISTORY_FROM_DB,
+                 columns: list[str] = None,
+                 usernames: str | list[str] = None,
+                 from_timestamp: str | pd.Timestamp = None,
+                 to_timestamp: str | pd.Timestamp = None):
         """
         Initializes an instance of the app's main Logic.
 
@@ -565,19 +1091,56 @@ class Logic:
                 Possible values:
                 'db' = fetch from an existing DB file.
                 'json' = fetch from JSON files downloaded from Spotify.
+                'json_incremental' = fetch only the new listens from JSON files downloaded from Spotify,
+                and add them to the existing DB file.
+
+            columns: Names of the listen history columns to load. Default: all the columns.
+
+            usernames: Username (or usernames) whose listens to load. Default: all the users.
+
+            from_timestamp: Earliest time of the listens to load (inclusive), e.g. '2021'.
+                Default: from the first listen.
+
+            to_timestamp: Latest time of the listens to load (exclusive), e.g. '2022'.
+                Default: until the last listen.
+
+            When importing from JSON files, all the listens are imported into the DB, and then only the slice
+            (the above columns, users and time) is loaded from it.
         """
-        self._spapi = spapi(token_keys = Logic.get_token())
+        self._spapi: spapi = None
         self._db = DB()
 
+        # The slice of the listen history to load from the DB (by default, all of it):
+        self._listen_history_slice = {'columns'       : columns,
+                                      'usernames'     : usernames,
+                                      'from_timestamp': from_timestamp,
+                                      'to_timestamp'  : to_timestamp}
+
         if listen_history_from == Logic.HISTORY_FROM_JSON:
             self._spdt = SpotifyDataSet(db_handler = None)
             self.collect_data_and_save(to_csv_also = False)
 
+        elif listen_history_from == Logic.HISTORY_FROM_JSON_INCREMENTAL:
+            self.import_new_listen_history()
+
         else:
-            self._spdt = SpotifyDataSet(db_handler = self.db)
+            self._spdt = SpotifyDataSet(db_handler = self.db, **self._listen_history_slice)
 
     @property
     def spapi(self) -> spapi:
+        """
+        Returns the client for accessing the Spotify API, creating it on first use (reading the token keys file).
+
+        Returns:
+            Spotify API client.
+        """
+        if self._spapi is None:
+            from logic.model.spotify_api_client import SpotifyAPIClient
+            from logic.model.api_cache import APICache
+
+            self._spapi = SpotifyAPIClient(token_keys = Logic.get_token(),
+                                           cache = APICache())
+
         return self._spapi
 
     @property
@@ -588,8 +1151,20 @@ class Logic:
     def spdt(self) -> SpotifyDataSet:
         return self._spdt
 
-    def get_listen_history_df(self) -> pd.DataFrame:
-        return self.spdt.listen_history_df.copy()
+    def get_listen_history_df(self, columns: list[str] = None) -> pd.DataFrame:
+        """
+        Returns the Listen History, projected on the given columns, without copying it.
+
+        The returned DataFrame shares its data with the dataset, and must not be modified in-place
+        (see ``SpotifyDataSet.get_listen_history_view``).
+
+        Parameters:
+            columns: Names of the columns to get. If None, gets all the columns.
+
+        Returns:
+            Read-only Listen History DataFrame.
+        """
+        return self.spdt.get_listen_history_view(columns)
 
     # endregion Initialization
 
@@ -608,6 +1183,7 @@ class Logic:
 
     # region Calculations for plotting
 
+    @metrics.timed
     def calc_listen_data_by_key(self) -> None:
         """
         Aggregates all listened tracks by key, and writes it as a csv file
@@ -622,6 +1198,7 @@ class Logic:
 
         utl.write_df_to_file(my_results, "listen_data_by_key.csv")
 
+    @metrics.timed
     def calc_listen_data_mean_key(self) -> None:
         """
         Aggregates all listened tracks by mean key, and saves it into a CSV file.
@@ -631,15 +1208,19 @@ class Logic:
         """
         self.spdt.listen_history_df.groupby(SPDTNM.MUSICAL_KEY).mean().to_csv("mean_by_key.csv")
 
+    @metrics.timed
     def calc_top_artists_by_listen_count(self, top_artists_amount = 50) -> pd.DataFrame:
         tracks_count = self.agg_unique_tracks_by_listens()
 
-        times_listened_by_artist = tracks_count.groupby(by = SPDTNM.ALBUM_ARTIST_NAME, as_index = True).agg(
+        times_listened_by_artist = tracks_count.groupby(by = SPDTNM.ALBUM_ARTIST_NAME,
+                                                        as_index = True,
+                                                        observed = True).agg(
             times_listened = (SPDTNM.TIMES_LISTENED, 'sum')).sort_values(SPDTNM.TIMES_LISTENED,
                                                                          ascending = False).head(top_artists_amount)
 
         return times_listened_by_artist
 
+    @metrics.timed
     def calc_top_artists_by_total_listen_time(self, top_artists_amount = 30) -> pd.DataFrame:
         """
         Calculates the Top Artists according to the total time listened to each artist.
@@ -652,7 +1233,9 @@ class Logic:
         """
         tracks_count = self.agg_unique_tracks_by_listens()
 
-        total_listen_time_by_artist = tracks_count.groupby(by = SPDTNM.ALBUM_ARTIST_NAME, as_index = True).agg(
+        total_listen_time_by_artist = tracks_count.groupby(by = SPDTNM.ALBUM_ARTIST_NAME,
+                                                           as_index = True,
+                                                           observed = True).agg(
             total_listen_time = (SPDTNM.TOTAL_LISTEN_TIME, 'sum')).sort_values(
             SPDTNM.TOTAL_LISTEN_TIME,
             ascending = False).head(top_artists_amount)
@@ -662,6 +1245,7 @@ class Logic:
 
         return total_listen_time_by_artist
 
+    @metrics.timed
     def calc_top_artists_albums_completion(self,
                                            top_artists_amount = 10,
                                            min_track_listen_percentage = 0.75,
@@ -670,6 +1254,9 @@ class Logic:
         Calculates how much of an artist's discography was listened to, for each top artist
         (top artists are determined by total listen time to their tracks regardless of discography).
 
+        The artists' discographies are read from the local DB; only the missing or out-of-date ones are fetched
+        from the API (see ``update_artists_discographies``).
+
         Parameters:
             top_artists_amount: Amount of artists considered "Top Artists" for calculating.
 
@@ -699,16 +1286,21 @@ class Logic:
 
         # Getting the top artists by total listen time (different from ``calc_top_artists_by_total_listen_time``):
         total_listen_time_by_artist = tracks_count.groupby(by = SPDBNM.V_KNOWN_LISTEN_HISTORY.ALBUM_ARTIST_ID,
-                                                           as_index = True).agg(
+                                                           as_index = True,
+                                                           observed = True).agg(
             total_listen_time = (SPDTNM.TOTAL_LISTEN_TIME, 'sum'),
             album_artist_name = (SPDBNM.V_KNOWN_LISTEN_HISTORY.ALBUM_ARTIST_NAME, 'first')).sort_values(
             by = SPDTNM.TOTAL_LISTEN_TIME, ascending = False).head(top_artists_amount)
 
         artists_ids = total_listen_time_by_artist.index.to_list()
 
-        listen_history_df = self.get_listen_history_df()
-        listen_history_df = listen_history_df.drop(index = listen_history_df.index[
-            ~listen_history_df[SPDBNM.V_KNOWN_LISTEN_HISTORY.ALBUM_ARTIST_ID].isin(artists_ids)], inplace = False)
+        listen_history_df = self.get_listen_history_df([SPDBNM.V_KNOWN_LISTEN_HISTORY.TRACK_KNOWN_ID,
+                                                        SPDBNM.V_KNOWN_LISTEN_HISTORY.ALBUM_ARTIST_ID,
+                                                        SPDBNM.V_KNOWN_LISTEN_HISTORY.ALBUM_ARTIST_NAME,
+                                                        SPDBNM.V_KNOWN_LISTEN_HISTORY.MS_PLAYED,
+                                                        SPDBNM.V_KNOWN_LISTEN_HISTORY.TRACK_DURATION_MS])
+        listen_history_df = listen_history_df[
+            listen_history_df[SPDBNM.V_KNOWN_LISTEN_HISTORY.ALBUM_ARTIST_ID].isin(artists_ids)]
 
         # Keeping only the most listened-to instance of each track by the top artists:
         history_max_played = listen_history_df.sort_values(
@@ -716,60 +1308,47 @@ class Logic:
                   SPDBNM.V_KNOWN_LISTEN_HISTORY.MS_PLAYED],
             ascending = True).drop_duplicates(SPDBNM.V_KNOWN_LISTEN_HISTORY.TRACK_KNOWN_ID,
                                               keep = 'last')
-        history_max_played.set_index(SPDBNM.V_KNOWN_LISTEN_HISTORY.TRACK_KNOWN_ID, inplace = True)
-
-        history_max_played[PLTNM.IS_CONSIDERED_LISTENED] = np.select(
-            [history_max_played[SPDBNM.V_KNOWN_LISTEN_HISTORY.MS_PLAYED] >= history_max_played[
-                SPDBNM.V_KNOWN_LISTEN_HISTORY.TRACK_DURATION_MS] * min_track_listen_percentage], [True], False)
 
-        artists_tracks = self.spapi.artists_get_all_tracks(artists_ids = artists_ids,
-                                                           album_groups = album_groups)
+        max_played_tracks_ids = history_max_played[SPDBNM.V_KNOWN_LISTEN_HISTORY.TRACK_KNOWN_ID].astype(object)
+        is_considered_listened = history_max_played[SPDBNM.V_KNOWN_LISTEN_HISTORY.MS_PLAYED] >= history_max_played[
+            SPDBNM.V_KNOWN_LISTEN_HISTORY.TRACK_DURATION_MS] * min_track_listen_percentage
 
-        # Building a DataFrame with the 'is_considered_listened' value for each track for each artist:
-        artists_tracks_flat = {}
-        artist_track_listened_list_of_srs = []
-        series_cols = [PLTNM.ARTIST_ID, PLTNM.TRACK_ID, PLTNM.IS_TRACK_LISTENED]
-
-        for artist_id, albums in artists_tracks.items():
-            for album_tuple in albums:
-                for simple_track in album_tuple[1]:
-                    try:
-                        track_listened = history_max_played.loc[simple_track.id][PLTNM.IS_CONSIDERED_LISTENED]
+        history_max_played = pd.DataFrame({PLTNM.TRACK_ID              : max_played_tracks_ids,
+                                           PLTNM.IS_CONSIDERED_LISTENED: is_considered_listened})
 
-                    except KeyError:
-                        track_listened = False
+        # The artists' discographies are read from the DB (fetching only the missing or out-of-date ones):
+        self.update_artists_discographies(artists_ids = artists_ids,
+                                          album_groups = album_groups)
 
-                    if artists_tracks_flat.get(artist_id) is None:
-                        artists_tracks_flat[artist_id] = {}
+        discographies_df = self.db.get_artists_discographies_tracks(
+            artists_ids = artists_ids,
+            album_groups = Logic._get_album_groups_names(album_groups))
 
-                    artists_tracks_flat[artist_id][simple_track.id] = track_listened
+        # Building a DataFrame with the 'is_considered_listened' value for each track for each artist
+        # (tracks that were never listened to are not in ``history_max_played``):
+        artist_tracks_completion_df = pd.DataFrame(
+            {PLTNM.ARTIST_ID: discographies_df[SPDBNM.ARTISTS_ALBUMS.ARTIST_ID],
+             PLTNM.TRACK_ID : discographies_df[SPDBNM.ALBUMS_TRACKS.TRACK_ID]}).merge(history_max_played,
+                                                                                    how = 'left',
+                                                                                    on = PLTNM.TRACK_ID)
 
-                    artist_track_listened_ser = pd.Series([artist_id, simple_track.id, track_listened],
-                                                          index = series_cols)
-                    artist_track_listened_list_of_srs.append(artist_track_listened_ser)
-
-        artist_tracks_completion_df = pd.DataFrame(artist_track_listened_list_of_srs, columns = series_cols)
+        artist_tracks_completion_df[PLTNM.IS_TRACK_LISTENED] = artist_tracks_completion_df[
+            PLTNM.IS_CONSIDERED_LISTENED].fillna(False).astype(bool)
 
         # Calculating the percentage of listened tracks per each artist:
         artist_tracks_completion_df = artist_tracks_completion_df.groupby(PLTNM.ARTIST_ID).agg(
-            artist_id = (PLTNM.ARTIST_ID, 'first'),
             listened_tracks = (PLTNM.IS_TRACK_LISTENED, 'sum'),
-            total_tracks = (PLTNM.TRACK_ID, 'count')).set_index(PLTNM.ARTIST_ID)
-        artist_tracks_completion_df.sort_index(ascending = True, inplace = True)
+            total_tracks = (PLTNM.TRACK_ID, 'count'))
 
         artist_tracks_completion_df[PLTNM.PERCENTAGE_LISTENED] = \
             artist_tracks_completion_df[PLTNM.LISTENED_TRACKS].divide(
                 artist_tracks_completion_df[PLTNM.TOTAL_TRACKS]) * 100
 
         # Adding the artists' names:
-        names = listen_history_df[
-            listen_history_df[SPDBNM.V_KNOWN_LISTEN_HISTORY.ALBUM_ARTIST_ID].isin(artist_tracks_completion_df.index)][
-            [SPDBNM.V_KNOWN_LISTEN_HISTORY.ALBUM_ARTIST_ID,
-             SPDBNM.V_KNOWN_LISTEN_HISTORY.ALBUM_ARTIST_NAME]].drop_duplicates().set_index(
-            SPDBNM.V_KNOWN_LISTEN_HISTORY.ALBUM_ARTIST_ID)
-        names.sort_index(ascending = True, inplace = True)
-
-        artist_tracks_completion_df[PLTNM.ARTIST_NAME] = names
+        names = dict(zip(total_listen_time_by_artist.index,
+                         total_listen_time_by_artist[SPDBNM.V_KNOWN_LISTEN_HISTORY.ALBUM_ARTIST_NAME]))
+
+        artist_tracks_completion_df[PLTNM.ARTIST_NAME] = artist_tracks_completion_df.index.map(names)
         artist_tracks_completion_df.reset_index(inplace = True)
         artist_tracks_completion_df.sort_values(by = PLTNM.PERCENTAGE_LISTENED,
                                                 ascending = False,
@@ -777,6 +1356,7 @@ class Logic:
 
         return artist_tracks_completion_df
 
+    @metrics.timed
     def calc_track_of_the_time_period(self,
                                       time_period: str = 'month',
                                       ) -> pd.DataFrame:
@@ -790,12 +1370,13 @@ class Logic:
         Returns:
             Dataframe with the calculated results.
         """
-        history_by_time_period = self.get_listen_history_df().copy()
+        history_by_time_period = self.get_listen_history_df()
         history_by_time_period['timestamp_std'] = pd.to_datetime(
             arg = history_by_time_period.loc[SPDBNM.V_KNOWN_LISTEN_HISTORY.TIMESTAMP],
             errors = 'raise',
             yearfirst = True)
 
+    @metrics.timed
     def calc_audio_features_for_top_tracks(self,
                                            top_tracks_amount: int = 30) -> pd.DataFrame:
         """
@@ -821,31 +1402,15 @@ class Logic:
         total listens (count) and total listen time (sum), as well as its Album Artist ID and Name, & Album ID
         and Name.
 
+        The aggregation is cached by the dataset (see ``SpotifyDataSet.agg_unique_tracks_by_listens``), so all the
+        calculations share one result, which must not be modified in-place.
+
         Parameters:
             sort: Whether to sort the resulting DataFrame by total listen time (descending).
 
         Returns:
             DataFrame with the aggregated listen history by each track's listens count and total listen time.
         """
-        tracks_df = self.get_listen_history_df()
-
-        # Removing all records of tracks that were played exactly 0 milliseconds:
-        tracks_df = tracks_df.drop(index = tracks_df.index[tracks_df[SPDTNM.MS_PLAYED].eq(0)], inplace = False)
-
-        tracks_count = tracks_df.groupby(SPDTNM.TRACK_KNOWN_ID,
-                                         as_index = False).agg(
-            times_listened = (SPDTNM.TRACK_KNOWN_ID, 'count'),
-            total_listen_time = (SPDTNM.MS_PLAYED, 'sum'),
-            album_artist_id = (SPDBNM.V_KNOWN_LISTEN_HISTORY.ALBUM_ARTIST_ID, 'first'),
-            album_artist_name = (SPDTNM.ALBUM_ARTIST_NAME, 'first'),
-            album_known_id = (SPDBNM.V_KNOWN_LISTEN_HISTORY.ALBUM_KNOWN_ID, 'first'),
-            album_name = (SPDTNM.ALBUM_NAME, 'first'),
-            track_known_id = (SPDBNM.V_KNOWN_LISTEN_HISTORY.TRACK_KNOWN_ID, 'first'),
-            track_name = (SPDTNM.TRACK_NAME, 'first'))
-
-        if sort:
-            tracks_count = tracks_count.sort_values(by = SPDTNM.TOTAL_LISTEN_TIME, ascending = False)
-
-        return tracks_count
+        return self.spdt.agg_unique_tracks_by_listens(sort = sort)
 
     # endregion Calculations for plotting
@@ -1,11 +1,19 @@
+from __future__ import annotations
 import sqlite3
 import sys
+import time
 import pandas as pd
-import tekore as tk
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING
 from logic.frontend import log
+from logic.frontend import metrics
 from logic.model.sp_data_set_names import SPDT as SPDTNM
 from logic.db import db_names as SPDBNM
 from logic import general_utils as utl
+import config
+
+if TYPE_CHECKING:
+    import tekore as tk
 
 
 class DB:
@@ -13,6 +21,45 @@ class DB:
     Manages the local DB to save Spotify data into, for further calculations.
     """
 
+    # Maximal amount of IDs to send in a single query, under SQLite's limit of host parameters:
+    MAX_IDS_PER_QUERY = 500
+
+    # From this amount of IDs, they are loaded into an indexed temporary table and joined, instead of being sent
+    # in batches of ``MAX_IDS_PER_QUERY``:
+    MIN_IDS_FOR_TEMP_TABLE = 5000
+
+    # Columns of the known listen history, in the order of its DB-table (see ``get_listen_history_df``):
+    LISTEN_HISTORY_COLUMNS = [SPDBNM.KNOWN_LISTEN_HISTORY.USERNAME,
+                              SPDBNM.KNOWN_LISTEN_HISTORY.TIMESTAMP,
+                              SPDBNM.KNOWN_LISTEN_HISTORY.TRACK_LISTENED_ID,
+                              SPDBNM.KNOWN_LISTEN_HISTORY.TRACK_KNOWN_ID,
+                              SPDBNM.KNOWN_LISTEN_HISTORY.TRACK_NAME,
+                              SPDBNM.KNOWN_LISTEN_HISTORY.ALBUM_KNOWN_ID,
+                              SPDBNM.KNOWN_LISTEN_HISTORY.ALBUM_NAME,
+                              SPDBNM.KNOWN_LISTEN_HISTORY.ALBUM_ARTIST_ID,
+                              SPDBNM.KNOWN_LISTEN_HISTORY.ALBUM_ARTIST_NAME,
+                              SPDBNM.KNOWN_LISTEN_HISTORY.MS_PLAYED,
+                              SPDBNM.KNOWN_LISTEN_HISTORY.TRACK_DURATION_MS,
+                              SPDBNM.KNOWN_LISTEN_HISTORY.REASON_START,
+                              SPDBNM.KNOWN_LISTEN_HISTORY.REASON_END,
+                              SPDBNM.KNOWN_LISTEN_HISTORY.SKIPPED,
+                              SPDBNM.KNOWN_LISTEN_HISTORY.PLATFORM,
+                              SPDBNM.KNOWN_LISTEN_HISTORY.CONN_COUNTRY,
+                              SPDBNM.KNOWN_LISTEN_HISTORY.URI,
+                              SPDBNM.KNOWN_LISTEN_HISTORY.SHUFFLE,
+                              SPDBNM.KNOWN_LISTEN_HISTORY.OFFLINE,
+                              SPDBNM.KNOWN_LISTEN_HISTORY.INCOGNITO_MODE]
+
+    # Format of the listens' timestamps in the DB (the same as in Spotify's JSON files):
+    TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+    # Pragmas applied by a bulk load (see ``bulk_insert``). The journal and synchronous modes can only be changed
+    # outside a transaction, and are kept for the connection (NORMAL is safe in WAL mode). The rest are restored
+    # after the load (a negative cache size is in KiB):
+    BULK_LOAD_CONNECTION_PRAGMAS = {'journal_mode': 'WAL',
+                                    'synchronous' : 'NORMAL'}
+    BULK_LOAD_PRAGMAS = {'cache_size': -256000}
+
     @staticmethod
     def eprint(*args, **kwargs):
         """Print to stderr."""
@@ -121,37 +168,42 @@ class DB:
         return values_out
 
     @staticmethod
-    def __get_listen_history_df_for_insert(listen_history_df: pd.DataFrame) -> pd.DataFrame:
+    def __get_listen_history_rows_for_insert(listen_history_df: pd.DataFrame,
+                                             columns_names: list[str],
+                                             chunk_size: int = config.DB_BULK_INSERT_CHUNK_SIZE) -> Iterator[tuple]:
         """
-        Returns a DataFrame ready for insertion to the DB.
+        Generates the rows of a Listen History DataFrame, ready for insertion to the DB, without the duplicate
+        listens.
+
+        The rows are converted into the DB's values one chunk of rows at a time, so only a single chunk is ever
+        copied (instead of the whole DataFrame).
 
         Parameters:
             listen_history_df: DataFrame to insert.
 
+            columns_names: Names of the columns to take, in the order of the values in each row.
+
+            chunk_size: Amount of rows to convert at a time.
+
         Returns:
-            DataFrame ready for insertion.
+            Iterator of tuples, each containing the values of a single row.
         """
-        df_to_insert = listen_history_df[[SPDTNM.USERNAME,
-                                          SPDTNM.TIMESTAMP,
-                                          SPDTNM.TRACK_ID,
-                                          SPDTNM.MS_PLAYED,
-                                          SPDTNM.REASON_START,
-                                          SPDTNM.REASON_END,
-                                          SPDTNM.SKIPPED,
-                                          SPDTNM.PLATFORM,
-                                          SPDTNM.CONN_COUNTRY,
-                                          SPDTNM.TRACK_URI,
-                                          SPDTNM.SHUFFLE,
-                                          SPDTNM.OFFLINE,
-                                          SPDTNM.INCOGNITO]].fillna(value = {SPDTNM.SKIPPED: ''},
-                                                                    inplace = False)
+        is_duplicate = listen_history_df.duplicated(subset = [SPDTNM.USERNAME,
+                                                              SPDTNM.TIMESTAMP,
+                                                              SPDTNM.TRACK_ID]).to_numpy()
+
+        for chunk_start in range(0, len(listen_history_df), chunk_size):
+            chunk_df = listen_history_df.iloc[chunk_start:chunk_start + chunk_size]
+            chunk_df = chunk_df.loc[~is_duplicate[chunk_start:chunk_start + chunk_size], columns_names]
+            rows_df = chunk_df.astype(object)
 
-        df_to_insert = df_to_insert.drop_duplicates(
-            subset = [SPDBNM.TRACKS_LISTEN_HISTORY.USERNAME,
-                      SPDBNM.TRACKS_LISTEN_HISTORY.TIMESTAMP,
-                      SPDBNM.TRACKS_LISTEN_HISTORY.TRACK_ID])
+            # Typed columns (see ``SpotifyDataSet.set_listen_history_dtypes``) are turned back into the DB's values:
+            if pd.api.types.is_datetime64_any_dtype(chunk_df[SPDTNM.TIMESTAMP]):
+                rows_df[SPDTNM.TIMESTAMP] = chunk_df[SPDTNM.TIMESTAMP].dt.strftime(DB.TIMESTAMP_FORMAT)
 
-        return df_to_insert
+            rows_df = rows_df.where(rows_df.notna(), None).fillna(value = {SPDTNM.SKIPPED: ''}, inplace = False)
+
+            yield from rows_df.itertuples(index = False, name = None)
 
     # endregion Insertion Utilities
 
@@ -169,32 +221,39 @@ class DB:
         self.cursor = self.connection.cursor()
 
         init_db_script = open(self._db_schema_filename, "rt").read()
+        self.schema_hash = utl.get_file_hash(self._db_schema_filename)
 
         try:
             self.cursor.executescript(init_db_script)
 
         except sqlite3.OperationalError as e:
             DB.eprint(log.DB_OPERATIONAL_ERROR.format(e))
-            log.write(message = log.DB_SCHEMA_ERROR)
+            log.write(message = log.DB_SCHEMA_ERROR, level = log.ERROR)
 
     def commit(self) -> None:
         """Commits all changes to the DB."""
         self.connection.commit()
 
+    def rollback(self) -> None:
+        """Discards all the changes to the DB since the last commit."""
+        self.connection.rollback()
+
     def close(self) -> None:
         """Closes the connection and the cursor to the DB."""
-        self.connection.close()
         self.cursor.close()
+        self.connection.close()
 
     # endregion Instantiation logic
 
     # region Insertion Logic
 
+    @metrics.timed
     def insert(self,
                table_name: str,
                values: dict | list[dict],
                columns_names: list[str],
-               commit: bool = False) -> None:
+               commit: bool = False,
+               replace: bool = True) -> None:
         """
         Generic method to insert single or multiple values to a table.
 
@@ -208,15 +267,23 @@ class DB:
 
             commit: Whether to commit the operation.
 
+            replace: Whether to replace existing records that have the same key. Otherwise, existing records are
+                kept as they are.
+
         Returns:
             None.
+
+        Raises:
+            sqlite3.IntegrityError: if the values violate a constraint of the table (the error is logged first).
+
+            sqlite3.OperationalError: if the values could not be inserted (the error is logged first).
         """
         if values is None:
-            log.write("WARNING: " + log.EMPTY_VALUES.format(table_name))
+            log.write(log.EMPTY_VALUES.format(table_name), level = log.WARNING)
 
         else:
             try:
-                query = f"""INSERT OR REPLACE INTO {table_name} 
+                query = f"""INSERT OR {'REPLACE' if replace else 'IGNORE'} INTO {table_name} 
                 ({', '.join([name for name in columns_names])})
 
                 VALUES 
@@ -224,61 +291,196 @@ class DB:
 
                 match values:
                     case dict() as values:
-                        log.write(log.INSERTING_RECORD.format(f"``{table_name}``"))
+                        log.write(log.INSERTING_RECORD.format(f"``{table_name}``"), level = log.DEBUG)
                         self.cursor.execute(query, values)
+                        metrics.increment(metrics.ROWS_INSERTED.format(table_name), self.cursor.rowcount)
 
-                        log.write(log.RECORD_INSERTED)
+                        log.write(log.RECORD_INSERTED, level = log.DEBUG)
 
                     case list() as values:
-                        log.write(log.INSERTING_RECORDS.format(f"``{table_name}``", len(values)))
+                        log.write(log.INSERTING_RECORDS.format(f"``{table_name}``", len(values)), level = log.DEBUG)
                         self.cursor.executemany(query, values)
+                        metrics.increment(metrics.ROWS_INSERTED.format(table_name), self.cursor.rowcount)
 
-                        log.write(log.RECORDS_INSERTED)
+                        log.write(log.RECORDS_INSERTED, level = log.DEBUG)
 
                     case _:
-                        log.write(log.ERROR_INVALID_RECORDS_TYPE.format(type(values)))
+                        log.write(log.ERROR_INVALID_RECORDS_TYPE.format(type(values)), level = log.ERROR)
 
                 if commit:
                     self.commit()
 
             except sqlite3.IntegrityError as e:
                 DB.eprint(log.DB_INTEGRITY_ERROR.format(e))
+                raise
 
             except sqlite3.OperationalError as e:
                 DB.eprint(log.DB_OPERATIONAL_ERROR.format(e))
+                raise
 
-    def __insert_listen_history_df(self, listen_history_df: pd.DataFrame, commit: bool = False) -> None:
+    def __get_secondary_indexes(self, table_name: str) -> dict[str, str]:
         """
-        Inserts values from a prepared Listen History DataFrame to DB.
+        Returns the secondary indexes of the given table (i.e. not the automatic indexes of its primary key and
+        unique constraints), along with the SQL statements that create them.
 
         Parameters:
-            listen_history_df: DataFrame with the prepared Listen History data.
+            table_name: Name of the DB-table.
+
+        Returns:
+            Dictionary mapping each index's name to its ``CREATE INDEX`` statement.
+        """
+        self.cursor.execute("""SELECT name, sql FROM sqlite_master 
+                               WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL;""", (table_name,))
+
+        return dict(self.cursor.fetchall())
+
+    @metrics.timed
+    def bulk_insert(self,
+                    table_name: str,
+                    rows: Iterable[tuple],
+                    columns_names: list[str],
+                    commit: bool = False,
+                    replace: bool = True,
+                    rebuild_indexes: bool = False) -> None:
+        """
+        Inserts a large amount of rows into a table, faster than :meth:`insert`.
+
+        The rows are plain tuples which are streamed into the DB (so they can be generated lazily, without building
+        a dictionary per row), all inside a single transaction, with the pragmas in ``BULK_LOAD_PRAGMAS`` applied
+        for the duration of the load. If no transaction is open yet, the connection is also switched to the
+        pragmas in ``BULK_LOAD_CONNECTION_PRAGMAS`` (the WAL journal mode is persistent in the DB file), and if the
+        load fails, the transaction it opened is rolled back.
+
+        Parameters:
+            table_name: Name of the DB-table, into which to insert the rows.
+
+            rows: Iterable of tuples, each containing the values of a single row, ordered the same way as
+                ``columns_names``.
+
+            columns_names: Names of the columns into which to insert the values.
 
             commit: Whether to commit the operation.
 
+            replace: Whether to replace existing records that have the same key. Otherwise, existing records are
+                kept as they are.
+
+            rebuild_indexes: Whether to drop the table's secondary indexes before the load and rebuild them after it,
+                which is faster than updating them row by row when loading a very large amount of rows.
+
         Returns:
             None.
+
+        Raises:
+            sqlite3.IntegrityError: if the values violate a constraint of the table (the error is logged first).
+
+            sqlite3.OperationalError: if the values could not be inserted (the error is logged first).
         """
-        listen_history_list = listen_history_df.to_dict('records')
-
-        self.insert(table_name = SPDBNM.TRACKS_LISTEN_HISTORY.TBL_NAME,
-                    values = listen_history_list,
-                    columns_names = [SPDBNM.TRACKS_LISTEN_HISTORY.USERNAME,
-                                     SPDBNM.TRACKS_LISTEN_HISTORY.TIMESTAMP,
-                                     SPDBNM.TRACKS_LISTEN_HISTORY.TRACK_ID,
-                                     SPDBNM.TRACKS_LISTEN_HISTORY.MS_PLAYED,
-                                     SPDBNM.TRACKS_LISTEN_HISTORY.REASON_START,
-                                     SPDBNM.TRACKS_LISTEN_HISTORY.REASON_END,
-                                     SPDBNM.TRACKS_LISTEN_HISTORY.SKIPPED,
-                                     SPDBNM.TRACKS_LISTEN_HISTORY.PLATFORM,
-                                     SPDBNM.TRACKS_LISTEN_HISTORY.CONN_COUNTRY,
-                                     SPDBNM.TRACKS_LISTEN_HISTORY.URI,
-                                     SPDBNM.TRACKS_LISTEN_HISTORY.SHUFFLE,
-                                     SPDBNM.TRACKS_LISTEN_HISTORY.OFFLINE,
-                                     SPDBNM.TRACKS_LISTEN_HISTORY.INCOGNITO_MODE],
-                    commit = commit)
+        log.write(log.BULK_INSERTING_RECORDS.format(f"``{table_name}``"))
+
+        query = f"""INSERT OR {'REPLACE' if replace else 'IGNORE'} INTO {table_name} 
+                ({', '.join(columns_names)})
+
+                VALUES 
+                ({', '.join('?' * len(columns_names))});"""
+
+        opens_transaction = not self.connection.in_transaction
+
+        if opens_transaction:
+            for pragma, value in DB.BULK_LOAD_CONNECTION_PRAGMAS.items():
+                self.cursor.execute(f"PRAGMA {pragma} = {value};")
+
+        previous_pragmas = {pragma: self.cursor.execute(f"PRAGMA {pragma};").fetchone()[0]
+                            for pragma in DB.BULK_LOAD_PRAGMAS}
+
+        for pragma, value in DB.BULK_LOAD_PRAGMAS.items():
+            self.cursor.execute(f"PRAGMA {pragma} = {value};")
+
+        indexes = self.__get_secondary_indexes(table_name) if rebuild_indexes else {}
+        start = time.perf_counter()
+        is_loaded = False
+
+        try:
+            if opens_transaction:
+                self.cursor.execute("BEGIN;")
+
+            for index_name in indexes:
+                self.cursor.execute(f"DROP INDEX {index_name};")
+
+            try:
+                self.cursor.executemany(query, rows)
+                inserted_count = self.cursor.rowcount
+
+            finally:
+                # If SQLite already rolled the transaction back on an error, the dropped indexes were restored too:
+                if self.connection.in_transaction:
+                    for index_sql in indexes.values():
+                        self.cursor.execute(index_sql)
+
+            metrics.increment(metrics.ROWS_INSERTED.format(table_name), inserted_count)
+
+            if commit:
+                self.commit()
 
-    def insert_tracks(self, tracks_values: dict | list[dict], commit: bool = False) -> None:
+            is_loaded = True
+
+            elapsed_s = time.perf_counter() - start
+            log.write(log.RECORDS_BULK_INSERTED.format(inserted_count, inserted_count / max(elapsed_s, 1e-9)))
+
+        except sqlite3.IntegrityError as e:
+            DB.eprint(log.DB_INTEGRITY_ERROR.format(e))
+            raise
+
+        except sqlite3.OperationalError as e:
+            DB.eprint(log.DB_OPERATIONAL_ERROR.format(e))
+            raise
+
+        finally:
+            # A failed load is discarded as a whole if it opened the transaction, instead of leaving the connection
+            # inside a half-loaded one (a caller's transaction is left for the caller to roll back):
+            if not is_loaded and opens_transaction and self.connection.in_transaction:
+                self.rollback()
+
+            for pragma, value in previous_pragmas.items():
+                self.cursor.execute(f"PRAGMA {pragma} = {value};")
+
+    def __insert_listen_history_df(self, listen_history_df: pd.DataFrame, commit: bool = False) -> None:
+        """
+        Inserts values from a Listen History DataFrame to DB, without its duplicate listens.
+
+        The rows are streamed as tuples, converted one chunk at a time (see :meth:`bulk_insert`). When loading at
+        least ``config.DB_BULK_REBUILD_INDEXES_MIN_ROWS`` rows, the table's secondary indexes are rebuilt once after
+        the load, instead of being updated row by row.
+
+        Parameters:
+            listen_history_df: DataFrame with the Listen History data.
+
+            commit: Whether to commit the operation.
+
+        Returns:
+            None.
+        """
+        columns_names = [SPDBNM.TRACKS_LISTEN_HISTORY.USERNAME,
+                         SPDBNM.TRACKS_LISTEN_HISTORY.TIMESTAMP,
+                         SPDBNM.TRACKS_LISTEN_HISTORY.TRACK_ID,
+                         SPDBNM.TRACKS_LISTEN_HISTORY.MS_PLAYED,
+                         SPDBNM.TRACKS_LISTEN_HISTORY.REASON_START,
+                         SPDBNM.TRACKS_LISTEN_HISTORY.REASON_END,
+                         SPDBNM.TRACKS_LISTEN_HISTORY.SKIPPED,
+                         SPDBNM.TRACKS_LISTEN_HISTORY.PLATFORM,
+                         SPDBNM.TRACKS_LISTEN_HISTORY.CONN_COUNTRY,
+                         SPDBNM.TRACKS_LISTEN_HISTORY.URI,
+                         SPDBNM.TRACKS_LISTEN_HISTORY.SHUFFLE,
+                         SPDBNM.TRACKS_LISTEN_HISTORY.OFFLINE,
+                         SPDBNM.TRACKS_LISTEN_HISTORY.INCOGNITO_MODE]
+
+        # The DataFrame's columns are named the same as the table's columns:
+        self.bulk_insert(table_name = SPDBNM.TRACKS_LISTEN_HISTORY.TBL_NAME,
+                         rows = DB.__get_listen_history_rows_for_insert(listen_history_df, columns_names),
+                         columns_names = columns_names,
+                         commit = commit,
+                         rebuild_indexes = len(listen_history_df) >= config.DB_BULK_REBUILD_INDEXES_MIN_ROWS)
+
+    def insert_tracks(self, tracks_values: dict | list[dict], commit: bool = False, replace: bool = True) -> None:
         """
         Inserts multiple Tracks' values to the **Tracks** DB-table.
 
@@ -287,6 +489,8 @@ class DB:
 
             commit: Whether to commit the operation.
 
+            replace: Whether to replace existing records. Otherwise, existing records are kept as they are.
+
         Returns:
             None.
         """
@@ -305,7 +509,8 @@ class DB:
                                      SPDBNM.TRACKS.HREF,
                                      SPDBNM.TRACKS.URI,
                                      SPDBNM.TRACKS.PREVIEW_URL],
-                    commit = commit)
+                    commit = commit,
+                    replace = replace)
 
     def insert_tracks_audio_features(self, tracks_features_values: dict | list[dict], commit: bool = False) -> None:
         """
@@ -394,7 +599,7 @@ class DB:
                                      SPDBNM.ARTISTS_GENRES.GENRE_NAME],
                     commit = commit)
 
-    def insert_albums(self, albums_values: dict | list[dict], commit: bool = False) -> None:
+    def insert_albums(self, albums_values: dict | list[dict], commit: bool = False, replace: bool = True) -> None:
         """
         Inserts single or multiple Albums' values to the **Albums** DB-table.
 
@@ -403,6 +608,8 @@ class DB:
 
             commit: Whether to commit the operation.
 
+            replace: Whether to replace existing records. Otherwise, existing records are kept as they are.
+
         Returns:
             None.
         """
@@ -417,9 +624,13 @@ class DB:
                                      SPDBNM.ALBUMS.IS_AVAILABLE,
                                      SPDBNM.ALBUMS.HREF,
                                      SPDBNM.ALBUMS.URI],
-                    commit = commit)
+                    commit = commit,
+                    replace = replace)
 
-    def insert_artists_albums(self, artists_albums_values: dict | list[dict], commit: bool = False) -> None:
+    def insert_artists_albums(self,
+                              artists_albums_values: dict | list[dict],
+                              commit: bool = False,
+                              replace: bool = True) -> None:
         """Inserts single or multiple Artists' Albums values to the **Artists' Albums** DB table.
 
         Parameters:
@@ -427,6 +638,8 @@ class DB:
 
             commit: Whether to commit the operation.
 
+            replace: Whether to replace existing records. Otherwise, existing records are kept as they are.
+
         Returns:
             None.
         """
@@ -435,9 +648,13 @@ class DB:
                     columns_names = [SPDBNM.ARTISTS_ALBUMS.ARTIST_ID,
                                      SPDBNM.ARTISTS_ALBUMS.ALBUM_ID,
                                      SPDBNM.ARTISTS_ALBUMS.ALBUM_GROUP],
-                    commit = commit)
+                    commit = commit,
+                    replace = replace)
 
-    def insert_albums_tracks(self, albums_tracks_values: dict | list[dict], commit: bool = False) -> None:
+    def insert_albums_tracks(self,
+                             albums_tracks_values: dict | list[dict],
+                             commit: bool = False,
+                             replace: bool = True) -> None:
         """
         Inserts single or multiple Albums' Tracks' values to the **Albums' Tracks** DB-table.
 
@@ -447,6 +664,8 @@ class DB:
 
             commit: Whether to commit the operation.
 
+            replace: Whether to replace existing records. Otherwise, existing records are kept as they are.
+
         Returns:
             None.
         """
@@ -454,6 +673,48 @@ class DB:
                     values = albums_tracks_values,
                     columns_names = [SPDBNM.ALBUMS_TRACKS.ALBUM_ID,
                                      SPDBNM.ALBUMS_TRACKS.TRACK_ID],
+                    commit = commit,
+                    replace = replace)
+
+    def insert_tracks_artists(self, tracks_artists_values: dict | list[dict], commit: bool = False) -> None:
+        """
+        Inserts single or multiple Tracks' Artists values to the **Tracks' Artists** DB-table.
+
+        Parameters:
+            tracks_artists_values: Dictionary, or a List of Dicts, each containing a desired track's artist to insert.
+
+            commit: Whether to commit the operation.
+
+        Returns:
+            None.
+        """
+        self.insert(table_name = SPDBNM.TRACKS_ARTISTS.TBL_NAME,
+                    values = tracks_artists_values,
+                    columns_names = [SPDBNM.TRACKS_ARTISTS.TRACK_ID,
+                                     SPDBNM.TRACKS_ARTISTS.ARTIST_ID],
+                    commit = commit,
+                    replace = False)
+
+    def insert_artists_discography_fetches(self,
+                                           discography_fetches_values: dict | list[dict],
+                                           commit: bool = False) -> None:
+        """
+        Inserts single or multiple Artists' Discography Fetches values to the **Artists' Discography Fetches**
+        DB-table. The fetch time of each artist is set to the current time.
+
+        Parameters:
+            discography_fetches_values: Dictionary, or a List of Dicts, each containing an artist whose discography
+                was fetched, and the album groups that were fetched.
+
+            commit: Whether to commit the operation.
+
+        Returns:
+            None.
+        """
+        self.insert(table_name = SPDBNM.ARTISTS_DISCOGRAPHY_FETCHES.TBL_NAME,
+                    values = discography_fetches_values,
+                    columns_names = [SPDBNM.ARTISTS_DISCOGRAPHY_FETCHES.ARTIST_ID,
+                                     SPDBNM.ARTISTS_DISCOGRAPHY_FETCHES.ALBUM_GROUPS],
                     commit = commit)
 
     def insert_linked_tracks(self, linked_track_values: dict | list[dict], commit: bool = False) -> None:
@@ -494,6 +755,27 @@ class DB:
                                      SPDBNM.LINKED_ALBUMS.RELINKED_ID],
                     commit = commit)
 
+    def insert_imported_files(self, imported_files_values: dict | list[dict], commit: bool = False) -> None:
+        """
+        Inserts single or multiple imported Listen History files' values to the **Imported Files** DB table.
+
+        Parameters:
+            imported_files_values: Dictionary, or a List of dicts, each dict containing a file's path, size,
+                modification time and content hash.
+
+            commit: Whether to commit the operation.
+
+        Returns:
+            None.
+        """
+        self.insert(table_name = SPDBNM.IMPORTED_FILES.TBL_NAME,
+                    values = imported_files_values,
+                    columns_names = [SPDBNM.IMPORTED_FILES.FILE_PATH,
+                                     SPDBNM.IMPORTED_FILES.FILE_SIZE,
+                                     SPDBNM.IMPORTED_FILES.FILE_MTIME,
+                                     SPDBNM.IMPORTED_FILES.CONTENT_HASH],
+                    commit = commit)
+
     def insert_listen_history(self, df: pd.DataFrame, commit: bool = False) -> None:
         """
         Inserts Listen History table to the DB.
@@ -507,46 +789,593 @@ class DB:
         Returns:
             None.
         """
-        df_to_insert = DB.__get_listen_history_df_for_insert(df)
+        self.__insert_listen_history_df(df, commit)
+
+    def update_albums_availability(self, albums_availability: dict[str, bool], commit: bool = False) -> None:
+        """
+        Updates the ``is_available`` attribute of existing albums in the **Albums** DB-table.
+
+        Parameters:
+            albums_availability: Dictionary mapping each Album ID to whether that album is available.
+
+            commit: Whether to commit the operation.
+
+        Returns:
+            None.
+        """
+        query = f"""UPDATE {SPDBNM.ALBUMS.TBL_NAME}
+                    SET {SPDBNM.ALBUMS.IS_AVAILABLE} = ?
+                    WHERE {SPDBNM.ALBUMS.ID} = ?;"""
+
+        self.cursor.executemany(query, [(is_available, album_id)
+                                        for album_id, is_available in albums_availability.items()])
+
+        if commit:
+            self.commit()
+
+    def refresh_known_listen_history(self,
+                                     commit: bool = False,
+                                     from_timestamps: dict[str, str | pd.Timestamp] = None,
+                                     tracks_ids: set | list = None) -> None:
+        """
+        Refreshes the materialized **Known Listen History** DB-table from view ``v_known_listen_history``.
+        Should be called after new data is inserted into the tables the view is built upon.
+
+        By default, the whole table is rebuilt, with its rows inserted in the view's sort order. When
+        ``from_timestamps`` or ``tracks_ids`` is given, only the rows of the listens that might have changed are
+        rebuilt: all the listens of the given tracks, and each given user's listens from the given time on (e.g. the
+        newly imported listens). If the table was not filled yet, it's rebuilt as a whole anyway.
+
+        Parameters:
+            commit: Whether to commit the operation.
+
+            from_timestamps: Dictionary mapping usernames to the time (inclusive) from which their listens are
+                rebuilt. Default: no user's time range is rebuilt (if ``tracks_ids`` is given), otherwise the whole
+                table is rebuilt.
+
+            tracks_ids: IDs of listened tracks whose listens are rebuilt (e.g. tracks whose links to their Known
+                Tracks, or whose albums, were changed). Default: no track's listens are rebuilt (if
+                ``from_timestamps`` is given), otherwise the whole table is rebuilt.
+
+        Returns:
+            None.
+
+        Raises:
+            sqlite3.OperationalError: if the table could not be refreshed (the error is logged first).
+        """
+        log.write(log.REFRESHING_KNOWN_LISTEN_HISTORY)
+
+        order_by = f"""ORDER BY {SPDBNM.V_KNOWN_LISTEN_HISTORY.USERNAME} ASC,
+                                {SPDBNM.V_KNOWN_LISTEN_HISTORY.TIMESTAMP} ASC,
+                                {SPDBNM.V_KNOWN_LISTEN_HISTORY.TRACK_KNOWN_ID} ASC,
+                                {SPDBNM.V_KNOWN_LISTEN_HISTORY.ALBUM_ARTIST_NAME} ASC"""
+
+        try:
+            if (from_timestamps is None and tracks_ids is None) or not self.__is_known_listen_history_filled():
+                self.cursor.execute(f"DELETE FROM {SPDBNM.KNOWN_LISTEN_HISTORY.TBL_NAME};")
+                self.cursor.execute(f"""INSERT INTO {SPDBNM.KNOWN_LISTEN_HISTORY.TBL_NAME}
+                                        SELECT * FROM {SPDBNM.V_KNOWN_LISTEN_HISTORY.VIEW_NAME}
+                                        {order_by};""")
+
+                refreshed_count = self.cursor.rowcount
+
+            else:
+                refreshed_count = 0
+
+                # The tracks' listens are rebuilt first, so the ones that are also in the users' time ranges are
+                # deleted again (and inserted only once) below:
+                for condition, params in self.__get_keys_filters(SPDBNM.KNOWN_LISTEN_HISTORY.TRACK_LISTENED_ID,
+                                                                 [] if tracks_ids is None else tracks_ids):
+                    self.cursor.execute(f"""DELETE FROM {SPDBNM.KNOWN_LISTEN_HISTORY.TBL_NAME}
+                                            WHERE {condition};""", params)
+                    self.cursor.execute(f"""INSERT INTO {SPDBNM.KNOWN_LISTEN_HISTORY.TBL_NAME}
+                                            SELECT * FROM {SPDBNM.V_KNOWN_LISTEN_HISTORY.VIEW_NAME}
+                                            WHERE {condition}
+                                            {order_by};""", params)
+
+                    refreshed_count += self.cursor.rowcount
 
-        self.__insert_listen_history_df(df_to_insert, commit)
+                for username, from_timestamp in ({} if from_timestamps is None else from_timestamps).items():
+                    params = (username, DB.__format_timestamp(from_timestamp))
+
+                    self.cursor.execute(f"""DELETE FROM {SPDBNM.KNOWN_LISTEN_HISTORY.TBL_NAME}
+                                            WHERE {SPDBNM.KNOWN_LISTEN_HISTORY.USERNAME} = ?
+                                              AND {SPDBNM.KNOWN_LISTEN_HISTORY.TIMESTAMP} >= ?;""", params)
+                    self.cursor.execute(f"""INSERT INTO {SPDBNM.KNOWN_LISTEN_HISTORY.TBL_NAME}
+                                            SELECT * FROM {SPDBNM.V_KNOWN_LISTEN_HISTORY.VIEW_NAME}
+                                            WHERE {SPDBNM.V_KNOWN_LISTEN_HISTORY.USERNAME} = ?
+                                              AND {SPDBNM.V_KNOWN_LISTEN_HISTORY.TIMESTAMP} >= ?
+                                            {order_by};""", params)
+
+                    refreshed_count += self.cursor.rowcount
+
+            self.__increment_data_version()
+
+            if commit:
+                self.commit()
+
+            log.write(log.KNOWN_LISTEN_HISTORY_REFRESHED.format(refreshed_count))
+
+        except sqlite3.OperationalError as e:
+            DB.eprint(log.DB_OPERATIONAL_ERROR.format(e))
+            raise
+
+    def __increment_data_version(self) -> None:
+        """Increments the DB's data version counter, marking that the listen history data has changed."""
+        self.cursor.execute(f"""INSERT INTO {SPDBNM.DB_METADATA.TBL_NAME} 
+                                ({SPDBNM.DB_METADATA.KEY}, {SPDBNM.DB_METADATA.VALUE})
+                                VALUES (?, 1)
+                                ON CONFLICT ({SPDBNM.DB_METADATA.KEY})
+                                DO UPDATE SET {SPDBNM.DB_METADATA.VALUE} = {SPDBNM.DB_METADATA.VALUE} + 1;""",
+                            (SPDBNM.DB_METADATA.DATA_VERSION,))
 
     # endregion Insertion Logic
 
+    # region Import Checkpoints Logic
+
+    def enqueue_checkpoints(self, stage: str, entities_ids: set | list, commit: bool = False) -> None:
+        """
+        Adds entities to the work queue of a stage of the enrichment pipeline, in the **Import Checkpoints**
+        DB-table. Entities that are already in the stage's queue (whether done or not) are left as they are.
+
+        Parameters:
+            stage: Name of the stage (one of the stages in :class:`SPDBNM.IMPORT_CHECKPOINTS`).
+
+            entities_ids: IDs of the entities to add.
+
+            commit: Whether to commit the operation.
+
+        Returns:
+            None.
+        """
+        query = f"""INSERT OR IGNORE INTO {SPDBNM.IMPORT_CHECKPOINTS.TBL_NAME}
+                    ({SPDBNM.IMPORT_CHECKPOINTS.STAGE}, {SPDBNM.IMPORT_CHECKPOINTS.ENTITY_ID})
+                    VALUES (?, ?);"""
+
+        self.cursor.executemany(query, [(stage, entity_id) for entity_id in entities_ids if entity_id is not None])
+
+        if commit:
+            self.commit()
+
+    def mark_checkpoints_done(self, stage: str, entities_ids: set | list, commit: bool = False) -> None:
+        """
+        Marks entities as done in a stage of the enrichment pipeline, in the **Import Checkpoints** DB-table.
+        Entities that are not in the stage's queue yet are added to it as done.
+
+        Parameters:
+            stage: Name of the stage (one of the stages in :class:`SPDBNM.IMPORT_CHECKPOINTS`).
+
+            entities_ids: IDs of the done entities.
+
+            commit: Whether to commit the operation.
+
+        Returns:
+            None.
+        """
+        query = f"""INSERT INTO {SPDBNM.IMPORT_CHECKPOINTS.TBL_NAME}
+                    ({SPDBNM.IMPORT_CHECKPOINTS.STAGE}, 
+                     {SPDBNM.IMPORT_CHECKPOINTS.ENTITY_ID}, 
+                     {SPDBNM.IMPORT_CHECKPOINTS.IS_DONE})
+                    VALUES (?, ?, TRUE)
+                    ON CONFLICT ({SPDBNM.IMPORT_CHECKPOINTS.STAGE}, {SPDBNM.IMPORT_CHECKPOINTS.ENTITY_ID})
+                    DO UPDATE SET {SPDBNM.IMPORT_CHECKPOINTS.IS_DONE} = TRUE;"""
+
+        self.cursor.executemany(query, [(stage, entity_id) for entity_id in entities_ids if entity_id is not None])
+
+        if commit:
+            self.commit()
+
+    def get_pending_checkpoints(self, stage: str, limit: int = -1) -> list[str]:
+        """
+        Returns the IDs of the entities that are still pending in a stage of the enrichment pipeline.
+
+        Parameters:
+            stage: Name of the stage (one of the stages in :class:`SPDBNM.IMPORT_CHECKPOINTS`).
+
+            limit: Maximal amount of IDs to return. Default: all the pending IDs.
+
+        Returns:
+            List of the pending entities' IDs.
+        """
+        query = f"""SELECT {SPDBNM.IMPORT_CHECKPOINTS.ENTITY_ID}
+                    FROM {SPDBNM.IMPORT_CHECKPOINTS.TBL_NAME}
+                    WHERE {SPDBNM.IMPORT_CHECKPOINTS.STAGE} = ?
+                      AND {SPDBNM.IMPORT_CHECKPOINTS.IS_DONE} = FALSE
+                    LIMIT ?;"""
+
+        return [entity_id for (entity_id,) in self.cursor.execute(query, (stage, limit)).fetchall()]
+
+    def count_pending_checkpoints(self, stage: str = None) -> int:
+        """
+        Returns the amount of entities that are still pending in a stage of the enrichment pipeline,
+        or in all of its stages.
+
+        Parameters:
+            stage: Name of the stage (one of the stages in :class:`SPDBNM.IMPORT_CHECKPOINTS`).
+                Default: all the stages.
+
+        Returns:
+            Amount of pending entities.
+        """
+        query = f"""SELECT COUNT(*)
+                    FROM {SPDBNM.IMPORT_CHECKPOINTS.TBL_NAME}
+                    WHERE {SPDBNM.IMPORT_CHECKPOINTS.IS_DONE} = FALSE"""
+
+        if stage is None:
+            return self.cursor.execute(f"{query};").fetchone()[0]
+
+        return self.cursor.execute(f"{query} AND {SPDBNM.IMPORT_CHECKPOINTS.STAGE} = ?;", (stage,)).fetchone()[0]
+
+    def clear_checkpoints(self, commit: bool = False) -> None:
+        """
+        Deletes all the entities from the **Import Checkpoints** DB-table, after the enrichment pipeline was
+        completed.
+
+        Parameters:
+            commit: Whether to commit the operation.
+
+        Returns:
+            None.
+        """
+        self.cursor.execute(f"DELETE FROM {SPDBNM.IMPORT_CHECKPOINTS.TBL_NAME};")
+
+        if commit:
+            self.commit()
+
+    # endregion Import Checkpoints Logic
+
     # region Selection Logic
 
-    def get_listen_history_df(self) -> pd.DataFrame:
-        query = f"""SELECT
-                    {SPDBNM.V_KNOWN_LISTEN_HISTORY.USERNAME},
-                    {SPDBNM.V_KNOWN_LISTEN_HISTORY.TIMESTAMP},
-                    {SPDBNM.V_KNOWN_LISTEN_HISTORY.TRACK_LISTENED_ID},
-                    {SPDBNM.V_KNOWN_LISTEN_HISTORY.TRACK_KNOWN_ID},
-                    {SPDBNM.V_KNOWN_LISTEN_HISTORY.TRACK_NAME},
-                    {SPDBNM.V_KNOWN_LISTEN_HISTORY.ALBUM_KNOWN_ID},
-                    {SPDBNM.V_KNOWN_LISTEN_HISTORY.ALBUM_NAME},
-                    {SPDBNM.V_KNOWN_LISTEN_HISTORY.ALBUM_ARTIST_ID},
-                    {SPDBNM.V_KNOWN_LISTEN_HISTORY.ALBUM_ARTIST_NAME},
-                    {SPDBNM.V_KNOWN_LISTEN_HISTORY.MS_PLAYED},
-                    {SPDBNM.V_KNOWN_LISTEN_HISTORY.TRACK_DURATION_MS},
-                    {SPDBNM.V_KNOWN_LISTEN_HISTORY.REASON_START},
-                    {SPDBNM.V_KNOWN_LISTEN_HISTORY.REASON_END},
-                    {SPDBNM.V_KNOWN_LISTEN_HISTORY.SKIPPED},
-                    {SPDBNM.V_KNOWN_LISTEN_HISTORY.PLATFORM},
-                    {SPDBNM.V_KNOWN_LISTEN_HISTORY.CONN_COUNTRY},
-                    {SPDBNM.V_KNOWN_LISTEN_HISTORY.URI},
-                    {SPDBNM.V_KNOWN_LISTEN_HISTORY.SHUFFLE},
-                    {SPDBNM.V_KNOWN_LISTEN_HISTORY.OFFLINE},
-                    {SPDBNM.V_KNOWN_LISTEN_HISTORY.INCOGNITO_MODE}
-                    FROM {SPDBNM.V_KNOWN_LISTEN_HISTORY.VIEW_NAME};
+    def __get_keys_filters(self,
+                           column_name: str,
+                           keys: str | set | list | pd.Series) -> Iterator[tuple[str, list]]:
+        """
+        Yields SQL conditions that filter the given column by the given keys, along with their parameters.
+        The query should be executed once for each yielded condition, and the results combined.
+
+        A small amount of keys is split into batches of parameterized ``IN (?, ?, ...)`` lists. A large amount of
+        keys is loaded into an indexed temporary table, so a single condition (and a single query) filters by all
+        of them, by looking each row's key up in that table.
+
+        Parameters:
+            column_name: Name of the (qualified, if needed) column to filter.
+
+            keys: Keys to filter by.
+
+        Returns:
+            Iterator of tuples, each containing an SQL condition and the list of its parameters.
+        """
+        unique_keys_list = utl.get_unique_vals_list(keys)
+
+        if len(unique_keys_list) < DB.MIN_IDS_FOR_TEMP_TABLE:
+            for i in range(0, len(unique_keys_list), DB.MAX_IDS_PER_QUERY):
+                keys_chunk = unique_keys_list[i:i + DB.MAX_IDS_PER_QUERY]
+
+                yield f"{column_name} IN ({', '.join('?' * len(keys_chunk))})", keys_chunk
+
+        else:
+            # The keys are loaded inside a savepoint: within the caller's transaction (if one is open) it is nested,
+            # so nothing is committed. Otherwise, releasing it ends the transaction it opened, which contains only
+            # the temporary keys:
+            self.cursor.execute(f"SAVEPOINT {SPDBNM.TEMP_LOOKUP_KEYS.TBL_NAME};")
+            self.cursor.execute(f"""CREATE TEMP TABLE IF NOT EXISTS {SPDBNM.TEMP_LOOKUP_KEYS.TBL_NAME} (
+                                    {SPDBNM.TEMP_LOOKUP_KEYS.KEY} TEXT PRIMARY KEY NOT NULL) WITHOUT ROWID;""")
+            self.cursor.execute(f"DELETE FROM temp.{SPDBNM.TEMP_LOOKUP_KEYS.TBL_NAME};")
+            self.cursor.executemany(f"INSERT INTO temp.{SPDBNM.TEMP_LOOKUP_KEYS.TBL_NAME} VALUES (?);",
+                                    ((key,) for key in unique_keys_list))
+            self.cursor.execute(f"RELEASE SAVEPOINT {SPDBNM.TEMP_LOOKUP_KEYS.TBL_NAME};")
+
+            yield (f"""{column_name} IN (SELECT {SPDBNM.TEMP_LOOKUP_KEYS.KEY} 
+                                         FROM temp.{SPDBNM.TEMP_LOOKUP_KEYS.TBL_NAME})""", [])
+
+    def get_listen_history_df(self,
+                              columns: list[str] = None,
+                              usernames: str | list[str] = None,
+                              from_timestamp: str | pd.Timestamp = None,
+                              to_timestamp: str | pd.Timestamp = None) -> pd.DataFrame:
+        """
+        Returns the known listen history, from its materialized DB-table (see
+        :meth:`refresh_known_listen_history`). If the table was not filled yet (e.g. the DB was created
+        before the table existed), refreshes it first.
+
+        The projection and the filters are pushed down into the query, so only the requested slice's rows and
+        columns are read from the DB (the time-window and per-user filters are served by the table's indexes).
+
+        Parameters:
+            columns: Names of the columns to read (of :attr:`LISTEN_HISTORY_COLUMNS`). Default: all the columns.
+
+            usernames: Username (or usernames) whose listens to read. Default: all the users.
+
+            from_timestamp: Earliest time of the listens to read (inclusive), e.g. '2021' or '2021-03-01'.
+                Default: from the first listen.
+
+            to_timestamp: Latest time of the listens to read (exclusive), e.g. '2022'. Default: until the last listen.
+
+        Returns:
+            DataFrame with the known listen history, sorted by user, timestamp, track and artist.
+
+        Raises:
+            ValueError: if any of the given columns is not a column of the known listen history.
+        """
+        if columns is None:
+            columns = DB.LISTEN_HISTORY_COLUMNS
+
+        unknown_columns = [column for column in columns if column not in DB.LISTEN_HISTORY_COLUMNS]
+
+        if len(unknown_columns) > 0:
+            raise ValueError(f"Unknown listen history columns: {unknown_columns}")
+
+        if not self.__is_known_listen_history_filled():
+            self.refresh_known_listen_history(commit = True)
+
+        conditions, params = [], []
+
+        if usernames is not None:
+            usernames = [usernames] if isinstance(usernames, str) else list(usernames)
+            conditions.append(f"{SPDBNM.KNOWN_LISTEN_HISTORY.USERNAME} IN ({', '.join('?' * len(usernames))})")
+            params.extend(usernames)
+
+        if from_timestamp is not None:
+            conditions.append(f"{SPDBNM.KNOWN_LISTEN_HISTORY.TIMESTAMP} >= ?")
+            params.append(DB.__format_timestamp(from_timestamp))
+
+        if to_timestamp is not None:
+            conditions.append(f"{SPDBNM.KNOWN_LISTEN_HISTORY.TIMESTAMP} < ?")
+            params.append(DB.__format_timestamp(to_timestamp))
+
+        # Partial refreshes append their rows to the table, so the view's sort order is restored when reading:
+        query = f"""SELECT {', '.join(columns)}
+                    FROM {SPDBNM.KNOWN_LISTEN_HISTORY.TBL_NAME}
+                    {f"WHERE {' AND '.join(conditions)}" if len(conditions) > 0 else ''}
+                    ORDER BY {SPDBNM.KNOWN_LISTEN_HISTORY.USERNAME} ASC,
+                             {SPDBNM.KNOWN_LISTEN_HISTORY.TIMESTAMP} ASC,
+                             {SPDBNM.KNOWN_LISTEN_HISTORY.TRACK_KNOWN_ID} ASC,
+                             {SPDBNM.KNOWN_LISTEN_HISTORY.ALBUM_ARTIST_NAME} ASC;
                     """
 
         log.write(log.READING_LISTEN_HISTORY)
-        listen_history_df = pd.read_sql_query(sql = query, con = self.connection)
+        listen_history_df = pd.read_sql_query(sql = query, con = self.connection, params = params)
 
         log.write(log.LISTEN_HISTORY_READ)
 
         return listen_history_df
 
+    @staticmethod
+    def __format_timestamp(timestamp: str | pd.Timestamp) -> str:
+        """
+        Formats a time as the listens' timestamps in the DB (in UTC), so the two can be compared as strings.
+
+        Parameters:
+            timestamp: Time to format. A time without a timezone is taken as UTC.
+
+        Returns:
+            The formatted time.
+        """
+        timestamp = pd.Timestamp(timestamp)
+
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.tz_convert('UTC')
+
+        return timestamp.strftime(DB.TIMESTAMP_FORMAT)
+
+    def __is_known_listen_history_filled(self) -> bool:
+        """
+        Checks whether the materialized known listen history table was filled, or that there's no listen history
+        to fill it with.
+
+        Returns:
+            False if the table is empty while the listen history isn't, True otherwise.
+        """
+        query = f"""SELECT EXISTS (SELECT 1 FROM {SPDBNM.KNOWN_LISTEN_HISTORY.TBL_NAME})
+                        OR NOT EXISTS (SELECT 1 FROM {SPDBNM.TRACKS_LISTEN_HISTORY.TBL_NAME});"""
+
+        return bool(self.cursor.execute(query).fetchone()[0])
+
+    def get_data_version(self) -> str:
+        """
+        Returns the version of the data in the DB: its data version counter, which changes whenever the listen
+        history changes, combined with the hash of the DB schema.
+        Used for knowing whether data that was derived from the DB (e.g. a snapshot) is still up-to-date.
+
+        Returns:
+            String representing the data version.
+        """
+        query = f"""SELECT {SPDBNM.DB_METADATA.VALUE}
+                    FROM {SPDBNM.DB_METADATA.TBL_NAME}
+                    WHERE {SPDBNM.DB_METADATA.KEY} = ?;"""
+
+        row = self.cursor.execute(query, (SPDBNM.DB_METADATA.DATA_VERSION,)).fetchone()
+
+        return f"{row[0] if row is not None else 0}-{self.schema_hash}"
+
+    def get_imported_files(self) -> dict[str, dict]:
+        """
+        Returns the details of all the Listen History files that were already imported into the DB.
+
+        Returns:
+            Dictionary mapping each imported file's path to a dict with its size, modification time and content hash.
+        """
+        query = f"""SELECT
+                    {SPDBNM.IMPORTED_FILES.FILE_PATH},
+                    {SPDBNM.IMPORTED_FILES.FILE_SIZE},
+                    {SPDBNM.IMPORTED_FILES.FILE_MTIME},
+                    {SPDBNM.IMPORTED_FILES.CONTENT_HASH}
+                    FROM {SPDBNM.IMPORTED_FILES.TBL_NAME};
+                    """
+
+        imported_files = {}
+
+        for file_path, file_size, file_mtime, content_hash in self.cursor.execute(query):
+            imported_files[file_path] = {SPDBNM.IMPORTED_FILES.FILE_PATH   : file_path,
+                                         SPDBNM.IMPORTED_FILES.FILE_SIZE   : file_size,
+                                         SPDBNM.IMPORTED_FILES.FILE_MTIME  : file_mtime,
+                                         SPDBNM.IMPORTED_FILES.CONTENT_HASH: content_hash}
+
+        return imported_files
+
+    def get_last_listen_timestamps(self) -> dict[str, str]:
+        """
+        Returns the timestamp of the latest listen in the Listen History, for each user.
+
+        Returns:
+            Dictionary mapping each username to the latest ``time_stamp`` of their listens.
+        """
+        query = f"""SELECT
+                    {SPDBNM.TRACKS_LISTEN_HISTORY.USERNAME},
+                    MAX({SPDBNM.TRACKS_LISTEN_HISTORY.TIMESTAMP})
+                    FROM {SPDBNM.TRACKS_LISTEN_HISTORY.TBL_NAME}
+                    GROUP BY {SPDBNM.TRACKS_LISTEN_HISTORY.USERNAME};
+                    """
+
+        return dict(self.cursor.execute(query).fetchall())
+
+    def get_tracks_links(self,
+                         tracks_ids: str | set | list | pd.Series = None,
+                         include_connected: bool = False) -> list[tuple[str, str]]:
+        """
+        Returns the links of the listened tracks to their Known Tracks, as saved in the **Linked Tracks** DB-table.
+
+        Parameters:
+            tracks_ids: IDs of the tracks whose links to return: the links from them, and the links to them.
+                Default: all the links.
+
+            include_connected: Whether to also return the links of all the tracks that are linked to the given
+                tracks through any chain of links (i.e. all the links that resolving the given tracks depends on).
+
+        Returns:
+            List of pairs of a listened track's ID and its Known Track's ID (a track that wasn't relinked is paired
+            with itself).
+        """
+        query = f"""SELECT {SPDBNM.LINKED_TRACKS.FROM_ID},
+                           {SPDBNM.LINKED_TRACKS.RELINKED_ID}
+                    FROM {SPDBNM.LINKED_TRACKS.TBL_NAME}"""
+
+        if tracks_ids is None:
+            return self.cursor.execute(f"{query};").fetchall()
+
+        tracks_links = set()
+        found_ids = set()
+        new_ids = set(utl.get_unique_vals_list(tracks_ids))
+
+        while len(new_ids) > 0:
+            found_ids.update(new_ids)
+            new_links = set()
+
+            for column_name in (SPDBNM.LINKED_TRACKS.FROM_ID, SPDBNM.LINKED_TRACKS.RELINKED_ID):
+                for condition, params in self.__get_keys_filters(column_name, list(new_ids)):
+                    new_links.update(self.cursor.execute(f"{query} WHERE {condition};", params).fetchall())
+
+            tracks_links.update(new_links)
+            new_ids = {track_id for link in new_links for track_id in link} - found_ids if include_connected else set()
+
+        return list(tracks_links)
+
+    def get_linked_tracks_albums(self, tracks_ids: str | set | list | pd.Series = None) -> list[tuple[str, str]]:
+        """
+        Returns the albums of the tracks in the **Linked Tracks** DB-table: both the listened tracks and the Known
+        Tracks they were relinked to.
+
+        Parameters:
+            tracks_ids: IDs of tracks whose albums to return (with all of the albums' tracks that are in the
+                **Linked Tracks** DB-table). Default: the albums of all the tracks.
+
+        Returns:
+            List of pairs of an album's ID and the ID of one of its tracks.
+        """
+        query = f"""SELECT {SPDBNM.ALBUMS_TRACKS.ALBUM_ID},
+                           {SPDBNM.ALBUMS_TRACKS.TRACK_ID}
+                    FROM {SPDBNM.ALBUMS_TRACKS.TBL_NAME}
+                    WHERE {SPDBNM.ALBUMS_TRACKS.TRACK_ID} IN (SELECT {SPDBNM.LINKED_TRACKS.FROM_ID}
+                                                               FROM {SPDBNM.LINKED_TRACKS.TBL_NAME}
+                                                               UNION
+                                                               SELECT {SPDBNM.LINKED_TRACKS.RELINKED_ID}
+                                                               FROM {SPDBNM.LINKED_TRACKS.TBL_NAME})"""
+
+        if tracks_ids is None:
+            return self.cursor.execute(f"{query};").fetchall()
+
+        albums_tracks = set()
+
+        for condition, params in self.__get_keys_filters(SPDBNM.ALBUMS_TRACKS.TRACK_ID, tracks_ids):
+            albums_tracks.update(self.cursor.execute(f"""{query}
+                                                         AND {SPDBNM.ALBUMS_TRACKS.ALBUM_ID} IN (
+                                                             SELECT {SPDBNM.ALBUMS_TRACKS.ALBUM_ID}
+                                                             FROM {SPDBNM.ALBUMS_TRACKS.TBL_NAME}
+                                                             WHERE {condition});""", params).fetchall())
+
+        return list(albums_tracks)
+
+    def get_albums_tracks(self, albums_ids: str | set | list | pd.Series) -> set[tuple[str, str]]:
+        """
+        Returns the tracks of the given albums, as saved in the **Albums' Tracks** DB-table.
+
+        Parameters:
+            albums_ids: IDs of the desired albums.
+
+        Returns:
+            Set of pairs of an album's ID and the ID of one of its tracks.
+        """
+        albums_tracks = set()
+
+        for keys_filter, params in self.__get_keys_filters(SPDBNM.ALBUMS_TRACKS.ALBUM_ID, albums_ids):
+            albums_tracks.update(self.cursor.execute(f"""SELECT {SPDBNM.ALBUMS_TRACKS.ALBUM_ID},
+                                                                {SPDBNM.ALBUMS_TRACKS.TRACK_ID}
+                                                         FROM {SPDBNM.ALBUMS_TRACKS.TBL_NAME}
+                                                         WHERE {keys_filter};""", params).fetchall())
+
+        return albums_tracks
+
+    def get_albums_artists_groups(self, albums_ids: str | set | list | pd.Series) -> dict[tuple[str, str], str]:
+        """
+        Returns the artists of the given albums, and the album group of each album in each artist's discography,
+        as saved in the **Artists' Albums** DB-table.
+
+        Parameters:
+            albums_ids: IDs of the desired albums.
+
+        Returns:
+            Dictionary mapping pairs of an artist's ID and an album's ID to the album's group.
+        """
+        albums_artists_groups = {}
+
+        for keys_filter, params in self.__get_keys_filters(SPDBNM.ARTISTS_ALBUMS.ALBUM_ID, albums_ids):
+            query = f"""SELECT {SPDBNM.ARTISTS_ALBUMS.ARTIST_ID},
+                               {SPDBNM.ARTISTS_ALBUMS.ALBUM_ID},
+                               {SPDBNM.ARTISTS_ALBUMS.ALBUM_GROUP}
+                        FROM {SPDBNM.ARTISTS_ALBUMS.TBL_NAME}
+                        WHERE {keys_filter};"""
+
+            for artist_id, album_id, album_group in self.cursor.execute(query, params):
+                albums_artists_groups[(artist_id, album_id)] = album_group
+
+        return albums_artists_groups
+
+    def get_albums_listened_tracks_ids(self, albums_ids: str | set | list | pd.Series) -> set[str]:
+        """
+        Returns the IDs of the listened tracks that were relinked to (or are themselves) Known Tracks of the given
+        albums, i.e. the tracks whose listens are joined to the albums in the known listen history.
+
+        Parameters:
+            albums_ids: IDs of the desired albums.
+
+        Returns:
+            Set of the listened tracks' IDs.
+        """
+        listened_tracks_ids = set()
+
+        for keys_filter, params in self.__get_keys_filters(f"albums_tracks.{SPDBNM.ALBUMS_TRACKS.ALBUM_ID}",
+                                                           albums_ids):
+            query = f"""SELECT DISTINCT linked_tracks.{SPDBNM.LINKED_TRACKS.FROM_ID}
+                        FROM {SPDBNM.ALBUMS_TRACKS.TBL_NAME} AS albums_tracks
+                        INNER JOIN {SPDBNM.LINKED_TRACKS.TBL_NAME} AS linked_tracks
+                            ON linked_tracks.{SPDBNM.LINKED_TRACKS.RELINKED_ID} =
+                               albums_tracks.{SPDBNM.ALBUMS_TRACKS.TRACK_ID}
+                        WHERE {keys_filter};"""
+
+            listened_tracks_ids.update(track_id for (track_id,) in self.cursor.execute(query, params))
+
+        return listened_tracks_ids
+
     def get_tracks_audio_features(self,
                                   tracks_ids: str | set | list | pd.Series = None) -> pd.DataFrame:
         """
@@ -577,17 +1406,144 @@ class DB:
 
         unique_tracks_list = utl.get_unique_vals_list(tracks_ids)
 
+        log.write(log.READING_TRACKS_AUDIO_FEATURES)
+
         if unique_tracks_list is None or len(unique_tracks_list) == 0:
-            query = f"{query};"
+            tracks_features_df = pd.read_sql_query(sql = f"{query};", con = self.connection)
 
         else:
-            values = ', '.join(f"'{track_id}'" for track_id in unique_tracks_list)
-            query = f"""{query} WHERE {SPDBNM.TRACKS_AUDIO_FEATURES.TRACK_ID} IN ({values});"""
+            tracks_features_df = pd.concat(
+                [pd.read_sql_query(sql = f"{query} WHERE {keys_filter};", con = self.connection, params = params)
+                 for keys_filter, params in self.__get_keys_filters(SPDBNM.TRACKS_AUDIO_FEATURES.TRACK_ID,
+                                                                    unique_tracks_list)],
+                ignore_index = True)
 
-        log.write(log.READING_TRACKS_AUDIO_FEATURES)
-        tracks_features_df = pd.read_sql_query(sql = query, con = self.connection)
         log.write(log.TRACKS_AUDIO_FEATURES_READ)
 
         return tracks_features_df
 
+    def get_existing_ids(self,
+                         table_name: str,
+                         column_name: str,
+                         ids: str | set | list | pd.Series,
+                         condition: str = None) -> set[str]:
+        """
+        Returns which of the given IDs already exist in a DB-table, looking them up in the table's (indexed)
+        key column, a chunk of IDs at a time.
+
+        Parameters:
+            table_name: Name of the DB-table to look in.
+
+            column_name: Name of the (indexed) column that contains the IDs.
+
+            ids: IDs to look for.
+
+            condition: Additional SQL condition that the existing rows must meet. Default: no condition.
+
+        Returns:
+            Set of the given IDs that exist in the table.
+        """
+        existing_ids = set()
+
+        for keys_filter, params in self.__get_keys_filters(column_name, ids):
+            query = f"""SELECT DISTINCT {column_name}
+                        FROM {table_name}
+                        WHERE {keys_filter}
+                        {f'AND {condition}' if condition is not None else ''};"""
+
+            existing_ids.update(existing_id for (existing_id,) in self.cursor.execute(query, params))
+
+        return existing_ids
+
+    def get_fresh_discographies_album_groups(self,
+                                             artists_ids: str | set | list | pd.Series,
+                                             max_age_days: int) -> dict[str, set[str]]:
+        """
+        Returns which of the given artists have a discography in the DB that was fetched within the given amount
+        of days, and which album groups it included.
+
+        Parameters:
+            artists_ids: IDs of the desired artists.
+
+            max_age_days: Maximal age (in days) of a discography that is still considered fresh.
+
+        Returns:
+            Dictionary mapping the ID of each artist with a fresh discography to the set of album groups
+            that were fetched.
+        """
+        fresh_album_groups = {}
+
+        for keys_filter, params in self.__get_keys_filters(SPDBNM.ARTISTS_DISCOGRAPHY_FETCHES.ARTIST_ID, artists_ids):
+            query = f"""SELECT {SPDBNM.ARTISTS_DISCOGRAPHY_FETCHES.ARTIST_ID},
+                               {SPDBNM.ARTISTS_DISCOGRAPHY_FETCHES.ALBUM_GROUPS}
+                        FROM {SPDBNM.ARTISTS_DISCOGRAPHY_FETCHES.TBL_NAME}
+                        WHERE {keys_filter}
+                          AND {SPDBNM.ARTISTS_DISCOGRAPHY_FETCHES.FETCHED_AT} >= 
+                              datetime(CURRENT_TIMESTAMP, 'localtime', ?);"""
+
+            for artist_id, album_groups in self.cursor.execute(query, [*params, f'-{max_age_days} days']):
+                fresh_album_groups[artist_id] = set(
+                    album_groups.split(SPDBNM.ARTISTS_DISCOGRAPHY_FETCHES.ALBUM_GROUPS_SEPARATOR)) \
+                    if album_groups else set()
+
+        return fresh_album_groups
+
+    def get_artists_discographies_tracks(self,
+                                         artists_ids: str | set | list | pd.Series,
+                                         album_groups: list[str]) -> pd.DataFrame:
+        """
+        Returns the tracks of the given artists' discographies, as saved in the DB: the tracks of each of the artists'
+        albums of the given album groups. From albums that an artist only appears on, only the tracks of that artist
+        are returned. The obsolete IDs of relinked tracks, which are linked to their (suspected) albums as well, are
+        not returned, since the albums contain their Known Tracks instead.
+
+        Parameters:
+            artists_ids: IDs of the desired artists.
+
+            album_groups: The desired album groups (e.g. 'album', 'appears_on', 'compilation', 'single').
+
+        Returns:
+            DataFrame with the artist's ID, the album's ID and the track's ID, for each track of each artist.
+        """
+        discographies_dfs = []
+
+        for keys_filter, params in self.__get_keys_filters(f"artists_albums.{SPDBNM.ARTISTS_ALBUMS.ARTIST_ID}",
+                                                           artists_ids):
+            query = f"""SELECT artists_albums.{SPDBNM.ARTISTS_ALBUMS.ARTIST_ID},
+                               artists_albums.{SPDBNM.ARTISTS_ALBUMS.ALBUM_ID},
+                               albums_tracks.{SPDBNM.ALBUMS_TRACKS.TRACK_ID}
+                        FROM {SPDBNM.ARTISTS_ALBUMS.TBL_NAME} AS artists_albums
+                        INNER JOIN {SPDBNM.ALBUMS_TRACKS.TBL_NAME} AS albums_tracks
+                            ON albums_tracks.{SPDBNM.ALBUMS_TRACKS.ALBUM_ID} = 
+                               artists_albums.{SPDBNM.ARTISTS_ALBUMS.ALBUM_ID}
+                        LEFT OUTER JOIN {SPDBNM.TRACKS_ARTISTS.TBL_NAME} AS tracks_artists
+                            ON tracks_artists.{SPDBNM.TRACKS_ARTISTS.TRACK_ID} = 
+                               albums_tracks.{SPDBNM.ALBUMS_TRACKS.TRACK_ID}
+                           AND tracks_artists.{SPDBNM.TRACKS_ARTISTS.ARTIST_ID} = 
+                               artists_albums.{SPDBNM.ARTISTS_ALBUMS.ARTIST_ID}
+                        WHERE {keys_filter}
+                          AND artists_albums.{SPDBNM.ARTISTS_ALBUMS.ALBUM_GROUP} 
+                              IN ({', '.join('?' * len(album_groups))})
+                          AND (artists_albums.{SPDBNM.ARTISTS_ALBUMS.ALBUM_GROUP} != ?
+                               OR tracks_artists.{SPDBNM.TRACKS_ARTISTS.ARTIST_ID} IS NOT NULL)
+                          AND NOT EXISTS (SELECT 1
+                                          FROM {SPDBNM.LINKED_TRACKS.TBL_NAME} AS linked_tracks
+                                          WHERE linked_tracks.{SPDBNM.LINKED_TRACKS.FROM_ID} = 
+                                                albums_tracks.{SPDBNM.ALBUMS_TRACKS.TRACK_ID}
+                                            AND linked_tracks.{SPDBNM.LINKED_TRACKS.RELINKED_ID} != 
+                                                linked_tracks.{SPDBNM.LINKED_TRACKS.FROM_ID});"""
+
+            discographies_dfs.append(pd.read_sql_query(sql = query,
+                                                       con = self.connection,
+                                                       params = [*params,
+                                                                 *album_groups,
+                                                                 SPDBNM.ARTISTS_ALBUMS.ALBUM_GROUP_APPEARS_ON]))
+
+        if len(discographies_dfs) == 0:
+            return pd.DataFrame(columns = [SPDBNM.ARTISTS_ALBUMS.ARTIST_ID,
+                                           SPDBNM.ARTISTS_ALBUMS.ALBUM_ID,
+                                           SPDBNM.ALBUMS_TRACKS.TRACK_ID])
+
+        return pd.concat(discographies_dfs, ignore_index = True)
+
     # endregion Selection Logic
@@ -87,6 +87,9 @@ class ARTISTS_ALBUMS:
     CREATED_AT = 'created_at'
     UPDATED_AT = 'updated_at'
 
+    # Value of ``album_group`` for albums of other artists that the artist appears on:
+    ALBUM_GROUP_APPEARS_ON = 'appears_on'
+
 
 @dataclass(frozen = True)
 class ALBUMS_TRACKS:
@@ -98,6 +101,16 @@ class ALBUMS_TRACKS:
     UPDATED_AT = 'updated_at'
 
 
+@dataclass(frozen = True)
+class TRACKS_ARTISTS:
+    TBL_NAME = 'tracks_artists'
+
+    TRACK_ID = 'track_id'
+    ARTIST_ID = 'artist_id'
+    CREATED_AT = 'created_at'
+    UPDATED_AT = 'updated_at'
+
+
 @dataclass(frozen = True)
 class GENRES:
     TBL_NAME = 'genres'
@@ -160,6 +173,64 @@ class TRACKS_LISTEN_HISTORY:
     UPDATED_AT = 'updated_at'
 
 
+@dataclass(frozen = True)
+class IMPORTED_FILES:
+    TBL_NAME = 'imported_files'
+
+    FILE_PATH = 'file_path'
+    FILE_SIZE = 'file_size'
+    FILE_MTIME = 'file_mtime'
+    CONTENT_HASH = 'content_hash'
+    CREATED_AT = 'created_at'
+    UPDATED_AT = 'updated_at'
+
+
+@dataclass(frozen = True)
+class ARTISTS_DISCOGRAPHY_FETCHES:
+    TBL_NAME = 'artists_discography_fetches'
+
+    ARTIST_ID = 'artist_id'
+    ALBUM_GROUPS = 'album_groups'
+    FETCHED_AT = 'fetched_at'
+    CREATED_AT = 'created_at'
+    UPDATED_AT = 'updated_at'
+
+    # Separator between the names of the album groups:
+    ALBUM_GROUPS_SEPARATOR = ','
+
+
+@dataclass(frozen = True)
+class IMPORT_CHECKPOINTS:
+    TBL_NAME = 'import_checkpoints'
+
+    STAGE = 'stage'
+    ENTITY_ID = 'entity_id'
+    IS_DONE = 'is_done'
+    CREATED_AT = 'created_at'
+    UPDATED_AT = 'updated_at'
+
+    # Stages of the enrichment pipeline, in the order they are performed:
+    STAGE_ORIGINAL_TRACKS = 'original_tracks'
+    STAGE_RELINKED_TRACKS = 'relinked_tracks'
+    STAGE_AUDIO_FEATURES = 'audio_features'
+    STAGE_ALBUMS = 'albums'
+    STAGE_ARTISTS = 'artists'
+
+
+@dataclass(frozen = True)
+class DB_METADATA:
+    TBL_NAME = 'db_metadata'
+
+    KEY = 'key'
+    VALUE = 'value'
+    CREATED_AT = 'created_at'
+    UPDATED_AT = 'updated_at'
+
+    # Keys:
+    # Counter that is incremented whenever the listen history data changes:
+    DATA_VERSION = 'data_version'
+
+
 @dataclass(frozen = True)
 class V_KNOWN_LISTEN_HISTORY:
     VIEW_NAME = 'v_known_listen_history'
@@ -186,3 +257,39 @@ class V_KNOWN_LISTEN_HISTORY:
     INCOGNITO_MODE = TRACKS_LISTEN_HISTORY.INCOGNITO_MODE
     CREATED_AT = TRACKS_LISTEN_HISTORY.CREATED_AT
     UPDATED_AT = TRACKS_LISTEN_HISTORY.UPDATED_AT
+
+
+@dataclass(frozen = True)
+class KNOWN_LISTEN_HISTORY:
+    TBL_NAME = 'known_listen_history'
+
+    USERNAME = V_KNOWN_LISTEN_HISTORY.USERNAME
+    TIMESTAMP = V_KNOWN_LISTEN_HISTORY.TIMESTAMP
+    TRACK_LISTENED_ID = V_KNOWN_LISTEN_HISTORY.TRACK_LISTENED_ID
+    TRACK_KNOWN_ID = V_KNOWN_LISTEN_HISTORY.TRACK_KNOWN_ID
+    TRACK_NAME = V_KNOWN_LISTEN_HISTORY.TRACK_NAME
+    ALBUM_KNOWN_ID = V_KNOWN_LISTEN_HISTORY.ALBUM_KNOWN_ID
+    ALBUM_NAME = V_KNOWN_LISTEN_HISTORY.ALBUM_NAME
+    ALBUM_ARTIST_ID = V_KNOWN_LISTEN_HISTORY.ALBUM_ARTIST_ID
+    ALBUM_ARTIST_NAME = V_KNOWN_LISTEN_HISTORY.ALBUM_ARTIST_NAME
+    MS_PLAYED = V_KNOWN_LISTEN_HISTORY.MS_PLAYED
+    TRACK_DURATION_MS = V_KNOWN_LISTEN_HISTORY.TRACK_DURATION_MS
+    REASON_START = V_KNOWN_LISTEN_HISTORY.REASON_START
+    REASON_END = V_KNOWN_LISTEN_HISTORY.REASON_END
+    SKIPPED = V_KNOWN_LISTEN_HISTORY.SKIPPED
+    PLATFORM = V_KNOWN_LISTEN_HISTORY.PLATFORM
+    CONN_COUNTRY = V_KNOWN_LISTEN_HISTORY.CONN_COUNTRY
+    URI = V_KNOWN_LISTEN_HISTORY.URI
+    SHUFFLE = V_KNOWN_LISTEN_HISTORY.SHUFFLE
+    OFFLINE = V_KNOWN_LISTEN_HISTORY.OFFLINE
+    INCOGNITO_MODE = V_KNOWN_LISTEN_HISTORY.INCOGNITO_MODE
+    CREATED_AT = V_KNOWN_LISTEN_HISTORY.CREATED_AT
+    UPDATED_AT = V_KNOWN_LISTEN_HISTORY.UPDATED_AT
+
+
+@dataclass(frozen = True)
+class TEMP_LOOKUP_KEYS:
+    # Temporary table (per connection) holding a large set of keys to look up by joining (see ``DB``):
+    TBL_NAME = 'temp_lookup_keys'
+
+    KEY = 'lookup_key'
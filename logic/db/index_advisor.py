@@ -0,0 +1,259 @@
+from __future__ import annotations
+import sqlite3
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterable
+from logic.db import db_names as SPDBNM
+from logic.frontend import log
+
+if TYPE_CHECKING:
+    from logic.db.db import DB
+
+# Amount of IDs that are sampled from the DB for running the app's keyed lookups:
+SAMPLE_IDS_AMOUNT = 20
+
+# Statements that are explained (statements like BEGIN, COMMIT, PRAGMA and CREATE are not):
+EXPLAINED_STATEMENTS_PREFIXES = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE')
+
+# The access paths that the schema's indexes were planned for: a representative statement (and its parameters)
+# of each access path, by the name of the index that must serve it:
+INDEXED_ACCESS_PATHS = {
+    'idx_tracks_listen_history_time_stamp'        : (
+        f"""SELECT * FROM {SPDBNM.TRACKS_LISTEN_HISTORY.TBL_NAME}
+            WHERE {SPDBNM.TRACKS_LISTEN_HISTORY.TIMESTAMP} >= ?
+              AND {SPDBNM.TRACKS_LISTEN_HISTORY.TIMESTAMP} < ?;""",
+        ('2020-01-01T00:00:00Z', '2021-01-01T00:00:00Z')),
+    'idx_tracks_listen_history_track_id'          : (
+        f"""SELECT * FROM {SPDBNM.TRACKS_LISTEN_HISTORY.TBL_NAME}
+            WHERE {SPDBNM.TRACKS_LISTEN_HISTORY.TRACK_ID} = ?;""",
+        ('',)),
+    'idx_linked_tracks_track_known_id'            : (
+        f"""SELECT * FROM {SPDBNM.LINKED_TRACKS.TBL_NAME}
+            WHERE {SPDBNM.LINKED_TRACKS.RELINKED_ID} = ?;""",
+        ('',)),
+    'idx_albums_tracks_track_id_album_id'         : (
+        f"SELECT * FROM {SPDBNM.V_KNOWN_LISTEN_HISTORY.VIEW_NAME};",
+        ()),
+    'idx_artists_albums_album_id_artist_id'       : (
+        f"SELECT * FROM {SPDBNM.V_KNOWN_LISTEN_HISTORY.VIEW_NAME};",
+        ()),
+    'idx_known_listen_history_time_stamp'         : (
+        f"""SELECT * FROM {SPDBNM.KNOWN_LISTEN_HISTORY.TBL_NAME}
+            WHERE {SPDBNM.KNOWN_LISTEN_HISTORY.TIMESTAMP} >= ?
+              AND {SPDBNM.KNOWN_LISTEN_HISTORY.TIMESTAMP} < ?;""",
+        ('2020-01-01T00:00:00Z', '2021-01-01T00:00:00Z')),
+    'idx_known_listen_history_username_time_stamp': (
+        f"""SELECT * FROM {SPDBNM.KNOWN_LISTEN_HISTORY.TBL_NAME}
+            WHERE {SPDBNM.KNOWN_LISTEN_HISTORY.USERNAME} = ?
+              AND {SPDBNM.KNOWN_LISTEN_HISTORY.TIMESTAMP} >= ?;""",
+        ('', '2020-01-01T00:00:00Z')),
+    'idx_known_listen_history_track_listened_id'  : (
+        f"""DELETE FROM {SPDBNM.KNOWN_LISTEN_HISTORY.TBL_NAME}
+            WHERE {SPDBNM.KNOWN_LISTEN_HISTORY.TRACK_LISTENED_ID} IN (?);""",
+        ('',)),
+    'idx_import_checkpoints_pending'              : (
+        f"""SELECT {SPDBNM.IMPORT_CHECKPOINTS.ENTITY_ID} FROM {SPDBNM.IMPORT_CHECKPOINTS.TBL_NAME}
+            WHERE {SPDBNM.IMPORT_CHECKPOINTS.STAGE} = ?
+              AND {SPDBNM.IMPORT_CHECKPOINTS.IS_DONE} = FALSE;""",
+        ('',))}
+
+
+def explain_query_plan(connection: sqlite3.Connection, statement: str, params: Iterable = ()) -> list[str]:
+    """
+    Returns SQLite's query plan of a statement, without running it.
+
+    Parameters:
+        connection: Connection to the DB.
+
+        statement: The SQL statement to explain.
+
+        params: Parameters of the statement.
+
+    Returns:
+        List of the details of the plan's steps (e.g. ``SEARCH tracks USING INDEX ... (track_id=?)``).
+    """
+    return [detail for _, _, _, detail in connection.execute(f"EXPLAIN QUERY PLAN {statement}", tuple(params))]
+
+
+def is_full_scan(plan_detail: str) -> bool:
+    """
+    Checks whether a step of a query plan reads a whole table, rather than searching an index: either a ``SCAN`` of
+    the table itself, or an automatic index that SQLite builds on every run of the statement, for lack of a
+    fitting index.
+
+    Parameters:
+        plan_detail: Detail of a step of a query plan.
+
+    Returns:
+        True if the step is a full scan of a table, otherwise False.
+    """
+    if 'AUTOMATIC' in plan_detail:
+        return True
+
+    return plan_detail.startswith('SCAN ') and ' USING ' not in plan_detail \
+        and not plan_detail.startswith('SCAN CONSTANT ROW') \
+        and not plan_detail.startswith(f"SCAN {SPDBNM.TEMP_LOOKUP_KEYS.TBL_NAME}")
+
+
+@contextmanager
+def record_statements(connection: sqlite3.Connection):
+    """
+    Context manager that records the statements that are run on the given connection inside it (with their
+    parameters already bound).
+
+    Parameters:
+        connection: Connection to the DB.
+
+    Returns:
+        The list into which the statements are recorded.
+    """
+    statements = []
+    connection.set_trace_callback(statements.append)
+
+    try:
+        yield statements
+
+    finally:
+        connection.set_trace_callback(None)
+
+
+def check_indexed_access_paths(db: DB) -> dict[str, bool]:
+    """
+    Checks that each of the planned access paths (see :attr:`INDEXED_ACCESS_PATHS`) is served by its index.
+
+    Parameters:
+        db: The DB to check.
+
+    Returns:
+        Dictionary mapping the name of each planned index to whether the query plan of its access path uses it.
+    """
+    return {index_name: any(index_name in detail for detail in explain_query_plan(db.connection, statement, params))
+            for index_name, (statement, params) in INDEXED_ACCESS_PATHS.items()}
+
+
+def _get_sample_ids(db: DB, table_name: str, column_name: str) -> list[str]:
+    """Returns some IDs from a DB-table's column (or a single placeholder ID, if the table is empty)."""
+    sample_ids = [sample_id for (sample_id,) in db.cursor.execute(f"SELECT {column_name} FROM {table_name} LIMIT ?;",
+                                                                 (SAMPLE_IDS_AMOUNT,))]
+
+    return sample_ids if len(sample_ids) > 0 else ['']
+
+
+def _run_app_queries(db: DB,
+                     enrichment_stages_existing_keys: dict[str, tuple[str, str, str | None]],
+                     include_writes: bool) -> None:
+    """Runs the app's selection methods (and optionally its derived table's refreshes) on sample data from the DB."""
+    tracks_ids = _get_sample_ids(db, SPDBNM.TRACKS.TBL_NAME, SPDBNM.TRACKS.ID)
+    artists_ids = _get_sample_ids(db, SPDBNM.ARTISTS.TBL_NAME, SPDBNM.ARTISTS.ID)
+    albums_ids = _get_sample_ids(db, SPDBNM.ALBUMS.TBL_NAME, SPDBNM.ALBUMS.ID)
+
+    db.get_listen_history_df()
+    db.get_last_listen_timestamps()
+    db.get_imported_files()
+    db.get_data_version()
+    db.get_tracks_audio_features(tracks_ids)
+    db.get_fresh_discographies_album_groups(artists_ids, max_age_days = 0)
+    db.get_artists_discographies_tracks(artists_ids, [SPDBNM.ARTISTS_ALBUMS.ALBUM_GROUP_APPEARS_ON])
+    db.count_pending_checkpoints()
+    db.get_tracks_links()
+    db.get_tracks_links(tracks_ids, include_connected = True)
+    db.get_linked_tracks_albums()
+    db.get_linked_tracks_albums(tracks_ids)
+    db.get_albums_tracks(albums_ids)
+    db.get_albums_artists_groups(albums_ids)
+    db.get_albums_listened_tracks_ids(albums_ids)
+
+    for stage, (table_name, column_name, condition) in enrichment_stages_existing_keys.items():
+        db.get_pending_checkpoints(stage, limit = SAMPLE_IDS_AMOUNT)
+        db.count_pending_checkpoints(stage)
+        db.get_existing_ids(table_name, column_name, _get_sample_ids(db, table_name, column_name), condition)
+
+    if include_writes:
+        # The derived table is refreshed inside a transaction which is rolled back, so the DB is left unchanged:
+        db.commit()
+
+        try:
+            db.refresh_known_listen_history(from_timestamps = db.get_last_listen_timestamps(), tracks_ids = tracks_ids)
+            db.refresh_known_listen_history()
+
+        finally:
+            db.rollback()
+
+
+def find_full_scans(db: DB,
+                    enrichment_stages_existing_keys: dict[str, tuple[str, str, str | None]],
+                    include_writes: bool = False) -> dict[str, list[str]]:
+    """
+    Runs the app's actual queries on the given DB (its selection methods, on IDs sampled from the DB itself),
+    and finds the ones that read whole tables, according to their query plans.
+
+    The outermost scan of a statement without a filter (e.g. reading the whole known listen history) reads the whole
+    table by design, so it's not reported.
+
+    Parameters:
+        db: The DB to run the queries on.
+
+        enrichment_stages_existing_keys: The key columns that the enrichment pipeline looks its entities up in (see
+            ``Logic.ENRICHMENT_STAGES_EXISTING_KEYS``).
+
+        include_writes: Whether to also check the statements that refresh the derived known listen history table
+            (see :meth:`DB.refresh_known_listen_history`). They're run inside a transaction which is rolled back,
+            which might take a while on a big DB.
+
+    Returns:
+        Dictionary mapping each statement that reads whole tables to the details of its full scans.
+    """
+    with record_statements(db.connection) as statements:
+        _run_app_queries(db, enrichment_stages_existing_keys, include_writes)
+
+    full_scans = {}
+
+    for statement in dict.fromkeys(' '.join(statement.split()) for statement in statements):
+        if not statement.upper().startswith(EXPLAINED_STATEMENTS_PREFIXES):
+            continue
+
+        is_filtered = ' WHERE ' in statement.upper()
+        scans = [detail
+                 for step, detail in enumerate(explain_query_plan(db.connection, statement))
+                 if is_full_scan(detail) and (is_filtered or step > 0)]
+
+        if len(scans) > 0:
+            full_scans[statement] = scans
+
+    return full_scans
+
+
+def advise(db: DB,
+           enrichment_stages_existing_keys: dict[str, tuple[str, str, str | None]],
+           include_writes: bool = False) -> bool:
+    """
+    Reports (to the log) the planned access paths that aren't served by their indexes, and the app's actual queries
+    that read whole tables.
+
+    Parameters:
+        db: The DB to check.
+
+        enrichment_stages_existing_keys: The key columns that the enrichment pipeline looks its entities up in (see
+            ``Logic.ENRICHMENT_STAGES_EXISTING_KEYS``).
+
+        include_writes: Whether to also check the statements that refresh the derived table.
+
+    Returns:
+        True if all the planned access paths use their indexes and no full scans were found, otherwise False.
+    """
+    unindexed_access_paths = [index_name
+                              for index_name, is_used in check_indexed_access_paths(db).items()
+                              if not is_used]
+
+    for index_name in unindexed_access_paths:
+        log.write(log.INDEX_NOT_USED.format(index_name), level = log.WARNING)
+
+    full_scans = find_full_scans(db, enrichment_stages_existing_keys, include_writes)
+
+    for statement, scans in full_scans.items():
+        log.write(log.FULL_TABLE_SCAN.format('; '.join(scans), statement), level = log.WARNING)
+
+    log.write(log.INDEX_ADVISOR_SUMMARY.format(len(INDEXED_ACCESS_PATHS) - len(unindexed_access_paths),
+                                               len(INDEXED_ACCESS_PATHS),
+                                               len(full_scans)))
+
+    return len(unindexed_access_paths) == 0 and len(full_scans) == 0
@@ -109,6 +109,16 @@ CREATE TABLE IF NOT EXISTS albums_tracks (
 	FOREIGN KEY (track_id) REFERENCES tracks(track_id)
 );
 
+CREATE TABLE IF NOT EXISTS tracks_artists (
+	track_id TEXT NOT NULL,
+	artist_id TEXT NOT NULL,
+	created_at DATETIME DEFAULT (datetime(CURRENT_TIMESTAMP, 'localtime')),
+	updated_at DATETIME,
+	PRIMARY KEY (track_id, artist_id),
+	FOREIGN KEY (track_id) REFERENCES tracks(track_id),
+	FOREIGN KEY (artist_id) REFERENCES artists(artist_id)
+);
+
 CREATE TABLE IF NOT EXISTS artists_genres (
 	artist_id TEXT NOT NULL,
 	genre_name TEXT NOT NULL,
@@ -157,6 +167,74 @@ CREATE TABLE IF NOT EXISTS tracks_listen_history (
 	FOREIGN KEY (track_id) REFERENCES linked_tracks(linked_from_id)
 );
 
+CREATE TABLE IF NOT EXISTS imported_files (
+	file_path TEXT PRIMARY KEY NOT NULL,
+	file_size INTEGER,
+	file_mtime REAL,
+	content_hash TEXT,
+	created_at DATETIME DEFAULT (datetime(CURRENT_TIMESTAMP, 'localtime')),
+	updated_at DATETIME
+);
+
+/* When the discography (albums and their tracks) of each artist was last fetched 
+ * from the API, and which album groups it included.
+ */
+CREATE TABLE IF NOT EXISTS artists_discography_fetches (
+	artist_id TEXT PRIMARY KEY NOT NULL,
+	album_groups TEXT,
+	fetched_at DATETIME DEFAULT (datetime(CURRENT_TIMESTAMP, 'localtime')),
+	created_at DATETIME DEFAULT (datetime(CURRENT_TIMESTAMP, 'localtime')),
+	updated_at DATETIME,
+	FOREIGN KEY (artist_id) REFERENCES artists(artist_id)
+);
+
+CREATE TABLE IF NOT EXISTS import_checkpoints (
+	stage TEXT NOT NULL,
+	entity_id TEXT NOT NULL,
+	is_done BOOLEAN NOT NULL DEFAULT FALSE,
+	created_at DATETIME DEFAULT (datetime(CURRENT_TIMESTAMP, 'localtime')),
+	updated_at DATETIME,
+	PRIMARY KEY (stage, entity_id)
+);
+
+CREATE TABLE IF NOT EXISTS db_metadata (
+	key TEXT PRIMARY KEY NOT NULL,
+	value TEXT,
+	created_at DATETIME DEFAULT (datetime(CURRENT_TIMESTAMP, 'localtime')),
+	updated_at DATETIME
+);
+
+/* Materialized (denormalized) copy of view v_known_listen_history, 
+ * refreshed after new data is inserted into the DB: either rebuilt as a whole, 
+ * or only for the newly imported listens (and the listens of relinked tracks).
+ * Reading it doesn't require any join, and its index on (username, time_stamp) 
+ * serves the view's sort order.
+ */
+CREATE TABLE IF NOT EXISTS known_listen_history (
+	username TEXT NOT NULL,
+	time_stamp TEXT NOT NULL,
+	track_listened_id TEXT NOT NULL,
+	track_known_id TEXT,
+	track_name TEXT,
+	album_known_id TEXT,
+	album_name TEXT,
+	album_artist_id TEXT,
+	album_artist_name TEXT,
+	ms_played INTEGER,
+	track_duration_ms INTEGER,
+	reason_start TEXT,
+	reason_end TEXT,
+	skipped TEXT,
+	platform TEXT,
+	conn_country TEXT,
+	uri TEXT,
+	shuffle BOOLEAN,
+	offline BOOLEAN,
+	incognito_mode BOOLEAN,
+	created_at DATETIME,
+	updated_at DATETIME
+);
+
 
 -- Triggers definition --
 
@@ -218,6 +296,15 @@ CREATE TRIGGER IF NOT EXISTS trg_update_artists_albums_updated_at
 			  AND album_id  = NEW.album_id;
 	END;
 
+CREATE TRIGGER IF NOT EXISTS trg_update_tracks_artists_updated_at
+	AFTER UPDATE ON tracks_artists
+	BEGIN 
+		UPDATE tracks_artists
+			SET updated_at = (datetime(CURRENT_TIMESTAMP, 'localtime'))
+			WHERE track_id = NEW.track_id
+			  AND artist_id = NEW.artist_id;
+	END;
+
 CREATE TRIGGER IF NOT EXISTS trg_update_albums_tracks_updated_at
 	AFTER UPDATE ON albums_tracks
 	BEGIN 
@@ -235,6 +322,39 @@ CREATE TRIGGER IF NOT EXISTS trg_update_tracks_listen_history_updated_at
 			WHERE track_id = NEW.track_id;
 	END;
 
+CREATE TRIGGER IF NOT EXISTS trg_update_imported_files_updated_at
+	AFTER UPDATE ON imported_files
+	BEGIN 
+		UPDATE imported_files
+			SET updated_at = (datetime(CURRENT_TIMESTAMP, 'localtime'))
+			WHERE file_path = NEW.file_path;
+	END;
+
+CREATE TRIGGER IF NOT EXISTS trg_update_artists_discography_fetches_updated_at
+	AFTER UPDATE ON artists_discography_fetches
+	BEGIN 
+		UPDATE artists_discography_fetches
+			SET updated_at = (datetime(CURRENT_TIMESTAMP, 'localtime'))
+			WHERE artist_id = NEW.artist_id;
+	END;
+
+CREATE TRIGGER IF NOT EXISTS trg_update_import_checkpoints_updated_at
+	AFTER UPDATE ON import_checkpoints
+	BEGIN 
+		UPDATE import_checkpoints
+			SET updated_at = (datetime(CURRENT_TIMESTAMP, 'localtime'))
+			WHERE stage = NEW.stage
+			  AND entity_id = NEW.entity_id;
+	END;
+
+CREATE TRIGGER IF NOT EXISTS trg_update_db_metadata_updated_at
+	AFTER UPDATE ON db_metadata
+	BEGIN 
+		UPDATE db_metadata
+			SET updated_at = (datetime(CURRENT_TIMESTAMP, 'localtime'))
+			WHERE key = NEW.key;
+	END;
+
 
 -- Indexes definition --
 
@@ -255,6 +375,54 @@ CREATE INDEX IF NOT EXISTS idx_tracks_listen_history_conn_country
 
 CREATE INDEX IF NOT EXISTS idx_tracks_listen_history_reason
 	ON tracks_listen_history (reason_start, reason_end);
+
+/* The indexes below serve the app's access paths. Each one is checked with EXPLAIN QUERY PLAN by the
+ * index advisor (see logic/db/index_advisor.py, and `python main.py advise-indexes`).
+ */
+
+-- Time-range scans of the listen history across all users (its primary key starts with the username):
+CREATE INDEX IF NOT EXISTS idx_tracks_listen_history_time_stamp
+	ON tracks_listen_history (time_stamp);
+
+-- Listens of a listened track, and the foreign key to linked_tracks:
+CREATE INDEX IF NOT EXISTS idx_tracks_listen_history_track_id
+	ON tracks_listen_history (track_id);
+
+-- The listened tracks that were relinked to a known track, and the foreign key to tracks:
+CREATE INDEX IF NOT EXISTS idx_linked_tracks_track_known_id
+	ON linked_tracks (track_known_id);
+
+-- Joins of v_known_listen_history (and of the linkage) from a track to its albums, covering the album's ID:
+DROP INDEX IF EXISTS idx_albums_tracks_track_id;
+
+CREATE INDEX IF NOT EXISTS idx_albums_tracks_track_id_album_id
+	ON albums_tracks (track_id, album_id);
+
+-- Join of v_known_listen_history from an album to its artists, covering the album group and the artist's ID:
+DROP INDEX IF EXISTS idx_artists_albums_album_id;
+
+CREATE INDEX IF NOT EXISTS idx_artists_albums_album_id_artist_id
+	ON artists_albums (album_id, album_group, artist_id);
+
+CREATE INDEX IF NOT EXISTS idx_known_listen_history_username_time_stamp
+	ON known_listen_history (username, time_stamp);
+
+-- Time-range scans of the known listen history across all users:
+CREATE INDEX IF NOT EXISTS idx_known_listen_history_time_stamp
+	ON known_listen_history (time_stamp);
+
+-- Partial refreshes of the listens of relinked tracks:
+CREATE INDEX IF NOT EXISTS idx_known_listen_history_track_listened_id
+	ON known_listen_history (track_listened_id);
+
+-- No query filters or joins on the known track's ID or on the album artist's ID (they're only sorted by, after the 
+-- user and the time), so their indexes would only slow down the refreshes:
+DROP INDEX IF EXISTS idx_known_listen_history_track_known_id;
+DROP INDEX IF EXISTS idx_known_listen_history_album_artist_id;
+
+-- Serves looking a stage's pending entities up (and counting them), when an enrichment run is resumed:
+CREATE INDEX IF NOT EXISTS idx_import_checkpoints_pending
+	ON import_checkpoints (stage, is_done);
 	
 
 -- Views definition --
@@ -346,6 +514,13 @@ CREATE VIEW IF NOT EXISTS v_linked_albums
 	ORDER BY name ASC,
 			 album_known_id ASC;
 
+/* Albums that an artist only appears on (from the artist's discography) are not
+ * considered as that artist's albums in the listen history.
+ * The view is always recreated, since its definition has changed since it was first 
+ * created (views contain no data).
+ */
+DROP VIEW IF EXISTS v_known_listen_history;
+
 CREATE VIEW IF NOT EXISTS v_known_listen_history 
 	AS SELECT tracks_listen_history.username,
 			  tracks_listen_history.time_stamp,			  
@@ -375,6 +550,7 @@ CREATE VIEW IF NOT EXISTS v_known_listen_history
 	INNER JOIN albums_tracks ON albums_tracks.track_id = linked_tracks.track_known_id 
 	INNER JOIN albums ON albums.album_id = albums_tracks.album_id 
 	INNER JOIN artists_albums ON artists_albums.album_id = albums_tracks.album_id
+							 AND artists_albums.album_group IS NOT 'appears_on'
 	INNER JOIN artists ON artists.artist_id = artists_albums.artist_id
 	ORDER BY username ASC,
              time_stamp ASC,
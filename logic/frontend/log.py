@@ -1,5 +1,22 @@
 import datetime as dt
-import traceback
+import json
+import sys
+import config
+
+# Log levels (messages below the configured ``config.LOG_LEVEL`` are dropped before any formatting is done):
+DEBUG = 'DEBUG'
+INFO = 'INFO'
+WARNING = 'WARNING'
+ERROR = 'ERROR'
+
+LEVELS = {DEBUG  : 10,
+          INFO   : 20,
+          WARNING: 30,
+          ERROR  : 40}
+
+# Log formats:
+TEXT_FORMAT = 'text'
+JSON_FORMAT = 'json'
 
 # File operations
 READING_FILE = "Now reading file: {0}..."
@@ -23,24 +40,53 @@ FETCHING_ARTISTS_ALBUMS_ATTRS = "Fetching all albums for {0} artists (might take
 ARTISTS_ALBUMS_ATTRS_FETCHED = "All albums were successfully fetched for {0} artists."
 FETCHING_ARTISTS_TRACKS_ATTRS = "Fetching all tracks for {0} artists (might take a while)..."
 ARTISTS_TRACKS_ATTRS_FETCHED = "All tracks were successfully fetched for {0} artists."
+STALE_DISCOGRAPHIES = "{0} of {1} artists' discographies are missing or out of date in the local DB."
 FETCHING_RECENTLY_PLAYED = "Fetching the current user's Recently Played Tracks..."
 RECENTLY_PLAYED_FETCHED = "The current user's Recently Played Tracks were successfully fetched."
 READING_LISTEN_HISTORY = "Reading the listen history from the DB..."
 LISTEN_HISTORY_READ = "Listen history was successfully read."
+REFRESHING_KNOWN_LISTEN_HISTORY = "Refreshing the known listen history table in the DB..."
+KNOWN_LISTEN_HISTORY_REFRESHED = "The known listen history table was refreshed with {0} records."
+LISTEN_HISTORY_MEMORY_USAGE = "The listen history ({0} records) takes {1:.2f} MB of memory."
 READING_TRACKS_AUDIO_FEATURES = "Reading tracks audio features from the DB..."
 TRACKS_AUDIO_FEATURES_READ = "Tracks audio features were successfully read."
 GETTING_ORIGINAL_TRACKS = "Now getting the original Tracks."
 GETTING_RELINKED_TRACKS = "Now getting the Relinked Tracks."
 
+# Incremental import:
+NO_NEW_LISTEN_HISTORY_FILES = "No new listen history files were found, nothing to import."
+IMPORTING_NEW_LISTEN_HISTORY_FILES = "Importing {0} new listen history files..."
+NO_NEW_LISTENS = "The new listen history files contain no new listens, nothing to import."
+IMPORTING_NEW_LISTENS = "Importing {0} new listens..."
+
+# Enrichment pipeline:
+ENRICHMENT_STAGE_BATCH = "Enrichment stage ``{0}``: processing a batch of {1} out of {2} pending items..."
+RESUMING_ENRICHMENT = "Resuming a previously interrupted enrichment, with {0} pending items..."
+FOUND_IN_DB = "{0} of {1} items of enrichment stage ``{2}`` already exist in the local DB, skipping them."
+ENRICHMENT_INTERRUPTED = "The enrichment was interrupted, with {0} pending items. Run it again to resume."
+
+# Listen history snapshot:
+READING_SNAPSHOT = "Reading the listen history snapshot: {0}..."
+SNAPSHOT_READ = "Listen history snapshot was successfully read, with {0} records."
+SNAPSHOT_IS_STALE = "The listen history snapshot is out of date, it will be rewritten: {0}"
+SNAPSHOT_UNAVAILABLE = "Package pyarrow is not installed, so the listen history snapshot is not used."
+
+# API Cache:
+FOUND_IN_API_CACHE = "{0} of {1} {2} were found in the local API cache."
+API_CACHE_STATS = "API cache for {0}: {1} hits, {2} misses."
+
 # Inserting:
 INSERTING_RECORD = "Inserting a single record into DB-table {0}..."
 RECORD_INSERTED = "The record was successfully inserted."
 INSERTING_RECORDS = "Inserting {1} records into DB-table {0}..."
 RECORDS_INSERTED = "All records were successfully inserted."
+BULK_INSERTING_RECORDS = "Bulk-inserting records into DB-table {0}..."
+RECORDS_BULK_INSERTED = "{0} records were successfully bulk-inserted ({1:,.0f} records per second)."
 ERROR_INVALID_RECORDS_TYPE = "Error: The records to insert are of an invalid type: {0}. No records were inserted."
 
 # API Errors:
 API_SERVICE_UNAVAILABLE = 'Spotify API Service is unavailable. Original error: {0}'
+API_RATE_LIMITED = 'Spotify API rate limit was reached, pausing all requests for {0} seconds...'
 API_SERVICE_UNAUTHORIZED = """You are not authorized for the desired API operation. Maybe your Token has expired, or 
 the requested authorization scope is not sufficient. Original error: {0}"""
 
@@ -51,17 +97,97 @@ DB_SCHEMA_ERROR = 'ERROR in DB Schema script.'
 DB_INTEGRITY_ERROR = 'sqlite3.IntegrityError: {0}'
 DB_OPERATIONAL_ERROR = 'sqlite3.OperationalError: {0}'
 
+# Index advisor:
+INDEX_NOT_USED = "The planned index {0} is not used by the query plan of its access path."
+FULL_TABLE_SCAN = "Full table scan ({0}) in statement: {1}"
+INDEX_ADVISOR_SUMMARY = "{0} of {1} planned access paths use their indexes, {2} statements read whole tables."
 
-def write(message: str) -> None:
-    trace = traceback.extract_stack()
 
-    try:
-        last_call = next(item.name for item in trace if item.line.startswith('log.write('))
-        formatted_msg = "LOG: {0}\t: \tin: {1}\t:\t{2}".format(str(dt.datetime.now()), last_call, message)
+_min_level = LEVELS[config.LOG_LEVEL]
+_format = config.LOG_FORMAT
 
-    except StopIteration:
-        formatted_msg = 'LOG ERROR'
 
-    print(formatted_msg)
+def set_level(level: str) -> None:
+    """
+    Sets the minimal level of the messages that are written to the log.
+
+    Parameters:
+        level: One of ``DEBUG``, ``INFO``, ``WARNING``, ``ERROR``.
+
+    Returns:
+        None.
+
+    Raises:
+        ValueError: if the given level is unknown.
+    """
+    global _min_level
+
+    if level not in LEVELS:
+        raise ValueError(f"Unknown log level: {level}")
+
+    _min_level = LEVELS[level]
+
+
+def set_format(log_format: str) -> None:
+    """
+    Sets the format of the messages that are written to the log.
+
+    Parameters:
+        log_format: ``TEXT_FORMAT`` for human-readable lines, or ``JSON_FORMAT`` for JSON lines.
 
+    Returns:
+        None.
 
+    Raises:
+        ValueError: if the given format is unknown.
+    """
+    global _format
+
+    if log_format not in (TEXT_FORMAT, JSON_FORMAT):
+        raise ValueError(f"Unknown log format: {log_format}")
+
+    _format = log_format
+
+
+def is_enabled(level: str) -> bool:
+    """
+    Checks whether messages of the given level are written to the log, so that callers can skip building
+    expensive messages that would be dropped anyway.
+
+    Parameters:
+        level: Level of the message.
+
+    Returns:
+        True if messages of the given level are written, otherwise False.
+    """
+    return LEVELS[level] >= _min_level
+
+
+def write(message: str, level: str = INFO) -> None:
+    """
+    Writes a message to the log, along with the time and the name of the calling function.
+
+    Parameters:
+        message: The message to write.
+
+        level: Level of the message. Messages below the configured minimal level are dropped.
+
+    Returns:
+        None.
+    """
+    if LEVELS[level] < _min_level:
+        return
+
+    # Only the caller's frame is looked up (rather than extracting the whole call stack):
+    caller = sys._getframe(1).f_code.co_name
+
+    if _format == JSON_FORMAT:
+        formatted_msg = json.dumps({'time'   : dt.datetime.now().isoformat(),
+                                    'level'  : level,
+                                    'caller' : caller,
+                                    'message': message})
+
+    else:
+        formatted_msg = "LOG: {0}\t: \t{1}\t: \tin: {2}\t:\t{3}".format(str(dt.datetime.now()), level, caller, message)
+
+    print(formatted_msg)
@@ -0,0 +1,149 @@
+import datetime as dt
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+import config
+
+# Names of the counters that are recorded throughout the application:
+API_REQUESTS = 'api.requests'
+API_RETRIES = 'api.retries'
+ROWS_INSERTED = 'db.rows_inserted.{0}'
+LISTENS_READ = 'listen_history.listens_read'
+LISTENS_PREPARED = 'listen_history.listens_prepared'
+
+_lock = threading.Lock()
+_timers: dict[str, dict] = {}
+_counters: dict[str, int] = {}
+_run_started_at = dt.datetime.now()
+
+
+def increment(name: str, amount: int = 1) -> None:
+    """
+    Increments the counter with the given name (creating it if needed).
+
+    Parameters:
+        name: Name of the counter.
+
+        amount: Amount to add to the counter.
+
+    Returns:
+        None.
+    """
+    if not config.METRICS_ON:
+        return
+
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def record_duration(name: str, seconds: float) -> None:
+    """
+    Records a single duration of the stage with the given name.
+
+    Parameters:
+        name: Name of the stage.
+
+        seconds: Wall time of the stage, in seconds.
+
+    Returns:
+        None.
+    """
+    with _lock:
+        stage_timer = _timers.setdefault(name, {'calls': 0, 'total_s': 0.0, 'max_s': 0.0})
+        stage_timer['calls'] += 1
+        stage_timer['total_s'] += seconds
+        stage_timer['max_s'] = max(stage_timer['max_s'], seconds)
+
+
+@contextmanager
+def timer(name: str):
+    """
+    Context manager that records the wall time of the code inside it, as a stage with the given name.
+
+    Parameters:
+        name: Name of the stage.
+    """
+    if not config.METRICS_ON:
+        yield
+        return
+
+    start = time.perf_counter()
+
+    try:
+        yield
+
+    finally:
+        record_duration(name, time.perf_counter() - start)
+
+
+def timed(func):
+    """
+    Decorator that records the wall time of each call to the decorated function, as a stage named after the
+    function's qualified name (e.g. ``DB.insert``).
+    """
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not config.METRICS_ON:
+            return func(*args, **kwargs)
+
+        start = time.perf_counter()
+
+        try:
+            return func(*args, **kwargs)
+
+        finally:
+            record_duration(name, time.perf_counter() - start)
+
+    return wrapper
+
+
+def get_report() -> dict:
+    """
+    Returns a snapshot of all the metrics recorded so far in this run.
+
+    Returns:
+        Dictionary with the run's start time, the timers (amount of calls, total and maximal wall time in seconds)
+        and the counters.
+    """
+    with _lock:
+        return {'run_started_at': _run_started_at.isoformat(),
+                'run_duration_s': (dt.datetime.now() - _run_started_at).total_seconds(),
+                'timers'        : {name: dict(stage_timer) for name, stage_timer in sorted(_timers.items())},
+                'counters'      : dict(sorted(_counters.items()))}
+
+
+def write_report(folder_path: str = config.METRICS_REPORT_PATH) -> str | None:
+    """
+    Writes the metrics of this run into a new JSON file in the given folder, so runs can be compared to each other.
+
+    Parameters:
+        folder_path: Folder in which to write the report.
+
+    Returns:
+        Path of the written report, or None if the metrics are turned off.
+    """
+    if not config.METRICS_ON:
+        return None
+
+    os.makedirs(folder_path, exist_ok = True)
+    file_path = os.path.join(folder_path, f"metrics_{_run_started_at.strftime('%Y%m%d_%H%M%S')}.json")
+
+    with open(file_path, 'wt') as report_file:
+        json.dump(get_report(), report_file, indent = 2)
+
+    return file_path
+
+
+def reset() -> None:
+    """Clears all the metrics recorded so far, and starts a new run."""
+    global _run_started_at
+
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+        _run_started_at = dt.datetime.now()
@@ -1,4 +1,7 @@
+import hashlib
+import json
 import pandas as pd
+from collections.abc import Iterator
 from logic.frontend import log
 from datetime import datetime as dt
 
@@ -23,6 +26,106 @@ def write_df_to_file(df: pd.DataFrame, file_name: str) -> None:
     log.write(log.FILE_WRITTEN.format(file_path))
 
 
+def get_file_hash(file_path: str, block_size: int = 1 << 20) -> str:
+    """
+    Calculates the SHA-256 hash of a file's content, reading it block by block.
+
+    Parameters:
+        file_path: Path of the file to hash.
+
+        block_size: Amount of bytes to read from the file at a time.
+
+    Returns:
+        Hexadecimal string of the file's content hash.
+    """
+    file_hash = hashlib.sha256()
+
+    with open(file_path, "rb") as file_to_hash:
+        for block in iter(lambda: file_to_hash.read(block_size), b''):
+            file_hash.update(block)
+
+    return file_hash.hexdigest()
+
+
+def read_json_array_in_chunks(file_path: str,
+                              chunk_size: int,
+                              read_size: int = 1 << 16) -> Iterator[list[dict]]:
+    """
+    Incrementally parses a JSON file whose top-level value is an array of objects (such as Spotify's
+    ``endsong.json`` files), and yields its items in fixed-size chunks.
+
+    Only a single chunk of items, and a small read-buffer of raw text, are kept in memory at any given time,
+    instead of the whole parsed file.
+
+    Parameters:
+        file_path: Path of the JSON file to read.
+
+        chunk_size: Maximal amount of items in each yielded chunk.
+
+        read_size: Amount of characters to read from the file on each read.
+
+    Returns:
+        Iterator of lists, each list containing up to ``chunk_size`` items of the JSON array.
+
+    Raises:
+        json.JSONDecodeError: if the file is not a valid JSON array.
+    """
+    decoder = json.JSONDecoder()
+    chunk = []
+
+    with open(file_path, "rt", encoding = 'utf-8') as json_file:
+        buffer = json_file.read(read_size).lstrip()
+
+        if not buffer.startswith('['):
+            raise json.JSONDecodeError("Expected a JSON array", buffer, 0)
+
+        pos = 1
+        is_eof = False
+
+        while True:
+            # Skipping whitespaces and separators between the array's items:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+
+            if pos >= len(buffer):
+                if is_eof:
+                    raise json.JSONDecodeError("Unterminated JSON array", buffer, pos)
+
+                buffer = json_file.read(read_size)
+                is_eof = buffer == ''
+                pos = 0
+
+                continue
+
+            if buffer[pos] == ']':
+                break
+
+            try:
+                item, end_pos = decoder.raw_decode(buffer, pos)
+
+            except json.JSONDecodeError:
+                # The current item is cut at the end of the buffer, so reading more of the file:
+                more_text = json_file.read(read_size)
+
+                if more_text == '':
+                    raise
+
+                buffer = buffer[pos:] + more_text
+                pos = 0
+
+                continue
+
+            chunk.append(item)
+            pos = end_pos
+
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+
+    if len(chunk) > 0:
+        yield chunk
+
+
 def get_unique_vals_list(values: str | pd.Series | set | list) -> list:
     """
     Keep only the unique values from a given collection.
@@ -54,27 +157,6 @@ def get_unique_vals_list(values: str | pd.Series | set | list) -> list:
     return unique_values
 
 
-def get_unique_dicts(dicts: list[dict]) -> list[dict] | None:
-    """
-    Keep only the unique **dictionaries** in a list of dicts. Each whole dict is taken as a single "value" to
-    compare to others.
-
-    Each dict in the given list **must be flat**, i.e. not an object or a nested dict, because
-    they are not supported here.
-
-    Parameters:
-        dicts (list[dict]): List of flat dictionaries.
-
-    Returns:
-        list[dict] | None: List of only the unique dictionaries, compared by all the values of each dict,
-            or None if any dict contains an object or a nested dict.
-    """
-    # Taken from https://stackoverflow.com/a/19804098/6202667
-    unique_dict_list = list(map(dict, set(tuple(d.items()) for d in dicts)))
-
-    return unique_dict_list
-
-
 def add_to_mapping_of_sets(mapping: dict,
                            key: str,
                            value: str) -> None:
@@ -0,0 +1,186 @@
+import json
+import sqlite3
+import time
+import tekore as tk
+from dataclasses import dataclass
+from logic.frontend import log
+import config
+
+
+@dataclass(frozen = True)
+class CACHE:
+    TBL_NAME = 'api_cache'
+
+    ENTITY_TYPE = 'entity_type'
+    ENTITY_ID = 'entity_id'
+    PAYLOAD = 'payload'
+    FETCHED_AT = 'fetched_at'
+    LAST_ACCESSED_AT = 'last_accessed_at'
+
+    # Entity types:
+    TRACK = 'track'
+    ALBUM = 'album'
+    ARTIST = 'artist'
+    AUDIO_FEATURES = 'audio_features'
+
+
+class APICache:
+    """
+    Persistent, size-bounded cache of Spotify API models, saved in a local SQLite file.
+
+    Each cached model is kept for a limited time (TTL) according to its entity type. When the cache holds more than
+    the allowed amount of models, the least-recently-used ones are evicted.
+    """
+    MODELS_CLASSES = {CACHE.TRACK         : tk.model.FullTrack,
+                      CACHE.ALBUM         : tk.model.FullAlbum,
+                      CACHE.ARTIST        : tk.model.FullArtist,
+                      CACHE.AUDIO_FEATURES: tk.model.AudioFeatures}
+
+    # Maximal amount of IDs to send in a single query, under SQLite's limit of host parameters:
+    MAX_IDS_PER_QUERY = 500
+
+    SECONDS_IN_DAY = 60 * 60 * 24
+
+    def __init__(self,
+                 file_name: str = config.API_CACHE_FILE_NAME,
+                 ttl_days: dict[str, float] = None,
+                 max_entries: int = config.API_CACHE_MAX_ENTRIES):
+        """
+        Initializes the cache, creating its file and table if they don't exist yet.
+
+        Parameters:
+            file_name: Path of the SQLite file to keep the cache in.
+
+            ttl_days: Dictionary mapping each entity type to the amount of days its models are kept before they
+                expire. Default: as defined in ``config.API_CACHE_TTL_DAYS``.
+
+            max_entries: Maximal amount of models to keep in the cache.
+        """
+        self._ttl_days = ttl_days if ttl_days is not None else config.API_CACHE_TTL_DAYS
+        self._max_entries = max_entries
+        self._hits = {entity_type: 0 for entity_type in APICache.MODELS_CLASSES}
+        self._misses = {entity_type: 0 for entity_type in APICache.MODELS_CLASSES}
+
+        self.connection = sqlite3.connect(file_name)
+        self.connection.executescript(f"""
+            CREATE TABLE IF NOT EXISTS {CACHE.TBL_NAME} (
+                {CACHE.ENTITY_TYPE} TEXT NOT NULL,
+                {CACHE.ENTITY_ID} TEXT NOT NULL,
+                {CACHE.PAYLOAD} TEXT NOT NULL,
+                {CACHE.FETCHED_AT} REAL NOT NULL,
+                {CACHE.LAST_ACCESSED_AT} REAL NOT NULL,
+                PRIMARY KEY ({CACHE.ENTITY_TYPE}, {CACHE.ENTITY_ID})
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_{CACHE.TBL_NAME}_{CACHE.LAST_ACCESSED_AT}
+                ON {CACHE.TBL_NAME} ({CACHE.LAST_ACCESSED_AT});
+            """)
+
+    def close(self) -> None:
+        """Closes the connection to the cache file."""
+        self.connection.close()
+
+    @property
+    def hits(self) -> dict[str, int]:
+        """
+        Returns the amount of models that were found in the cache, per entity type.
+
+        Returns:
+            Dictionary mapping each entity type to its amount of cache hits.
+        """
+        return self._hits.copy()
+
+    @property
+    def misses(self) -> dict[str, int]:
+        """
+        Returns the amount of models that were missing from the cache (or expired), per entity type.
+
+        Returns:
+            Dictionary mapping each entity type to its amount of cache misses.
+        """
+        return self._misses.copy()
+
+    def log_stats(self) -> None:
+        """Writes the cache's hits and misses, per entity type, to the log."""
+        for entity_type in APICache.MODELS_CLASSES:
+            log.write(log.API_CACHE_STATS.format(entity_type, self._hits[entity_type], self._misses[entity_type]))
+
+    def get_many(self, entity_type: str, entities_ids: list[str]) -> dict:
+        """
+        Returns the cached, non-expired models of the given entity type for the given IDs.
+
+        Parameters:
+            entity_type: Type of the desired models (one of the entity types in :class:`CACHE`).
+
+            entities_ids: IDs of the desired models.
+
+        Returns:
+            Dictionary mapping each ID that was found in the cache to its model.
+            IDs that are missing or expired are not in the dictionary.
+        """
+        model_class = APICache.MODELS_CLASSES[entity_type]
+        now = time.time()
+        min_fetched_at = now - self._ttl_days[entity_type] * APICache.SECONDS_IN_DAY
+        cached_models = {}
+
+        for i in range(0, len(entities_ids), APICache.MAX_IDS_PER_QUERY):
+            ids_chunk = entities_ids[i:i + APICache.MAX_IDS_PER_QUERY]
+
+            query = f"""SELECT {CACHE.ENTITY_ID}, {CACHE.PAYLOAD}
+                        FROM {CACHE.TBL_NAME}
+                        WHERE {CACHE.ENTITY_TYPE} = ?
+                          AND {CACHE.FETCHED_AT} >= ?
+                          AND {CACHE.ENTITY_ID} IN ({', '.join('?' * len(ids_chunk))});"""
+
+            for entity_id, payload in self.connection.execute(query, [entity_type, min_fetched_at, *ids_chunk]):
+                cached_models[entity_id] = model_class(**json.loads(payload))
+
+        self.connection.executemany(f"""UPDATE {CACHE.TBL_NAME}
+                                        SET {CACHE.LAST_ACCESSED_AT} = ?
+                                        WHERE {CACHE.ENTITY_TYPE} = ?
+                                          AND {CACHE.ENTITY_ID} = ?;""",
+                                    [(now, entity_type, entity_id) for entity_id in cached_models])
+        self.connection.commit()
+
+        self._hits[entity_type] += len(cached_models)
+        self._misses[entity_type] += len(entities_ids) - len(cached_models)
+
+        return cached_models
+
+    def set_many(self, entity_type: str, models_by_id: dict) -> None:
+        """
+        Saves the given models of the given entity type in the cache, and evicts the least-recently-used models
+        if the cache exceeds its maximal size.
+
+        Parameters:
+            entity_type: Type of the given models (one of the entity types in :class:`CACHE`).
+
+            models_by_id: Dictionary mapping each requested ID to its fetched model.
+                IDs whose model is None (not found in the API) are not cached.
+
+        Returns:
+            None.
+        """
+        now = time.time()
+
+        self.connection.executemany(f"""INSERT OR REPLACE INTO {CACHE.TBL_NAME}
+                                        ({CACHE.ENTITY_TYPE}, {CACHE.ENTITY_ID}, {CACHE.PAYLOAD},
+                                         {CACHE.FETCHED_AT}, {CACHE.LAST_ACCESSED_AT})
+                                        VALUES (?, ?, ?, ?, ?);""",
+                                    [(entity_type, entity_id, model.json(), now, now)
+                                     for entity_id, model in models_by_id.items() if model is not None])
+
+        self.__evict()
+        self.connection.commit()
+
+    def __evict(self) -> None:
+        """Deletes the least-recently-used models, so that the cache doesn't exceed its maximal size."""
+        entries_count = self.connection.execute(f"SELECT COUNT(*) FROM {CACHE.TBL_NAME};").fetchone()[0]
+
+        if entries_count > self._max_entries:
+            self.connection.execute(f"""DELETE FROM {CACHE.TBL_NAME}
+                                        WHERE rowid IN (SELECT rowid
+                                                        FROM {CACHE.TBL_NAME}
+                                                        ORDER BY {CACHE.LAST_ACCESSED_AT} ASC
+                                                        LIMIT ?);""",
+                                    (entries_count - self._max_entries,))
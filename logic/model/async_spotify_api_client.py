@@ -0,0 +1,406 @@
+import asyncio
+import pandas as pd
+import tekore as tk
+from logic.frontend import log
+from logic import general_utils as ut
+from logic.model.api_cache import CACHE
+from logic.model.rate_limiter import AsyncRateLimiter
+from logic.model.spotify_api_client import SpotifyAPIClient, MeteredSender
+import config
+
+
+class AsyncSpotifyAPIClient:
+    """
+    Asynchronous counterpart of :class:`SpotifyAPIClient`, built upon Tekore's asynchronous mode.
+
+    Instead of sending the chunks of a request (e.g. 50 tracks per chunk) one after another, all the chunks are sent
+    concurrently (up to ``max_concurrency`` requests at a time), and multiple operations can be awaited together.
+
+    Uses the tokens and the local API cache of a given (synchronous) :class:`SpotifyAPIClient`, so no additional
+    authorization is needed.
+    """
+    MAX_TRACKS_PER_REQUEST = 50
+    MAX_ALBUMS_PER_REQUEST = 20
+    MAX_ARTISTS_PER_REQUEST = 50
+    MAX_TRACKS_PER_FEATURES_REQUEST = 100
+
+    def __init__(self,
+                 sync_client: SpotifyAPIClient,
+                 max_concurrency: int = config.API_MAX_WORKERS):
+        """
+        Initializes the asynchronous client. Must be called from within a running event loop.
+
+        Parameters:
+            sync_client: Synchronous client, from which to take the tokens and the local API cache.
+
+            max_concurrency: Maximal amount of concurrent API requests.
+        """
+        self._sync_client = sync_client
+        self.cache = sync_client.cache
+        self.rate_limiter = AsyncRateLimiter(max_retries = config.API_MAX_RETRIES)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._market: str = None
+
+        # Chunking is done here rather than by Tekore, in order to send the chunks concurrently:
+        self.client = tk.Spotify(token = sync_client.get_app_token(),
+                                 sender = MeteredSender(tk.AsyncSender()),
+                                 asynchronous = True,
+                                 max_limits_on = True,
+                                 chunked_on = False)
+
+    async def close(self) -> None:
+        """Closes the underlying asynchronous HTTP client."""
+        await self.client.close()
+
+    async def __call(self, func, *args, **kwargs):
+        """
+        Awaits a single API request, limited by the concurrency cap and by the shared rate limiter.
+
+        Parameters:
+            func: API coroutine function to call.
+
+            args: Positional arguments for the function.
+
+            kwargs: Keyword arguments for the function.
+
+        Returns:
+            The function's result.
+
+        Raises:
+            tk.ServiceUnavailable: if Spotify's API service is unavailable.
+
+            tk.Unauthorised: if the request is not authorised.
+        """
+        async with self._semaphore:
+            try:
+                return await self.rate_limiter.call(func, *args, **kwargs)
+
+            except tk.ServiceUnavailable as ex:
+                message = log.API_SERVICE_UNAVAILABLE.format(ex)
+                log.write(message = message, level = log.ERROR)
+
+                raise tk.ServiceUnavailable(message = message, request = ex.request, response = ex.response)
+
+            except tk.Unauthorised as ex:
+                message = log.API_SERVICE_UNAUTHORIZED.format(ex)
+                log.write(message = message, level = log.ERROR)
+
+                raise tk.Unauthorised(message = message, request = ex.request, response = ex.response)
+
+    async def __gather_chunks(self,
+                              fetch_chunk_func,
+                              entities_ids: list[str],
+                              chunk_size: int) -> list:
+        """
+        Splits the given IDs into chunks, and fetches all the chunks concurrently.
+
+        Parameters:
+            fetch_chunk_func: API coroutine function that gets a list of IDs (up to ``chunk_size`` IDs) and fetches
+                their models.
+
+            entities_ids: IDs of the desired models.
+
+            chunk_size: Maximal amount of IDs in a single request.
+
+        Returns:
+            List of the models, in the order of the given IDs.
+        """
+        chunks_results = await asyncio.gather(*[self.__call(fetch_chunk_func, entities_ids[i:i + chunk_size])
+                                                for i in range(0, len(entities_ids), chunk_size)])
+
+        return [model for chunk_result in chunks_results for model in chunk_result]
+
+    async def __get_through_cache(self,
+                                  entity_type: str,
+                                  entities_ids: list[str],
+                                  fetch_func) -> tk.model.ModelList:
+        """
+        Returns the models of the given entity type for the given IDs, taking them from the cache when possible,
+        and calling the API only for the IDs that are missing from the cache (or expired).
+
+        Parameters:
+            entity_type: Type of the desired models (one of the entity types in :class:`CACHE`).
+
+            entities_ids: Unique IDs of the desired models.
+
+            fetch_func: Coroutine function that gets a list of IDs and fetches their models from the API,
+                in the same order.
+
+        Returns:
+            Tekore ModelList of the models, in the order of the given IDs.
+        """
+        if self.cache is None:
+            return tk.model.ModelList(await fetch_func(entities_ids))
+
+        cached_models = self.cache.get_many(entity_type, entities_ids)
+        missing_ids = [entity_id for entity_id in entities_ids if entity_id not in cached_models]
+
+        log.write(message = log.FOUND_IN_API_CACHE.format(len(cached_models), len(entities_ids), entity_type))
+
+        if len(missing_ids) > 0:
+            fetched_models = dict(zip(missing_ids, await fetch_func(missing_ids)))
+            self.cache.set_many(entity_type, fetched_models)
+            cached_models.update(fetched_models)
+
+        return tk.model.ModelList(cached_models.get(entity_id) for entity_id in entities_ids)
+
+    async def get_market(self) -> str:
+        """
+        Returns the country of the current user, used as the market for fetching Tracks and Albums.
+
+        Returns:
+            Country code of the current user.
+        """
+        if self._market is None:
+            with self.client.token_as(self._sync_client.user_token):
+                self._market = (await self.__call(self.client.current_user)).country
+
+        return self._market
+
+    async def get_full_tracks(self, tracks_ids: str | set | list | pd.Series) -> tk.model.ModelList[
+        tk.model.FullTrack]:
+        """
+        For each Track ID in the given collection, fetches its :class:`tk.model.FullTrack` object from the API.
+
+        Parameters:
+            tracks_ids: All the required tracks' ID's.
+
+        Returns:
+            Tekore ModelList of FullTracks, for the given tracks collection.
+        """
+        unique_tracks_list = ut.get_unique_vals_list(tracks_ids)
+        market = await self.get_market()
+
+        with self.client.token_as(self._sync_client.user_token):
+            log.write(message = log.FETCHING_TRACKS_ATTRS.format(len(unique_tracks_list)))
+
+            # Parameter `market` is needed here, to get the Linked Track for each track:
+            full_tracks = await self.__get_through_cache(
+                entity_type = CACHE.TRACK,
+                entities_ids = unique_tracks_list,
+                fetch_func = lambda ids: self.__gather_chunks(
+                    lambda chunk: self.client.tracks(track_ids = chunk, market = market),
+                    ids,
+                    AsyncSpotifyAPIClient.MAX_TRACKS_PER_REQUEST))
+
+            log.write(message = log.TRACKS_ATTRS_FETCHED.format(len(full_tracks)))
+
+        return full_tracks
+
+    async def get_full_artists(self, artists_ids: str | set | list | pd.Series) -> tk.model.ModelList[
+        tk.model.FullArtist]:
+        """
+        For each Artist ID in the given collection, fetches its :class:`tk.model.FullArtist` object from the API.
+
+        Parameters:
+            artists_ids: All the required artists' ID's.
+
+        Returns:
+            Tekore ModelList of FullArtists, for the given artists collection.
+        """
+        unique_artists_list = ut.get_unique_vals_list(artists_ids)
+
+        with self.client.token_as(self._sync_client.user_token):
+            log.write(message = log.FETCHING_ARTISTS_ATTRS.format(len(unique_artists_list)))
+
+            full_artists = await self.__get_through_cache(
+                entity_type = CACHE.ARTIST,
+                entities_ids = unique_artists_list,
+                fetch_func = lambda ids: self.__gather_chunks(
+                    lambda chunk: self.client.artists(artist_ids = chunk),
+                    ids,
+                    AsyncSpotifyAPIClient.MAX_ARTISTS_PER_REQUEST))
+
+            log.write(message = log.ARTISTS_ATTRS_FETCHED.format(len(full_artists)))
+
+        return full_artists
+
+    async def get_full_albums(self, albums_ids: str | set | list | pd.Series) -> tk.model.ModelList[
+        tk.model.FullAlbum]:
+        """
+        For each Album ID in the given collection, fetches its :class:`tk.model.FullAlbum` object from the API.
+
+        Parameters:
+            albums_ids: All the required albums' ID's.
+
+        Returns:
+            Tekore ModelList of FullAlbums, for the given albums collection.
+        """
+        unique_albums_list = ut.get_unique_vals_list(albums_ids)
+
+        with self.client.token_as(self._sync_client.user_token):
+            log.write(message = log.FETCHING_ALBUMS_ATTRS.format(len(unique_albums_list)))
+
+            # Parameter `market` is not sent, in order to get the Available Markets for each album:
+            full_albums = await self.__get_through_cache(
+                entity_type = CACHE.ALBUM,
+                entities_ids = unique_albums_list,
+                fetch_func = lambda ids: self.__gather_chunks(
+                    lambda chunk: self.client.albums(album_ids = chunk),
+                    ids,
+                    AsyncSpotifyAPIClient.MAX_ALBUMS_PER_REQUEST))
+
+            log.write(message = log.ALBUMS_ATTRS_FETCHED.format(len(full_albums)))
+
+        return full_albums
+
+    async def get_tracks_audio_features(self, tracks_ids: str | set | list | pd.Series) -> tk.model.ModelList[
+        tk.model.AudioFeatures]:
+        """
+        Returns :class:`tk.model.AudioFeatures` for the given track(s).
+
+        Parameters:
+            tracks_ids: IDs of the desired tracks to get Audio Features for.
+
+        Returns:
+            List of AudioFeatures for the requested track(s).
+        """
+        unique_tracks_list = ut.get_unique_vals_list(tracks_ids)
+
+        with self.client.token_as(self._sync_client.user_token):
+            log.write(message = log.FETCHING_AUDIO_FEATURES_ATTRS.format(len(unique_tracks_list)))
+
+            all_tracks_features = await self.__get_through_cache(
+                entity_type = CACHE.AUDIO_FEATURES,
+                entities_ids = unique_tracks_list,
+                fetch_func = lambda ids: self.__gather_chunks(
+                    lambda chunk: self.client.tracks_audio_features(track_ids = chunk),
+                    ids,
+                    AsyncSpotifyAPIClient.MAX_TRACKS_PER_FEATURES_REQUEST))
+
+            log.write(message = log.AUDIO_FEATURES_ATTRS_FETCHED.format(len(all_tracks_features)))
+
+        return all_tracks_features
+
+    async def __get_all_paged_items(self, paging: tk.model.Paging) -> list:
+        """
+        Returns all the items of a given Paging object, fetching its next pages from the API.
+
+        Parameters:
+            paging: First page of the items.
+
+        Returns:
+            List of all the items, from all the pages.
+        """
+        all_items = paging.items
+
+        while paging.next is not None:
+            paging = await self.__call(self.client.next, paging)
+            all_items.extend(paging.items)
+
+        return all_items
+
+    async def __artist_get_all_albums(self,
+                                      artist_id: str,
+                                      include_album_groups: list[str | tk.model.AlbumGroup]) -> list[
+        tk.model.SimpleAlbum]:
+        """
+        Fetches all the **Albums** of a single artist from the API.
+
+        Parameters:
+            artist_id: ID of the desired artist.
+
+            include_album_groups: List with the desired types of albums to fetch.
+
+        Returns:
+            List of all the artist's albums.
+        """
+        artist_albums_paging = await self.__call(self.client.artist_albums,
+                                                 artist_id = artist_id,
+                                                 include_groups = include_album_groups)
+
+        return await self.__get_all_paged_items(artist_albums_paging)
+
+    async def artists_get_all_albums(self,
+                                     artists_ids: str | set | list | pd.Series,
+                                     album_groups: list[str | tk.model.AlbumGroup] = None) -> dict[
+        str, list[tk.model.SimpleAlbum]]:
+        """
+        For each Artist ID in the given collection, fetches all of their **Albums** from the API.
+        The artists are fetched concurrently.
+
+        Parameters:
+            artists_ids: A single ID or multiple IDs of all the desired artists.
+
+            album_groups: List with the desired types of albums to fetch.
+                Possible values: 'album', 'appears_on', 'compilation', 'single'.
+                Default: ['album', 'appears_on'].
+
+        Returns:
+            Dictionary, containing one entry for each artist, with a list of all that artist's albums.
+        """
+        include_album_groups = album_groups if album_groups is not None else [tk.model.AlbumGroup.album,
+                                                                              tk.model.AlbumGroup.appears_on]
+        unique_artists_list = ut.get_unique_vals_list(artists_ids)
+
+        with self.client.token_as(self._sync_client.user_token):
+            log.write(message = log.FETCHING_ARTISTS_ALBUMS_ATTRS.format(len(unique_artists_list)))
+
+            artists_albums = await asyncio.gather(*[self.__artist_get_all_albums(artist_id, include_album_groups)
+                                                    for artist_id in unique_artists_list])
+
+            log.write(message = log.ARTISTS_ALBUMS_ATTRS_FETCHED.format(len(unique_artists_list)))
+
+        return dict(zip(unique_artists_list, artists_albums))
+
+    async def artists_get_all_tracks(self,
+                                     artists_ids: str | set | list | pd.Series,
+                                     album_groups: list[str | tk.model.AlbumGroup] = None) -> dict[
+        str, list[tuple[tk.model.SimpleAlbum, list[tk.model.SimpleTrack]]]]:
+        """
+        For each Artist ID in the given collection, fetches all of their **Tracks** from the API.
+        Same as :meth:`SpotifyAPIClient.artists_get_all_tracks`, but the artists' albums, the albums themselves and
+        their tracks' pages are all fetched concurrently.
+
+        Parameters:
+            artists_ids: A single ID or multiple IDs of all the desired artists.
+
+            album_groups: List with the desired types of albums to fetch.
+                Possible values: 'album', 'appears_on', 'compilation', 'single'.
+                Default: ['album', 'appears_on'].
+
+        Returns:
+            Dictionary mapping each artist's ID to a list of tuples, each tuple containing two items:
+                [0] = SimpleAlbum object (with its ``album_group``), [1] = list of the tracks of that album that belong
+                to the artist's discography (see :meth:`SpotifyAPIClient.get_artist_album_tracks`).
+        """
+        unique_artists_list = ut.get_unique_vals_list(artists_ids)
+        all_artists_tracks = {}
+
+        log.write(message = log.FETCHING_ARTISTS_TRACKS_ATTRS.format(len(unique_artists_list)))
+
+        all_artists_albums_dict = await self.artists_get_all_albums(artists_ids = unique_artists_list,
+                                                                    album_groups = album_groups)
+        all_albums_ids = ut.get_unique_vals_list([album.id
+                                                  for albums_list in all_artists_albums_dict.values()
+                                                  for album in albums_list])
+
+        market = await self.get_market()
+
+        with self.client.token_as(self._sync_client.user_token):
+            log.write(message = log.FETCHING_ALBUMS_ATTRS.format(len(all_albums_ids)))
+
+            all_full_albums = await self.__gather_chunks(
+                lambda chunk: self.client.albums(album_ids = chunk, market = market),
+                all_albums_ids,
+                AsyncSpotifyAPIClient.MAX_ALBUMS_PER_REQUEST)
+
+            log.write(message = log.ALBUMS_ATTRS_FETCHED.format(len(all_albums_ids)))
+
+            all_full_albums = [album for album in all_full_albums if album is not None]
+            all_albums_tracks = await asyncio.gather(*[self.__get_all_paged_items(album.tracks)
+                                                       for album in all_full_albums])
+
+        all_albums_tracks = {album.id: album_tracks_list
+                             for album, album_tracks_list in zip(all_full_albums, all_albums_tracks)}
+
+        # The albums are attributed to the artists they were fetched for (rather than to the albums' own artists),
+        # so albums that an artist only appears on are kept as well:
+        for artist_id, artist_albums in all_artists_albums_dict.items():
+            all_artists_tracks[artist_id] = [
+                (album, SpotifyAPIClient.get_artist_album_tracks(artist_id, album, all_albums_tracks[album.id]))
+                for album in artist_albums if album.id in all_albums_tracks]
+
+        log.write(message = log.ARTISTS_TRACKS_ATTRS_FETCHED.format(len(unique_artists_list)))
+
+        return all_artists_tracks
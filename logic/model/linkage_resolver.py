@@ -0,0 +1,234 @@
+from collections.abc import Iterable
+
+
+class LinkageResolver:
+    """
+    Resolves chains of relinked IDs (of tracks or of albums) to their Known IDs, using a union-find (disjoint set)
+    structure: every link merges the sets of its two IDs, so all the IDs that are linked to each other, directly or
+    through any chain of links, end up in a single set, which resolves to a single Known ID.
+
+    Finding an ID's set is done with path compression and the sets are merged by size, so resolving any amount of
+    links takes near-linear time.
+
+    The Known ID of each set doesn't depend on the order of the links: it's the smallest of the set's IDs that were
+    added as known (see :meth:`add`), or if there are none, the smallest of its IDs that weren't linked from (i.e.
+    the ends of its chains), or if there are none either (a cycle), the smallest of all its IDs.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty resolver.
+        """
+        self.__parents: dict[str, str] = {}
+        self.__sizes: dict[str, int] = {}
+        self.__known_ids: set[str] = set()
+        self.__linked_from_ids: set[str] = set()
+
+        # The Known ID of each set by the ID of its root, calculated on demand (None = needs to be recalculated):
+        self.__known_ids_by_root: dict[str, str] | None = None
+
+    def __len__(self) -> int:
+        return len(self.__parents)
+
+    def __contains__(self, entity_id: str) -> bool:
+        return entity_id in self.__parents
+
+    def __get_rank(self, entity_id: str) -> tuple[int, str]:
+        """Returns the rank of an ID as a candidate for its set's Known ID (the lowest rank is the best)."""
+        if entity_id in self.__known_ids:
+            return 0, entity_id
+
+        if entity_id not in self.__linked_from_ids:
+            return 1, entity_id
+
+        return 2, entity_id
+
+    def add(self, entity_id: str, is_known: bool = False) -> None:
+        """
+        Adds an ID to the resolver (if it's not in it yet), as a set of its own.
+
+        Parameters:
+            entity_id: The ID to add.
+
+            is_known: Whether the ID is known to be up-to-date, so it's preferred as its set's Known ID.
+
+        Returns:
+            None.
+        """
+        if entity_id not in self.__parents:
+            self.__parents[entity_id] = entity_id
+            self.__sizes[entity_id] = 1
+            self.__known_ids_by_root = None
+
+        if is_known:
+            self.__known_ids.add(entity_id)
+            self.__known_ids_by_root = None
+
+    def find(self, entity_id: str) -> str:
+        """
+        Finds the root of the set that contains the given ID, compressing the path to it (so that every ID along
+        the path points directly at the root).
+
+        Parameters:
+            entity_id: An ID that was added to the resolver.
+
+        Returns:
+            The ID of the set's root.
+
+        Raises:
+            KeyError: if the ID was not added to the resolver.
+        """
+        root_id = entity_id
+
+        while self.__parents[root_id] != root_id:
+            root_id = self.__parents[root_id]
+
+        while self.__parents[entity_id] != root_id:
+            self.__parents[entity_id], entity_id = root_id, self.__parents[entity_id]
+
+        return root_id
+
+    def link(self, linked_from_id: str, relinked_id: str) -> None:
+        """
+        Links an ID to the ID it was relinked to, merging their sets (and adding them to the resolver if needed).
+        Linking an ID to itself only adds it.
+
+        Parameters:
+            linked_from_id: The (obsolete) ID that was relinked.
+
+            relinked_id: The ID it was relinked to.
+
+        Returns:
+            None.
+        """
+        self.add(linked_from_id)
+        self.add(relinked_id)
+
+        if linked_from_id == relinked_id:
+            return
+
+        self.__linked_from_ids.add(linked_from_id)
+        self.__known_ids_by_root = None
+
+        first_root_id = self.find(linked_from_id)
+        second_root_id = self.find(relinked_id)
+
+        if first_root_id == second_root_id:
+            return
+
+        # Attaching the smaller set to the larger one, so the paths stay short:
+        if self.__sizes[first_root_id] < self.__sizes[second_root_id]:
+            first_root_id, second_root_id = second_root_id, first_root_id
+
+        self.__parents[second_root_id] = first_root_id
+        self.__sizes[first_root_id] += self.__sizes.pop(second_root_id)
+
+    def __get_known_ids_by_root(self) -> dict[str, str]:
+        """Returns the Known ID of each set by the ID of its root, calculating them all in a single pass if needed."""
+        if self.__known_ids_by_root is None:
+            self.__known_ids_by_root = {}
+
+            for entity_id in self.__parents:
+                root_id = self.find(entity_id)
+                known_id = self.__known_ids_by_root.get(root_id)
+
+                if known_id is None or self.__get_rank(entity_id) < self.__get_rank(known_id):
+                    self.__known_ids_by_root[root_id] = entity_id
+
+        return self.__known_ids_by_root
+
+    def get_known_id(self, entity_id: str) -> str:
+        """
+        Returns the Known ID that the given ID resolves to.
+
+        Parameters:
+            entity_id: An ID that was added to the resolver.
+
+        Returns:
+            The Known ID of the ID's set.
+
+        Raises:
+            KeyError: if the ID was not added to the resolver.
+        """
+        return self.__get_known_ids_by_root()[self.find(entity_id)]
+
+    def get_known_ids_map(self) -> dict[str, str]:
+        """
+        Returns the Known ID that each of the resolver's IDs resolves to.
+
+        Returns:
+            Dictionary mapping each ID to its Known ID.
+        """
+        known_ids_by_root = self.__get_known_ids_by_root()
+
+        return {entity_id: known_ids_by_root[self.find(entity_id)] for entity_id in self.__parents}
+
+
+def resolve_tracks(tracks_links: Iterable[tuple[str, str]]) -> dict[str, str]:
+    """
+    Resolves the chains of relinked tracks: a track that was relinked to a track which was itself relinked later
+    (and so on) is resolved to the end of the chain.
+
+    Parameters:
+        tracks_links: Pairs of a listened track's ID and the ID of the Known Track it was relinked to (a track that
+            wasn't relinked is paired with itself).
+
+    Returns:
+        Dictionary mapping each of the tracks' IDs to its resolved Known Track ID.
+    """
+    resolver = LinkageResolver()
+
+    for linked_from_id, relinked_id in tracks_links:
+        resolver.link(linked_from_id, relinked_id)
+
+    return resolver.get_known_ids_map()
+
+
+def resolve_albums(albums_tracks: Iterable[tuple[str, str]], known_tracks_ids_map: dict[str, str]) -> dict[str, str]:
+    """
+    Resolves the albums of the listened tracks to their Known Albums.
+
+    An album that contains any up-to-date track (i.e. a track that resolves to itself) is known, and resolves
+    to itself. Any other album is suspected as obsolete, and is linked to an album of the Known Tracks that its
+    tracks resolve to: OldAlbumID -> LinkedFromTrackID -> KnownTrackID -> KnownAlbumID.
+    When its tracks lead to several Known Albums, the smallest of their IDs is taken, so different known albums
+    with the same tracks (e.g. an album and a compilation) are never merged into each other.
+    A suspected album that no Known Album can be reached from resolves to itself.
+
+    Parameters:
+        albums_tracks: Pairs of an album's ID and the ID of one of its tracks.
+
+        known_tracks_ids_map: Dictionary mapping tracks' IDs to their Known Track IDs (see :func:`resolve_tracks`).
+            Tracks that are missing from it are regarded as up-to-date.
+
+    Returns:
+        Dictionary mapping each of the albums' IDs to its resolved Known Album ID.
+    """
+    resolver = LinkageResolver()
+    known_tracks_albums_ids: dict[str, list[str]] = {}
+    suspected_albums_tracks: list[tuple[str, str]] = []
+
+    for album_id, track_id in albums_tracks:
+        known_track_id = known_tracks_ids_map.get(track_id, track_id)
+
+        if known_track_id == track_id:
+            resolver.add(album_id, is_known = True)
+            known_tracks_albums_ids.setdefault(track_id, []).append(album_id)
+
+        else:
+            resolver.add(album_id)
+            suspected_albums_tracks.append((album_id, known_track_id))
+
+    known_albums_ids = {album_id for albums_ids in known_tracks_albums_ids.values() for album_id in albums_ids}
+    candidates_by_suspected_album: dict[str, set[str]] = {}
+
+    for album_id, known_track_id in suspected_albums_tracks:
+        if album_id not in known_albums_ids:
+            candidates_by_suspected_album.setdefault(album_id, set()).update(
+                known_tracks_albums_ids.get(known_track_id, []))
+
+    for album_id, candidates_ids in candidates_by_suspected_album.items():
+        if len(candidates_ids) > 0:
+            resolver.link(album_id, min(candidates_ids))
+
+    return resolver.get_known_ids_map()
@@ -0,0 +1,105 @@
+import os
+import pandas as pd
+from logic.frontend import log
+
+try:
+    import pyarrow.feather as feather
+
+except ImportError:
+    feather = None
+
+
+def is_available() -> bool:
+    """
+    Checks whether snapshots can be used, i.e. whether the optional package ``pyarrow`` is installed.
+
+    Returns:
+        Whether snapshots can be used.
+    """
+    return feather is not None
+
+
+def _get_version_file_path(file_path: str) -> str:
+    return file_path + '.version'
+
+
+def read(file_path: str, version_key: str) -> pd.DataFrame | None:
+    """
+    Reads a DataFrame from a snapshot file (Feather format), but only if the snapshot was written for the given
+    version of the data.
+
+    The file is memory-mapped, so it isn't read into Arrow's memory before the conversion. The conversion into pandas
+    does copy the columns into the DataFrame's memory, since the typed columns (categoricals, nullable booleans and
+    timestamps with a timezone) can't be converted without a copy.
+
+    Parameters:
+        file_path: Path of the snapshot file.
+
+        version_key: Version of the data that the snapshot is expected to contain (e.g. the DB's data version
+            and schema hash).
+
+    Returns:
+        The snapshot's DataFrame, or None if there's no snapshot for the given version (or pyarrow is not installed).
+    """
+    if not is_available() or not os.path.isfile(file_path):
+        return None
+
+    version_file_path = _get_version_file_path(file_path)
+
+    if not os.path.isfile(version_file_path):
+        return None
+
+    with open(version_file_path, "rt", encoding = 'utf-8') as version_file:
+        if version_file.read() != version_key:
+            log.write(log.SNAPSHOT_IS_STALE.format(file_path))
+
+            return None
+
+    log.write(log.READING_SNAPSHOT.format(file_path))
+
+    snapshot_df = feather.read_table(file_path, memory_map = True).to_pandas()
+
+    log.write(log.SNAPSHOT_READ.format(len(snapshot_df)))
+
+    return snapshot_df
+
+
+def write(df: pd.DataFrame, file_path: str, version_key: str) -> None:
+    """
+    Writes a DataFrame to a snapshot file (uncompressed Feather format, so it's read without decompressing),
+    along with the version of the data it contains.
+
+    The snapshot is first written to a temporary file and then renamed, so an interrupted write never leaves
+    a partial snapshot behind.
+
+    Parameters:
+        df: DataFrame to write. Its index is not saved.
+
+        file_path: Path of the snapshot file.
+
+        version_key: Version of the data that the DataFrame contains.
+
+    Returns:
+        None.
+    """
+    if not is_available():
+        log.write(log.SNAPSHOT_UNAVAILABLE, level = log.WARNING)
+
+        return
+
+    version_file_path = _get_version_file_path(file_path)
+    temp_file_path = file_path + '.tmp'
+
+    log.write(log.WRITING_FILE.format(file_path))
+
+    # Removing the old version first, so the old snapshot is never taken as the new one:
+    if os.path.isfile(version_file_path):
+        os.remove(version_file_path)
+
+    feather.write_feather(df.reset_index(drop = True), temp_file_path, compression = 'uncompressed')
+    os.replace(temp_file_path, file_path)
+
+    with open(version_file_path, "wt", encoding = 'utf-8') as version_file:
+        version_file.write(version_key)
+
+    log.write(log.FILE_WRITTEN.format(file_path))
@@ -0,0 +1,161 @@
+import asyncio
+import threading
+import time
+import tekore as tk
+from logic.frontend import log
+from logic.frontend import metrics
+
+
+class RateLimiter:
+    """
+    Rate limiter shared by all the threads that call the Spotify API.
+
+    When the API responds with **429 - Too Many Requests**, it also tells how many seconds to wait
+    (the ``Retry-After`` header). Instead of only the rejected thread waiting and the rest of the threads keep
+    getting rejected, all the threads pause their requests until that time has passed.
+    """
+
+    def __init__(self, max_retries: int = 5):
+        """
+        Initializes the rate limiter.
+
+        Parameters:
+            max_retries: Maximal amount of times to retry a single rate-limited request before giving up.
+        """
+        self._max_retries = max_retries
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+        self._retries_count = 0
+
+    @property
+    def retries_count(self) -> int:
+        """
+        Returns the total amount of requests that were retried because of rate limiting.
+
+        Returns:
+            Amount of retried requests.
+        """
+        return self._retries_count
+
+    def wait(self) -> None:
+        """Blocks the calling thread while the requests are paused."""
+        with self._lock:
+            delay = self._resume_at - time.monotonic()
+
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Pauses the requests of all the threads for the given time.
+
+        Parameters:
+            seconds: Amount of seconds to pause the requests for.
+
+        Returns:
+            None.
+        """
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+            self._retries_count += 1
+
+        metrics.increment(metrics.API_RETRIES)
+
+    def call(self, func, *args, **kwargs):
+        """
+        Calls the given API function, after waiting for any pause. If the call is rate-limited, pauses all the
+        threads according to the response's ``Retry-After`` header, and retries the call.
+
+        Parameters:
+            func: API function to call.
+
+            args: Positional arguments for the function.
+
+            kwargs: Keyword arguments for the function.
+
+        Returns:
+            The function's result.
+
+        Raises:
+            tk.TooManyRequests: if the call is still rate-limited after the maximal amount of retries.
+        """
+        for retry in range(self._max_retries + 1):
+            self.wait()
+
+            try:
+                return func(*args, **kwargs)
+
+            except tk.TooManyRequests as ex:
+                if retry == self._max_retries:
+                    raise
+
+                retry_after = int(ex.response.headers.get('Retry-After', 1))
+                log.write(log.API_RATE_LIMITED.format(retry_after), level = log.WARNING)
+
+                self.pause(retry_after + 1)
+
+
+class AsyncRateLimiter:
+    """
+    Asynchronous counterpart of :class:`RateLimiter`, shared by all the coroutines that call the Spotify API
+    in the same event loop.
+    """
+
+    def __init__(self, max_retries: int = 5):
+        """
+        Initializes the rate limiter.
+
+        Parameters:
+            max_retries: Maximal amount of times to retry a single rate-limited request before giving up.
+        """
+        self._max_retries = max_retries
+        self._resume_at = 0.0
+        self._retries_count = 0
+
+    @property
+    def retries_count(self) -> int:
+        """
+        Returns the total amount of requests that were retried because of rate limiting.
+
+        Returns:
+            Amount of retried requests.
+        """
+        return self._retries_count
+
+    async def call(self, func, *args, **kwargs):
+        """
+        Awaits the given API coroutine function, after waiting for any pause. If the call is rate-limited, pauses all
+        the coroutines according to the response's ``Retry-After`` header, and retries the call.
+
+        Parameters:
+            func: API coroutine function to call.
+
+            args: Positional arguments for the function.
+
+            kwargs: Keyword arguments for the function.
+
+        Returns:
+            The function's result.
+
+        Raises:
+            tk.TooManyRequests: if the call is still rate-limited after the maximal amount of retries.
+        """
+        for retry in range(self._max_retries + 1):
+            delay = self._resume_at - time.monotonic()
+
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            try:
+                return await func(*args, **kwargs)
+
+            except tk.TooManyRequests as ex:
+                if retry == self._max_retries:
+                    raise
+
+                retry_after = int(ex.response.headers.get('Retry-After', 1))
+                log.write(log.API_RATE_LIMITED.format(retry_after), level = log.WARNING)
+
+                self._resume_at = max(self._resume_at, time.monotonic() + retry_after + 1)
+                self._retries_count += 1
+                metrics.increment(metrics.API_RETRIES)
@@ -2,12 +2,17 @@ import numpy as np
 import pandas as pd
 import re
 import os.path
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from logic.frontend import log
+from logic.frontend import metrics
 from logic.db import db
+from logic import general_utils as utl
 import json
 from logic.model.sp_data_set_names import SPDT as SPDTNM
 from logic.model.sp_data_set_names import PATH as SPDTPATH
+from logic.model.sp_data_set_names import READ as SPDTREAD
+from logic.model import listen_history_snapshot
 
 
 class SpotifyDataSet:
@@ -24,6 +29,36 @@ class SpotifyDataSet:
                          'master_metadata_album_artist_name': SPDTNM.ALBUM_ARTIST_NAME,
                          'master_metadata_album_album_name' : SPDTNM.ALBUM_NAME}
 
+    # Columns of names and IDs, which have relatively few unique values, so they are kept as categoricals:
+    CATEGORICAL_COLUMNS = [SPDTNM.USERNAME,
+                           SPDTNM.TRACK_ID,
+                           SPDTNM.TRACK_LISTENED_ID,
+                           SPDTNM.TRACK_KNOWN_ID,
+                           SPDTNM.TRACK_NAME,
+                           SPDTNM.ALBUM_KNOWN_ID,
+                           SPDTNM.ALBUM_NAME,
+                           SPDTNM.ALBUM_ARTIST_ID,
+                           SPDTNM.ALBUM_ARTIST_NAME,
+                           SPDTNM.TRACK_URI,
+                           SPDTNM.REASON_START,
+                           SPDTNM.REASON_END,
+                           SPDTNM.PLATFORM,
+                           SPDTNM.CONN_COUNTRY]
+
+    # Columns of whole numbers that never exceed 32 bits:
+    INT32_COLUMNS = [SPDTNM.MS_PLAYED,
+                     SPDTNM.TRACK_DURATION_MS]
+
+    # Columns of True/False flags, which might also be missing:
+    BOOLEAN_COLUMNS = [SPDTNM.SKIPPED,
+                       SPDTNM.SHUFFLE,
+                       SPDTNM.OFFLINE,
+                       SPDTNM.INCOGNITO]
+
+    # Flags are saved in the DB as text (e.g. '1' or ''), and read from the JSON files as booleans:
+    BOOLEAN_VALUES_MAP = {True: True, '1': True, '1.0': True, 'True': True,
+                          False: False, '0': False, '0.0': False, 'False': False}
+
     MUSICAL_KEY_MAP = dict(zip(np.arange(start = 0, stop = 12, step = 1),
                                ['C', 'Db', 'D', 'Eb', 'E', 'F', 'Gb', 'G', 'Ab', 'A', 'Bb', 'B']))
 
@@ -43,8 +78,7 @@ class SpotifyDataSet:
         Returns:
             None
         """
-        files_list = [filename for filename in os.listdir(SPDTPATH.JSON_FILE_PATH) if
-                      re.match(string = filename, pattern = f'{SPDTPATH.JSON_FILE_PREFIX}.*.json')]
+        files_list = SpotifyDataSet.get_listen_history_files(SPDTPATH.JSON_FILE_PATH, SPDTPATH.JSON_FILE_PREFIX)
 
         # Trying to read all 'Listen History' files that are available in the given folder:
         for filename in files_list:
@@ -71,12 +105,94 @@ class SpotifyDataSet:
                     json.dump(cleaned_json_data, file_to_write, indent = 4)
 
     @staticmethod
+    def get_listen_history_files(folder_path: str,
+                                 filename_prefix: str = SPDTPATH.JSON_FILE_PREFIX) -> list[str]:
+        """
+        Returns the names of all the Listen History JSON files in the given folder.
+
+        Parameters:
+            folder_path: Path to a folder containing Spotify Listen History JSON files.
+
+            filename_prefix: Prefix for the names of the desired files.
+
+        Returns:
+            List of the files' names (without preceding path).
+        """
+        return [filename for filename in os.listdir(folder_path) if
+                re.match(string = filename, pattern = f'{filename_prefix}.*.json')]
+
+    @staticmethod
+    def prepare_listen_history_chunk(listen_history_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Removes the irrelevant columns from a (partial) raw Listen History DataFrame, renames the rest of the
+        columns to friendlier names, and converts the flag columns to nullable booleans.
+
+        These steps only depend on each record by itself, so they can be applied to each file or chunk of records
+        separately, before all the chunks are concatenated together. The flags' dtype is set explicitly, since the
+        dtype that is inferred for them depends on the records that were read together (e.g. a flag that is missing
+        in some records is read as float or as object, depending on how the file was parsed).
+
+        Parameters:
+            listen_history_df: Raw Listen History DataFrame, as read from the JSON files.
+
+        Returns:
+            DataFrame without the irrelevant columns, with renamed columns and boolean flags.
+        """
+        prepped_df = listen_history_df.drop(
+            columns = [SPDTNM.IP_ADDRESS, SPDTNM.USER_AGENT,
+                       SPDTNM.EPISODE_NAME, SPDTNM.EPISODE_SHOW_NAME, SPDTNM.EPISODE_URI],
+            errors = 'ignore',
+            inplace = False)
+
+        prepped_df = prepped_df.rename(columns = SpotifyDataSet.COLUMNS_TO_RENAME,
+                                       inplace = False)
+
+        prepped_df = prepped_df.astype({column: 'boolean' for column in SpotifyDataSet.BOOLEAN_COLUMNS
+                                        if column in prepped_df.columns})
+
+        return prepped_df
+
+    @staticmethod
+    def read_listen_history_file(file_path: str,
+                                 chunk_size: int = None) -> pd.DataFrame:
+        """
+        Reads a single Listen History JSON file.
+
+        When ``chunk_size`` is given, the file is parsed incrementally, and each chunk of records is prepared
+        (see :meth:`prepare_listen_history_chunk`) right after it is parsed, so only one chunk of raw records is held
+        in memory at any given time.
+
+        Parameters:
+            file_path: Path of the JSON file to read.
+
+            chunk_size: Amount of records to parse at a time. If None, the whole file is parsed at once.
+
+        Returns:
+            DataFrame with the prepared records of the file.
+        """
+        if chunk_size is None:
+            file_df = SpotifyDataSet.prepare_listen_history_chunk(pd.read_json(file_path, encoding = 'utf-8'))
+
+        else:
+            chunks_dfs = [SpotifyDataSet.prepare_listen_history_chunk(pd.DataFrame.from_records(chunk))
+                          for chunk in utl.read_json_array_in_chunks(file_path, chunk_size)]
+
+            file_df = pd.concat(chunks_dfs, ignore_index = True) if len(chunks_dfs) > 0 else pd.DataFrame()
+
+        return file_df
+
+    @staticmethod
+    @metrics.timed
     def collect_all_listen_history(folder_path: str = None,
-                                   filename_prefix: str = SPDTPATH.JSON_FILE_PREFIX) -> pd.DataFrame:
+                                   filename_prefix: str = SPDTPATH.JSON_FILE_PREFIX,
+                                   chunk_size: int = SPDTREAD.JSON_CHUNK_SIZE,
+                                   filenames: list[str] = None) -> pd.DataFrame:
         """
-        Reads all Listen History data, either from an existing DB,
-        or from JSON files (already requested and downloaded from Spotify) contained in the given
-        folder. Prepares and organizes data into a single DataFrame.
+        Reads all Listen History data from JSON files (already requested and downloaded from Spotify) contained
+        in the given folder. Prepares and organizes data into a single DataFrame.
+
+        The irrelevant columns are removed from each file (or each chunk of a file) as soon as it is read,
+        and all the files are concatenated only once at the end.
 
         Parameters:
             folder_path: Path to a folder containing at least one Spotify Listen History JSON file.
@@ -84,35 +200,130 @@ class SpotifyDataSet:
 
             filename_prefix: Prefix for the names of the desired files to read.
 
+            chunk_size: Amount of records to parse at a time from each file. If None, each file is parsed at once.
+
+            filenames: Names of specific files in the folder to read. If None, reads all the files in the folder
+                that start with ``filename_prefix``.
+
         Returns:
-            DataFrame of all Listen history, sorted by timestamp of listening (ascending) and Milliseconds played
-                (ascending).
+            DataFrame of all Listen history, without the irrelevant columns and with renamed columns.
         """
-        all_listens_df: pd.DataFrame = None
+        all_listens_dfs = []
 
-        files_list = [filename for filename in os.listdir(folder_path) if
-                      re.match(string = filename, pattern = f'{filename_prefix}.*.json')]
+        if filenames is None:
+            filenames = SpotifyDataSet.get_listen_history_files(folder_path, filename_prefix)
 
         # Trying to read all 'Listen History' files that are available in the given folder:
-        for filename in files_list:
-            curr_listen_json_df = None
+        for filename in filenames:
             file_path = folder_path + '/' + filename
 
             if os.path.isfile(file_path):
                 log.write(log.READING_FILE.format(filename))
 
-                curr_listen_json_df = pd.read_json(file_path, encoding = 'utf-8')
+                all_listens_dfs.append(SpotifyDataSet.read_listen_history_file(file_path, chunk_size))
+
+            else:
+                log.write(log.NONEXISTENT_FILE.format(filename), level = log.WARNING)
+
+        return pd.concat(all_listens_dfs) if len(all_listens_dfs) > 0 else None
+
+    @staticmethod
+    def clean_listen_history_file(file_path: str,
+                                  chunk_size: int = None) -> dict[str, np.ndarray]:
+        """
+        Reads a single Listen History JSON file and performs the cleaning steps of
+        :meth:`prepare_track_listen_history` that only depend on each record by itself:
+        removes the irrelevant columns, removes the listens with no SpotifyURI (i.e. podcasts episodes)
+        and adds the TrackID column.
+
+        Meant to be run by a worker process, so the results are returned as compact columns
+        rather than as a DataFrame.
 
-            if curr_listen_json_df is None:
-                log.write(log.NONEXISTENT_FILE.format(filename))
+        Parameters:
+            file_path: Path of the JSON file to read.
+
+            chunk_size: Amount of records to parse at a time. If None, the whole file is parsed at once.
+
+        Returns:
+            Dictionary mapping each column's name to an array of its values, in the columns' order.
+        """
+        file_df = SpotifyDataSet.read_listen_history_file(file_path, chunk_size)
+
+        file_df = file_df.drop(file_df.index[file_df[SPDTNM.TRACK_URI].isnull()], inplace = False)
+
+        SpotifyDataSet.add_track_id_column(file_df)
+
+        return {column: file_df[column].to_numpy() for column in file_df.columns}
+
+    @staticmethod
+    @metrics.timed
+    def collect_all_listen_history_parallel(folder_path: str = None,
+                                            filename_prefix: str = SPDTPATH.JSON_FILE_PREFIX,
+                                            chunk_size: int = SPDTREAD.JSON_CHUNK_SIZE,
+                                            max_workers: int = SPDTREAD.JSON_READ_WORKERS,
+                                            filenames: list[str] = None) -> pd.DataFrame:
+        """
+        Reads all Listen History data from JSON files contained in the given folder, like
+        :meth:`collect_all_listen_history`, but spreads the files across a pool of worker processes.
+
+        Each worker also performs the per-file cleaning steps (see :meth:`clean_listen_history_file`), so passing
+        the result to :meth:`prepare_track_listen_history` yields exactly the same DataFrame as the serial path.
+
+        Parameters:
+            folder_path: Path to a folder containing at least one Spotify Listen History JSON file.
+
+            filename_prefix: Prefix for the names of the desired files to read.
+
+            chunk_size: Amount of records to parse at a time from each file. If None, each file is parsed at once.
+
+            max_workers: Amount of worker processes. If None, uses the amount of CPUs on the machine. At most one
+                worker per file is used, and with a single worker (e.g. a single file) no pool is started.
+
+            filenames: Names of specific files in the folder to read. If None, reads all the files in the folder
+                that start with ``filename_prefix``.
+
+        Returns:
+            DataFrame of all Listen history, cleaned file-by-file.
+        """
+        files_paths = []
+
+        if filenames is None:
+            filenames = SpotifyDataSet.get_listen_history_files(folder_path, filename_prefix)
+
+        for filename in filenames:
+            file_path = folder_path + '/' + filename
+
+            if os.path.isfile(file_path):
+                log.write(log.READING_FILE.format(filename))
+                files_paths.append(file_path)
 
             else:
-                all_listens_df = curr_listen_json_df.copy() if all_listens_df is None \
-                    else pd.concat([all_listens_df, curr_listen_json_df])
+                log.write(log.NONEXISTENT_FILE.format(filename), level = log.WARNING)
+
+        if len(files_paths) == 0:
+            return None
+
+        # There's no use in more workers than files:
+        workers_amount = min(len(files_paths), max_workers or os.cpu_count() or 1)
+
+        # With a single worker, a pool would only add its start-up and the pickling of the results, so the files
+        # are read in this process:
+        if workers_amount == 1:
+            files_columns = [SpotifyDataSet.clean_listen_history_file(file_path, chunk_size)
+                             for file_path in files_paths]
+
+        else:
+            with ProcessPoolExecutor(max_workers = workers_amount) as executor:
+                # ``map`` returns the results in the order of the given files, regardless of which worker finished
+                # first:
+                files_columns = list(executor.map(SpotifyDataSet.clean_listen_history_file,
+                                                  files_paths,
+                                                  [chunk_size] * len(files_paths)))
 
-        return all_listens_df
+        return pd.concat([pd.DataFrame(file_columns) for file_columns in files_columns], ignore_index = True)
 
     @staticmethod
+    @metrics.timed
     def prepare_track_listen_history(listen_history_df: pd.DataFrame) -> pd.DataFrame:
         """
         Cleans up, sorts and prepares a Tracks-only Listen History DataFrame for working upon.
@@ -132,16 +343,8 @@ class SpotifyDataSet:
         Returns:
             DataFrame with the prepared Tracks Listen History.
         """
-        prepped_df = listen_history_df.copy()
-
-        # Removing irrelevant columns:
-        prepped_df = prepped_df.drop(
-            columns = [SPDTNM.IP_ADDRESS, SPDTNM.USER_AGENT,
-                       SPDTNM.EPISODE_NAME, SPDTNM.EPISODE_SHOW_NAME, SPDTNM.EPISODE_URI],
-            inplace = False)
-
-        prepped_df = prepped_df.rename(columns = SpotifyDataSet.COLUMNS_TO_RENAME,
-                                       inplace = False)
+        # Removing irrelevant columns (unless they were already removed while reading the files):
+        prepped_df = SpotifyDataSet.prepare_listen_history_chunk(listen_history_df)
 
         # Sorting the DataFrame by username, then by timestamp of listening, then by Milliseconds Played.
         # 1. Timestamp of listening is NOT unique. Sometimes, in a certain timestamp, multiple tracks were played,
@@ -158,7 +361,9 @@ class SpotifyDataSet:
         prepped_df = prepped_df.drop(
             prepped_df.index[prepped_df[SPDTNM.TRACK_URI].isnull()], inplace = False)
 
-        SpotifyDataSet.add_track_id_column(prepped_df)
+        # The TrackID column might already exist, if the files were cleaned while being read in parallel:
+        if SPDTNM.TRACK_ID not in prepped_df.columns:
+            SpotifyDataSet.add_track_id_column(prepped_df)
 
         # Errors in the source data can cause multiple tracks (the same one or different ones) to be listed in the
         # exact same timestamp. In a certain timestamp, I want to keep different listened tracks, but remove
@@ -172,6 +377,12 @@ class SpotifyDataSet:
         prepped_df[SPDTNM.ALBUM_ARTIST_NAME] = prepped_df[SPDTNM.ALBUM_ARTIST_NAME].replace('\$\$', '\\$\\$',
                                                                                             inplace = False)
 
+        # The removed records left gaps in the index, which depend on which records were removed while reading:
+        prepped_df.reset_index(drop = True, inplace = True)
+
+        metrics.increment(metrics.LISTENS_READ, len(listen_history_df))
+        metrics.increment(metrics.LISTENS_PREPARED, len(prepped_df))
+
         return prepped_df
 
     @staticmethod
@@ -219,25 +430,152 @@ class SpotifyDataSet:
 
         updated_df[SPDTNM.MUSICAL_FULL_KEY] = updated_df[SPDTNM.MUSICAL_KEY] + updated_df[SPDTNM.MUSICAL_MODE]
 
+    @staticmethod
+    def set_listen_history_dtypes(listen_history_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Converts the columns of a Listen History DataFrame to compact, typed columns:
+        categoricals for names and IDs (each repeated string is kept only once, and groupbys run on integer codes),
+        datetime64 (UTC) for the timestamp, int32 for milliseconds, and nullable booleans for flags.
+        Columns that are missing from the given DataFrame are ignored.
+
+        Parameters:
+            listen_history_df: Listen History DataFrame.
+
+        Returns:
+            Listen History DataFrame with the typed columns.
+        """
+        dtypes = {column: 'category' for column in SpotifyDataSet.CATEGORICAL_COLUMNS
+                  if column in listen_history_df.columns}
+
+        # Only whole columns can be narrowed, because a missing value requires a float column:
+        dtypes.update({column: 'int32' for column in SpotifyDataSet.INT32_COLUMNS
+                       if column in listen_history_df.columns and listen_history_df[column].notna().all()})
+
+        typed_df = listen_history_df.astype(dtypes)
+
+        for column in SpotifyDataSet.BOOLEAN_COLUMNS:
+            if column in typed_df.columns:
+                typed_df[column] = typed_df[column].map(SpotifyDataSet.BOOLEAN_VALUES_MAP).astype('boolean')
+
+        if SPDTNM.TIMESTAMP in typed_df.columns:
+            typed_df[SPDTNM.TIMESTAMP] = pd.to_datetime(typed_df[SPDTNM.TIMESTAMP], utc = True)
+
+        return typed_df
+
+    @staticmethod
+    def slice_listen_history(listen_history_df: pd.DataFrame,
+                             columns: list[str] = None,
+                             usernames: str | list[str] = None,
+                             from_timestamp: str | pd.Timestamp = None,
+                             to_timestamp: str | pd.Timestamp = None) -> pd.DataFrame:
+        """
+        Keeps only a slice of a typed Listen History DataFrame: the listens of the given users and time window,
+        projected on the given columns (like ``DB.get_listen_history_df`` does in the DB itself).
+
+        Parameters:
+            listen_history_df: Typed Listen History DataFrame (see :meth:`set_listen_history_dtypes`).
+
+            columns: Names of the columns to keep. Default: all the columns.
+
+            usernames: Username (or usernames) whose listens to keep. Default: all the users.
+
+            from_timestamp: Earliest time of the listens to keep (inclusive). A time without a timezone is taken
+                as UTC. Default: from the first listen.
+
+            to_timestamp: Latest time of the listens to keep (exclusive). Default: until the last listen.
+
+        Returns:
+            The sliced Listen History DataFrame.
+        """
+        is_kept = pd.Series(True, index = listen_history_df.index)
+
+        if usernames is not None:
+            usernames = [usernames] if isinstance(usernames, str) else list(usernames)
+            is_kept &= listen_history_df[SPDTNM.USERNAME].isin(usernames)
+
+        for timestamp, is_from in ((from_timestamp, True), (to_timestamp, False)):
+            if timestamp is None:
+                continue
+
+            timestamp = pd.Timestamp(timestamp)
+            timestamp = timestamp.tz_localize('UTC') if timestamp.tzinfo is None else timestamp.tz_convert('UTC')
+
+            is_kept &= listen_history_df[SPDTNM.TIMESTAMP].ge(timestamp) if is_from \
+                else listen_history_df[SPDTNM.TIMESTAMP].lt(timestamp)
+
+        sliced_df = listen_history_df[is_kept].reset_index(drop = True)
+
+        return sliced_df if columns is None else sliced_df[columns]
+
+    @staticmethod
+    def get_memory_usage_mb(df: pd.DataFrame) -> float:
+        """
+        Calculates the memory taken by a DataFrame, including the contents of its object (string) columns.
+
+        Parameters:
+            df: DataFrame to measure.
+
+        Returns:
+            Memory usage, in megabytes.
+        """
+        return df.memory_usage(index = True, deep = True).sum() / (1 << 20)
+
     # endregion Utility Methods
 
     # region Instantiation Logic
 
     def __init__(self,
                  db_handler: db.DB = None,
-                 data_dir: str = SPDTPATH.JSON_FILE_PATH):
+                 data_dir: str = SPDTPATH.JSON_FILE_PATH,
+                 json_read_workers: int = SPDTREAD.JSON_READ_WORKERS,
+                 json_filenames: list[str] = None,
+                 columns: list[str] = None,
+                 usernames: str | list[str] = None,
+                 from_timestamp: str | pd.Timestamp = None,
+                 to_timestamp: str | pd.Timestamp = None):
         """
         Initializes a dataset for managing the listen history and related data.
         This dataset can come either from Spotify JSON files, or from a given DB.
 
+        Only a slice of the listen history can be loaded (some of its columns, users or time). When fetching from
+        the DB, the slice is pushed down into its query, so only the slice's rows and columns are read.
+
         Parameters:
             db_handler: DB Handler object, from which to fetch the data. If supplied, fetches the data from it.
                 Otherwise, reads JSON files from the `data_dir` folder and calls the API to complete the missing data.
 
             data_dir: Directory of the JSON files to read, if `db_handler` was not supplied.
+
+            json_read_workers: Amount of worker processes for reading the JSON files in parallel
+                (None = one per CPU, 1 = read the files serially).
+
+            json_filenames: Names of specific JSON files to read from the `data_dir` folder. If None, reads all the
+                Listen History files in the folder.
+
+            columns: Names of the Listen History columns to load. Default: all the columns.
+
+            usernames: Username (or usernames) whose listens to load. Default: all the users.
+
+            from_timestamp: Earliest time of the listens to load (inclusive), e.g. '2021'. Default: from the first
+                listen.
+
+            to_timestamp: Latest time of the listens to load (exclusive), e.g. '2022'. Default: until the last listen.
         """
         self.__db_handler = db_handler
         self._data_dir = data_dir
+        self._json_read_workers = json_read_workers
+        self._json_filenames = json_filenames
+
+        # The slice of the listen history to load (by default, all of it):
+        self._columns = columns
+        self._usernames = usernames
+        self._from_timestamp = from_timestamp
+        self._to_timestamp = to_timestamp
+
+        # Aggregations of the listen history, calculated once per version of it:
+        self.__listen_history_version = 0
+        self.__aggregations_cache: dict[str, pd.DataFrame] = {}
+
         self.__listen_history_df: pd.DataFrame = self.__init_listen_history_df()
         self._tracks_df: pd.DataFrame = None
         self._albums_df: pd.DataFrame = None
@@ -251,14 +589,89 @@ class SpotifyDataSet:
             Listen History DataFrame.
         """
         if self.__db_handler is None:
-            self.__listen_history_df = SpotifyDataSet.collect_all_listen_history(folder_path = self._data_dir)
-            self.__listen_history_df = SpotifyDataSet.prepare_track_listen_history(self.__listen_history_df)
+            if self._json_read_workers == 1:
+                self.__listen_history_df = SpotifyDataSet.collect_all_listen_history(
+                    folder_path = self._data_dir,
+                    filenames = self._json_filenames)
+
+            else:
+                self.__listen_history_df = SpotifyDataSet.collect_all_listen_history_parallel(
+                    folder_path = self._data_dir,
+                    max_workers = self._json_read_workers,
+                    filenames = self._json_filenames)
+
+            self.__listen_history_df = SpotifyDataSet.set_listen_history_dtypes(
+                SpotifyDataSet.prepare_track_listen_history(self.__listen_history_df))
+
+            if self.__is_listen_history_sliced():
+                self.__listen_history_df = SpotifyDataSet.slice_listen_history(self.__listen_history_df,
+                                                                               self._columns,
+                                                                               self._usernames,
+                                                                               self._from_timestamp,
+                                                                               self._to_timestamp)
 
         else:
-            self.__listen_history_df = self.__db_handler.get_listen_history_df()
+            self.__listen_history_df = self.__read_listen_history_from_db()
+
+        log.write(log.LISTEN_HISTORY_MEMORY_USAGE.format(len(self.__listen_history_df),
+                                                         SpotifyDataSet.get_memory_usage_mb(
+                                                             self.__listen_history_df)))
+
+        self.__on_listen_history_changed()
 
         return self.__listen_history_df
 
+    def __on_listen_history_changed(self) -> None:
+        """
+        Advances the version of the listen history, and invalidates the aggregations that were cached for its
+        previous version. Must be called whenever the Listen History DataFrame changes.
+
+        Returns:
+            None.
+        """
+        self.__listen_history_version += 1
+        self.__aggregations_cache.clear()
+
+    def __is_listen_history_sliced(self) -> bool:
+        """Checks whether only a slice of the listen history (some of its columns, users or time) is loaded."""
+        return any(value is not None
+                   for value in (self._columns, self._usernames, self._from_timestamp, self._to_timestamp))
+
+    def __read_listen_history_from_db(self) -> pd.DataFrame:
+        """
+        Reads the Listen History from the DB, with typed columns.
+
+        When snapshots are on, reads the listen history from its snapshot file instead, as long as the snapshot is
+        up-to-date with the DB. Otherwise, reads it from the DB and rewrites the snapshot.
+        A slice of the listen history is always read from the DB (the snapshot contains the whole history).
+
+        Returns:
+            Listen History DataFrame.
+        """
+        if self.__is_listen_history_sliced():
+            return SpotifyDataSet.set_listen_history_dtypes(
+                self.__db_handler.get_listen_history_df(columns = self._columns,
+                                                        usernames = self._usernames,
+                                                        from_timestamp = self._from_timestamp,
+                                                        to_timestamp = self._to_timestamp))
+
+        is_snapshot_on = SPDTREAD.LISTEN_HISTORY_SNAPSHOT_ON and listen_history_snapshot.is_available()
+        listen_history_df = None
+
+        if is_snapshot_on:
+            data_version = self.__db_handler.get_data_version()
+            listen_history_df = listen_history_snapshot.read(SPDTPATH.LISTEN_HISTORY_SNAPSHOT_FILE_NAME, data_version)
+
+        if listen_history_df is None:
+            listen_history_df = SpotifyDataSet.set_listen_history_dtypes(self.__db_handler.get_listen_history_df())
+
+            if is_snapshot_on:
+                listen_history_snapshot.write(listen_history_df,
+                                              SPDTPATH.LISTEN_HISTORY_SNAPSHOT_FILE_NAME,
+                                              data_version)
+
+        return listen_history_df
+
     @property
     def listen_history_df(self) -> pd.DataFrame:
         """
@@ -275,6 +688,40 @@ class SpotifyDataSet:
 
         return self.__listen_history_df
 
+    @property
+    def listen_history_version(self) -> int:
+        """
+        Returns the version of the Listen History DataFrame, which advances whenever it changes.
+
+        Returns:
+            Version of the Listen History DataFrame.
+        """
+        return self.__listen_history_version
+
+    def get_listen_history_view(self, columns: list[str] = None) -> pd.DataFrame:
+        """
+        Returns a projection of the Listen History DataFrame on the given columns, without copying its data.
+
+        The returned DataFrame shares the data of its columns with the dataset, so it is read-only: it must not be
+        modified in-place (e.g. with ``inplace = True``, or by assigning values into existing columns). Adding new
+        columns to it, or deriving new DataFrames from it (filtering, grouping, sorting etc.), does not affect
+        the dataset.
+
+        Parameters:
+            columns: Names of the columns to project. If None, all the columns are projected.
+
+        Returns:
+            Listen History DataFrame with the given columns, sharing its data with the dataset.
+        """
+        listen_history_df = self.listen_history_df
+
+        if columns is None:
+            columns = listen_history_df.columns
+
+        # Building the DataFrame from the existing Series themselves (unlike ``df[columns]``, which copies them):
+        return pd.DataFrame({column: listen_history_df[column] for column in columns},
+                            copy = False)
+
     # endregion Instantiation Logic
 
     def get_listen_history_album_artist_aggd(self, aggfunc = pd.Series) -> pd.DataFrame:
@@ -298,7 +745,32 @@ class SpotifyDataSet:
         return self.listen_history_df.groupby([SPDTNM.USERNAME,
                                                SPDTNM.TIMESTAMP,
                                                SPDTNM.TRACK_KNOWN_ID],
-                                              as_index = False).agg(group_columns_map)
+                                              as_index = False,
+                                              observed = True).agg(group_columns_map)
+
+    def keep_listens_from(self, timestamps_by_username: dict[str, str]) -> None:
+        """
+        Removes from the listen history all the listens that are older than a given timestamp, per user.
+        Users that are missing from the given mapping keep all of their listens.
+
+        Listens in the exact given timestamp are kept, because other tracks might have been listened in the same
+        timestamp.
+
+        Parameters:
+            timestamps_by_username: Dictionary mapping each username to the earliest timestamp to keep for that user.
+
+        Returns:
+            None.
+        """
+        min_timestamps = pd.to_datetime(
+            self.__listen_history_df[SPDTNM.USERNAME].astype(object).map(timestamps_by_username),
+            utc = True)
+
+        self.__listen_history_df = self.__listen_history_df[
+            min_timestamps.isnull() | (self.__listen_history_df[SPDTNM.TIMESTAMP] >= min_timestamps)].reset_index(
+            drop = True)
+
+        self.__on_listen_history_changed()
 
     def add_track_known_id(self, known_tracks_ids_map: dict) -> None:
         """
@@ -323,6 +795,88 @@ class SpotifyDataSet:
                                         column = SPDTNM.TRACK_KNOWN_ID,
                                         value = column_known_track_id)
 
+        self.__on_listen_history_changed()
+
+    def agg_unique_tracks_by_listens(self, sort: bool = True) -> pd.DataFrame:
+        """
+        Returns the unique tracks (by Known Track ID) of the listen history, each track with its aggregated
+        total listens (count) and total listen time (sum), as well as its Album Artist ID and Name, & Album ID
+        and Name.
+
+        The aggregation is calculated once per version of the listen history and cached, so the returned DataFrame
+        is shared by all the callers and must not be modified in-place.
+
+        Parameters:
+            sort: Whether to sort the resulting DataFrame by total listen time (descending).
+
+        Returns:
+            DataFrame with the aggregated listen history by each track's listens count and total listen time.
+        """
+        cache_key = f"unique_tracks_by_listens_{'sorted' if sort else 'unsorted'}"
+        tracks_count = self.__aggregations_cache.get(cache_key)
+
+        if tracks_count is not None:
+            return tracks_count
+
+        if sort:
+            tracks_count = self.agg_unique_tracks_by_listens(sort = False).sort_values(by = SPDTNM.TOTAL_LISTEN_TIME,
+                                                                                        ascending = False)
+
+        else:
+            tracks_df = self.get_listen_history_view([SPDTNM.TRACK_KNOWN_ID,
+                                                      SPDTNM.TRACK_NAME,
+                                                      SPDTNM.ALBUM_KNOWN_ID,
+                                                      SPDTNM.ALBUM_NAME,
+                                                      SPDTNM.ALBUM_ARTIST_ID,
+                                                      SPDTNM.ALBUM_ARTIST_NAME,
+                                                      SPDTNM.MS_PLAYED])
+
+            # Removing all records of tracks that were played exactly 0 milliseconds:
+            tracks_df = tracks_df[tracks_df[SPDTNM.MS_PLAYED].ne(0) & tracks_df[SPDTNM.TRACK_KNOWN_ID].notna()]
+
+            listens_agg = tracks_df.groupby(SPDTNM.TRACK_KNOWN_ID,
+                                            observed = True)[SPDTNM.MS_PLAYED].agg(times_listened = 'size',
+                                                                                   total_listen_time = 'sum')
+
+            # Keeping the sums' type consistent, whether or not they exceed the 32 bits of the played milliseconds:
+            listens_agg = listens_agg.astype({SPDTNM.TOTAL_LISTEN_TIME: 'int64'})
+
+            # Each track's names and IDs are taken from its first listen (grouping the categorical columns
+            # with 'first' is much slower than this):
+            first_listens_df = tracks_df.drop_duplicates(subset = SPDTNM.TRACK_KNOWN_ID, keep = 'first').copy()
+
+            # Like grouping with 'first' does, a name or ID that is missing from a track's first listen is taken from
+            # the track's first listen that has it:
+            for column in [SPDTNM.TRACK_NAME,
+                           SPDTNM.ALBUM_KNOWN_ID,
+                           SPDTNM.ALBUM_NAME,
+                           SPDTNM.ALBUM_ARTIST_ID,
+                           SPDTNM.ALBUM_ARTIST_NAME]:
+                is_missing = first_listens_df[column].isna()
+
+                if is_missing.any():
+                    first_values = tracks_df.loc[tracks_df[column].notna(),
+                                                 [SPDTNM.TRACK_KNOWN_ID, column]].drop_duplicates(
+                        subset = SPDTNM.TRACK_KNOWN_ID, keep = 'first').set_index(SPDTNM.TRACK_KNOWN_ID)[column]
+
+                    first_listens_df.loc[is_missing, column] = first_listens_df.loc[
+                        is_missing, SPDTNM.TRACK_KNOWN_ID].map(first_values).astype(first_listens_df[column].dtype)
+
+            tracks_count = first_listens_df.join(listens_agg, on = SPDTNM.TRACK_KNOWN_ID)
+
+            tracks_count = tracks_count[[SPDTNM.TRACK_KNOWN_ID,
+                                         SPDTNM.TIMES_LISTENED,
+                                         SPDTNM.TOTAL_LISTEN_TIME,
+                                         SPDTNM.ALBUM_ARTIST_ID,
+                                         SPDTNM.ALBUM_ARTIST_NAME,
+                                         SPDTNM.ALBUM_KNOWN_ID,
+                                         SPDTNM.ALBUM_NAME,
+                                         SPDTNM.TRACK_NAME]].reset_index(drop = True)
+
+        self.__aggregations_cache[cache_key] = tracks_count
+
+        return tracks_count
+
     def get_distinct_tracks(self, sort: bool = True) -> pd.DataFrame:
         """
         Return distinct tracks, based on the KnownTrackID column (must make sure beforehand that it exists!).
@@ -6,17 +6,29 @@ import config
 class PATH:
     JSON_FILE_PATH = config.JSON_FILE_PATH
     JSON_FILE_PREFIX = config.JSON_FILE_PREFIX
+    LISTEN_HISTORY_SNAPSHOT_FILE_NAME = config.LISTEN_HISTORY_SNAPSHOT_FILE_NAME
+
+
+@dataclass(frozen = True)
+class READ:
+    JSON_CHUNK_SIZE = config.JSON_CHUNK_SIZE
+    JSON_READ_WORKERS = config.JSON_READ_WORKERS
+    LISTEN_HISTORY_SNAPSHOT_ON = config.LISTEN_HISTORY_SNAPSHOT_ON
 
 
 @dataclass(frozen = True)
 class SPDT:
     TIMESTAMP = 'time_stamp'
     MS_PLAYED = 'ms_played'
+    TRACK_DURATION_MS = 'track_duration_ms'
     ALBUM_ARTIST_NAME = 'album_artist_name'
     ALBUM_NAME = 'album_name'
     TRACK_NAME = 'track_name'
     TRACK_ID = 'track_id'
     TRACK_KNOWN_ID = 'track_known_id'
+    TRACK_LISTENED_ID = 'track_listened_id'
+    ALBUM_KNOWN_ID = 'album_known_id'
+    ALBUM_ARTIST_ID = 'album_artist_id'
     TRACK_URI = 'uri'
     EPISODE_NAME = 'episode_name'
     EPISODE_SHOW_NAME = 'episode_show_name'
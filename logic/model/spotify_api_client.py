@@ -1,8 +1,13 @@
 import pandas as pd
 import tekore as tk
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from logic.frontend import log
+from logic.frontend import metrics
 from logic import general_utils as ut
+from logic.model.api_cache import APICache, CACHE
+from logic.model.rate_limiter import RateLimiter
+import config
 
 
 @dataclass(frozen = True)
@@ -12,6 +17,27 @@ class AttrNames:
     CONN_COUNTRY = 'conn_country'
 
 
+class MeteredSender(tk.ExtendingSender):
+    """
+    Tekore sender that counts every request that is sent to the Spotify API (see ``metrics.API_REQUESTS``),
+    including each chunk of a chunked call and each page of a paging call.
+    """
+
+    def __init__(self, sender: tk.Sender = None):
+        """
+        Initializes the sender.
+
+        Parameters:
+            sender: Underlying sender that sends the requests. If None, a :class:`tk.SyncSender` is used.
+        """
+        super().__init__(sender)
+
+    def send(self, request: tk.Request):
+        metrics.increment(metrics.API_REQUESTS)
+
+        return self.sender.send(request)
+
+
 class SpotifyAPIClient:
     """
     Spotify API Client logic. uses "Tekore" module to call Spotify API.
@@ -23,20 +49,49 @@ class SpotifyAPIClient:
     AUTH_SCOPE = "user-library-read playlist-read-collaborative playlist-read-private user-read-recently-played"
     REDIRECT_URI = "http://localhost:8888/spotify/callback"
 
-    def __init__(self, token_keys: list[str]):
+    def __init__(self,
+                 token_keys: list[str],
+                 cache: APICache = None,
+                 max_workers: int = config.API_MAX_WORKERS):
+        """
+        Initializes the client. Nothing is requested from the Spotify API (not even the tokens) until the client
+        is first used, so working offline from the DB never blocks on the network or on user authorization.
+
+        Parameters:
+            token_keys: List containing the ClientID and ClientSecret, used as keys for generating the tokens.
+
+            cache: Local cache of the API's models. If supplied, tracks, albums, artists and audio features are
+                fetched from the API only when they are missing from the cache (or expired).
+
+            max_workers: Maximal amount of concurrent API requests, for operations that can only request a single
+                entity at a time (such as fetching each artist's albums).
+        """
         self.__token_keys = {'id': '', 'secret': ''}
         self.__app_token: tk.RefreshingToken = None
         self.__user_token: tk.RefreshingToken = None
         self.__redirect_uri: str = ''
+        self.__client: tk.Spotify = None
+        self.cache = cache
+        self.max_workers = max_workers
+        self.rate_limiter = RateLimiter(max_retries = config.API_MAX_RETRIES)
 
-        self.client = tk.Spotify(token = self.get_app_token(token_keys),
-                                 max_limits_on = True,
-                                 chunked_on = True)
-
-        self.__input_user_token(token_keys)
+        self.__set_token_keys(token_keys[0].strip(), token_keys[1].strip())
 
     # region Connection logic
 
+    @property
+    def client(self) -> tk.Spotify:
+        """
+        Returns the Tekore client for calling the Spotify API, connecting it (with a new App-Token) on first use.
+
+        Returns:
+            Tekore Spotify client.
+        """
+        if self.__client is None:
+            self.connect()
+
+        return self.__client
+
     @property
     def user_token(self) -> tk.RefreshingToken:
         """
@@ -123,16 +178,18 @@ class SpotifyAPIClient:
         return self.__app_token
 
     def connect(self) -> None:
-        self.client = tk.Spotify(token = self.get_app_token(),
-                                 max_limits_on = True,
-                                 chunked_on = True)
+        self.__client = tk.Spotify(token = self.get_app_token(),
+                                   sender = MeteredSender(),
+                                   max_limits_on = True,
+                                   chunked_on = True)
 
     def disconnect(self) -> None:
         if self.is_connected():
-            self.client.close()
+            self.__client.close()
+            self.__client = None
 
     def is_connected(self) -> bool:
-        return False if self.client is None else True
+        return False if self.__client is None else True
 
     def validate_connection(self) -> None:
         if not self.is_connected():
@@ -143,6 +200,42 @@ class SpotifyAPIClient:
 
     # endregion Connection logic
 
+    def __get_through_cache(self,
+                            entity_type: str,
+                            entities_ids: list[str],
+                            fetch_func) -> tk.model.ModelList:
+        """
+        Returns the models of the given entity type for the given IDs, taking them from the cache when possible,
+        and calling the API only for the IDs that are missing from the cache (or expired).
+
+        Parameters:
+            entity_type: Type of the desired models (one of the entity types in :class:`CACHE`).
+
+            entities_ids: Unique IDs of the desired models.
+
+            fetch_func: Function that gets a list of IDs and fetches their models from the API, in the same order.
+
+        Returns:
+            Tekore ModelList of the models, in the order of the given IDs.
+        """
+        if self.cache is None:
+            return fetch_func(entities_ids)
+
+        cached_models = self.cache.get_many(entity_type, entities_ids)
+        missing_ids = [entity_id for entity_id in entities_ids if entity_id not in cached_models]
+
+        log.write(message = log.FOUND_IN_API_CACHE.format(len(cached_models), len(entities_ids), entity_type))
+
+        if len(missing_ids) > 0:
+            # The API returns the models in the order of the requested IDs (or None for an ID that wasn't found).
+            # A relinked track has a different ID than the requested one, so the models are kept by the requested IDs:
+            fetched_models = dict(zip(missing_ids, fetch_func(missing_ids)))
+            self.cache.set_many(entity_type, fetched_models)
+            cached_models.update(fetched_models)
+
+        return tk.model.ModelList(cached_models.get(entity_id) for entity_id in entities_ids)
+
+    @metrics.timed
     def user_get_all_recently_played(self) -> None | list[tk.model.PlayHistory]:
         """
         **Does not work as intended.**
@@ -171,12 +264,13 @@ class SpotifyAPIClient:
 
             except tk.ServiceUnavailable as ex:
                 message = log.API_SERVICE_UNAVAILABLE.format(ex)
-                log.write(message = message)
+                log.write(message = message, level = log.ERROR)
 
                 raise tk.ServiceUnavailable(message = message, request = ex.request, response = ex.response)
 
         return all_recently_played
 
+    @metrics.timed
     def get_all_user_playlists(self, limit = 50):
         self.validate_connection()
 
@@ -189,6 +283,7 @@ class SpotifyAPIClient:
 
         return results
 
+    @metrics.timed
     def playlist_get_all_tracks(self,
                                 playlist_id: str,
                                 limit = MAX_TRACKS_FOR_PLAYLIST_ITEMS):
@@ -225,6 +320,7 @@ class SpotifyAPIClient:
 
         return result[0].items[0]
 
+    @metrics.timed
     def album_get_all_tracks(self,
                              album_id: str) -> list[tk.model.SimpleTrack]:
         """
@@ -247,10 +343,34 @@ class SpotifyAPIClient:
 
         return all_tracks
 
+    @staticmethod
+    def get_artist_album_tracks(artist_id: str,
+                                album: tk.model.SimpleAlbum,
+                                album_tracks: list[tk.model.SimpleTrack]) -> list[tk.model.SimpleTrack]:
+        """
+        Returns the tracks of an album that belong to a given artist's discography: all the album's tracks,
+        unless the artist only appears on the album, in which case only the artist's own tracks.
+
+        Parameters:
+            artist_id: ID of the artist.
+
+            album: One of the artist's albums, as fetched from the artist's albums (with its ``album_group``).
+
+            album_tracks: All the tracks of the album.
+
+        Returns:
+            List of the album's tracks that belong to the artist's discography.
+        """
+        if album.album_group != tk.model.AlbumGroup.appears_on:
+            return album_tracks
+
+        return [track for track in album_tracks if any(artist.id == artist_id for artist in track.artists)]
+
+    @metrics.timed
     def artists_get_all_tracks(self,
                                artists_ids: str | set | list | pd.Series,
                                album_groups: list[str | tk.model.AlbumGroup] = None) -> dict[
-        str, list[tuple[tk.model.SimpleAlbum, list[tk.model.FullTrack]]]]:
+        str, list[tuple[tk.model.SimpleAlbum, list[tk.model.SimpleTrack]]]]:
         """
         For each Artist ID in the given collection, fetches all of their **Tracks** from the API.
 
@@ -272,10 +392,12 @@ class SpotifyAPIClient:
                 Default: ['album', 'appears_on'].
 
         Returns:
-            dict[str, list[tuple[tk.model.SimpleAlbum, list[tk.model.FullTrack]]]]:
-                Dictionary of lists of tuples of Full[Model] objects, as follows:
+            dict[str, list[tuple[tk.model.SimpleAlbum, list[tk.model.SimpleTrack]]]]:
+                Dictionary of lists of tuples, as follows:
                 The dict's keys are the artists' IDs. For each artist, the dict's value is a list of tuples, each tuple
-                containing two items: [0] = FullAlbum object, [1] = list of FullTracks that belong to that album.
+                containing two items: [0] = SimpleAlbum object (with its ``album_group``), [1] = list of the
+                SimpleTracks of that album that belong to the artist's discography
+                (see :meth:`get_artist_album_tracks`).
 
         Raises:
             tk.ServiceUnavailable: if Spotify's API service is unavailable.
@@ -292,7 +414,9 @@ class SpotifyAPIClient:
                 # Calling the API to get all albums for each given Artist ID:
                 all_artists_albums_dict = self.artists_get_all_albums(artists_ids = unique_artists_list,
                                                                       album_groups = album_groups)
-                all_albums_ids = [album.id for albums_list in all_artists_albums_dict.values() for album in albums_list]
+                all_albums_ids = ut.get_unique_vals_list([album.id
+                                                          for albums_list in all_artists_albums_dict.values()
+                                                          for album in albums_list])
 
                 log.write(message = log.FETCHING_ALBUMS_ATTRS.format(len(all_albums_ids)))
 
@@ -301,44 +425,74 @@ class SpotifyAPIClient:
 
                 log.write(message = log.ALBUMS_ATTRS_FETCHED.format(len(all_albums_ids)))
 
-                for album in all_full_albums:
-                    for artist in album.artists:
-                        if artist.id in unique_artists_list:
-                            if all_artists_tracks.get(artist.id) is None:
-                                all_artists_tracks[artist.id] = []
+                all_albums_tracks = {}
+
+                for album in filter(None, all_full_albums):
+                    album_tracks_paging = album.tracks
+                    album_tracks_list = album_tracks_paging.items
 
-                            album_tracks_paging = album.tracks
-                            album_tracks_list = album_tracks_paging.items
+                    while album_tracks_paging.next is not None:
+                        album_tracks_paging = self.client.next(album_tracks_paging)
+                        album_tracks_list.extend(album_tracks_paging.items)
 
-                            while album_tracks_paging.next is not None:
-                                album_tracks_paging = self.client.next(album_tracks_paging)
-                                album_tracks_list.extend(album_tracks_paging.items)
+                    all_albums_tracks[album.id] = album_tracks_list
 
-                            # It would have been best to put the tracks list as the `tracks` property of `albums`,
-                            # but unfortunately `tracks` is a Paging object and can't be replaced with a list object.
-                            # The `tracks` Paging object might not contain all the tracks
-                            # (if their amount exceeds the limit), and I want to have all of them without needing to
-                            # call the API's `next()` method.
-                            # Thus, I had to save both objects inside a tuple:
-                            artist_album = (album, album_tracks_list)
-                            all_artists_tracks[artist.id].append(artist_album)
+                # The albums are attributed to the artists they were fetched for (rather than to the albums' own
+                # artists), so albums that an artist only appears on are kept as well:
+                for artist_id, artist_albums in all_artists_albums_dict.items():
+                    all_artists_tracks[artist_id] = [
+                        (album, SpotifyAPIClient.get_artist_album_tracks(artist_id, album, all_albums_tracks[album.id]))
+                        for album in artist_albums if album.id in all_albums_tracks]
 
                 log.write(message = log.ARTISTS_TRACKS_ATTRS_FETCHED.format(len(unique_artists_list)))
 
             except tk.ServiceUnavailable as ex:
                 message = log.API_SERVICE_UNAVAILABLE.format(ex)
-                log.write(message = message)
+                log.write(message = message, level = log.ERROR)
 
                 raise tk.ServiceUnavailable(message = message, request = ex.request, response = ex.response)
 
             except tk.Unauthorised as ex:
                 message = log.API_SERVICE_UNAUTHORIZED.format(ex)
-                log.write(message = message)
+                log.write(message = message, level = log.ERROR)
 
                 raise tk.Unauthorised(message = message, request = ex.request, response = ex.response)
 
         return all_artists_tracks
 
+    def __artist_get_all_albums(self,
+                                artist_id: str,
+                                include_album_groups: list[str | tk.model.AlbumGroup],
+                                user_token: tk.RefreshingToken) -> list[tk.model.SimpleAlbum]:
+        """
+        Fetches all the **Albums** of a single artist from the API, through the shared rate limiter.
+        Meant to be run by a worker thread.
+
+        Parameters:
+            artist_id: ID of the desired artist.
+
+            include_album_groups: List with the desired types of albums to fetch.
+
+            user_token: User token to send the requests with (the token set by ``token_as`` is not shared with
+                other threads).
+
+        Returns:
+            List of all the artist's albums.
+        """
+        with self.client.token_as(user_token):
+            # client.artist_albums() is not chunked, meaning the results are paged.
+            artist_albums_paging = self.rate_limiter.call(self.client.artist_albums,
+                                                          artist_id = artist_id,
+                                                          include_groups = include_album_groups)
+            artist_albums = artist_albums_paging.items
+
+            while artist_albums_paging.next is not None:
+                artist_albums_paging = self.rate_limiter.call(self.client.next, artist_albums_paging)
+                artist_albums.extend(artist_albums_paging.items)
+
+        return artist_albums
+
+    @metrics.timed
     def artists_get_all_albums(self,
                                artists_ids: str | set | list | pd.Series,
                                album_groups: list[str | tk.model.AlbumGroup] = None) -> dict[
@@ -346,12 +500,13 @@ class SpotifyAPIClient:
         """
         For each Artist ID in the given collection, fetches all of their **Albums** from the API.
 
-        **Note:** This method is **very inefficient** and can **take a very long time to finish** if called on a large
-        number of artists' IDs.
+        **Note:** This method can **take a long time to finish** if called on a large number of artists' IDs.
 
         This is because the Spotify API only allows to get the albums of a **single** artist in a single API call.
         At the time of development, there is no option to batch-fetch the albums of multiple artists in the same call,
-        and it took me 20 minutes to fetch the albums of 6700 artists.
+        and it took me 20 minutes to fetch the albums of 6700 artists one by one.
+        For this reason, the artists are spread across ``max_workers`` concurrent threads, which share a single
+        rate limiter.
 
         Parameters:
             artists_ids: A single ID or multiple IDs of all the desired artists.
@@ -370,38 +525,40 @@ class SpotifyAPIClient:
                                                                               tk.model.AlbumGroup.appears_on]
         unique_artists_list = ut.get_unique_vals_list(artists_ids)
         all_artists_albums = {}
+        user_token = self.user_token
 
-        with self.client.token_as(self.user_token):
+        with self.client.token_as(user_token):
             log.write(message = log.FETCHING_ARTISTS_ALBUMS_ATTRS.format(len(unique_artists_list)))
 
             try:
-                # Calling the API to get all albums for each given Artist ID:
-                for artist in unique_artists_list:
-                    # client.artist_albums() is not chunked, meaning the results are paged.
-                    artist_albums_paging = self.client.artist_albums(artist_id = artist,
-                                                                     include_groups = include_album_groups)
-                    all_artists_albums[artist] = artist_albums_paging.items
+                # Calling the API to get all albums for each given Artist ID.
+                # ``map`` returns the results in the order of the given artists, regardless of which thread finished
+                # first:
+                with ThreadPoolExecutor(max_workers = self.max_workers) as executor:
+                    artists_albums = executor.map(lambda artist_id: self.__artist_get_all_albums(
+                        artist_id = artist_id,
+                        include_album_groups = include_album_groups,
+                        user_token = user_token), unique_artists_list)
 
-                    while artist_albums_paging.next is not None:
-                        artist_albums_paging = self.client.next(artist_albums_paging)
-                        all_artists_albums[artist].extend(artist_albums_paging.items)
+                    all_artists_albums = dict(zip(unique_artists_list, artists_albums))
 
                 log.write(message = log.ARTISTS_ALBUMS_ATTRS_FETCHED.format(len(unique_artists_list)))
 
             except tk.ServiceUnavailable as ex:
                 message = log.API_SERVICE_UNAVAILABLE.format(ex)
-                log.write(message = message)
+                log.write(message = message, level = log.ERROR)
 
                 raise tk.ServiceUnavailable(message = message, request = ex.request, response = ex.response)
 
             except tk.Unauthorised as ex:
                 message = log.API_SERVICE_UNAUTHORIZED.format(ex)
-                log.write(message = message)
+                log.write(message = message, level = log.ERROR)
 
                 raise tk.Unauthorised(message = message, request = ex.request, response = ex.response)
 
         return all_artists_albums
 
+    @metrics.timed
     def get_full_tracks(self, tracks_ids: str | set | list | pd.Series) -> tk.model.ModelList[tk.model.FullTrack]:
         """
         For each Track ID in the given collection, fetches its :class:`tk.model.FullTrack` object from the API.
@@ -428,25 +585,29 @@ class SpotifyAPIClient:
                 # Calling the API to get FullTracks for the given tracks' ID's.
                 # Parameter `market` is needed here, to get the Linked Track for each track.
                 # client.tracks() is chunked, meaning a single call returns *all* the desired results without paging.
-                full_tracks = self.client.tracks(track_ids = unique_tracks_list,
-                                                 market = self.client.current_user().country)
+                full_tracks = self.__get_through_cache(
+                    entity_type = CACHE.TRACK,
+                    entities_ids = unique_tracks_list,
+                    fetch_func = lambda ids: self.client.tracks(track_ids = ids,
+                                                                market = self.client.current_user().country))
 
                 log.write(message = log.TRACKS_ATTRS_FETCHED.format(len(full_tracks)))
 
             except tk.ServiceUnavailable as ex:
                 message = log.API_SERVICE_UNAVAILABLE.format(ex)
-                log.write(message = message)
+                log.write(message = message, level = log.ERROR)
 
                 raise tk.ServiceUnavailable(message = message, request = ex.request, response = ex.response)
 
             except tk.Unauthorised as ex:
                 message = log.API_SERVICE_UNAUTHORIZED.format(ex)
-                log.write(message = message)
+                log.write(message = message, level = log.ERROR)
 
                 raise tk.Unauthorised(message = message, request = ex.request, response = ex.response)
 
         return full_tracks
 
+    @metrics.timed
     def get_full_artists(self, artists_ids: str | set | list | pd.Series) -> tk.model.ModelList[tk.model.FullArtist]:
         """
         For each Artist ID in the given collection, fetches its :class:`tk.model.FullArtist` object from the API.
@@ -471,24 +632,28 @@ class SpotifyAPIClient:
             try:
                 # Calling the API to get FullArtists for the given artists' ID's.
                 # client.artists() is chunked, meaning a single call returns *all* the desired results without paging.
-                full_artists = self.client.artists(artist_ids = unique_artists_list)
+                full_artists = self.__get_through_cache(
+                    entity_type = CACHE.ARTIST,
+                    entities_ids = unique_artists_list,
+                    fetch_func = lambda ids: self.client.artists(artist_ids = ids))
 
                 log.write(message = log.ARTISTS_ATTRS_FETCHED.format(len(full_artists)))
 
             except tk.ServiceUnavailable as ex:
                 message = log.API_SERVICE_UNAVAILABLE.format(ex)
-                log.write(message = message)
+                log.write(message = message, level = log.ERROR)
 
                 raise tk.ServiceUnavailable(message = message, request = ex.request, response = ex.response)
 
             except tk.Unauthorised as ex:
                 message = log.API_SERVICE_UNAUTHORIZED.format(ex)
-                log.write(message = message)
+                log.write(message = message, level = log.ERROR)
 
                 raise tk.Unauthorised(message = message, request = ex.request, response = ex.response)
 
         return full_artists
 
+    @metrics.timed
     def get_full_albums(self, albums_ids: str | set | list | pd.Series) -> tk.model.ModelList[tk.model.FullAlbum]:
         """
         For each Album ID in the given collection, fetches its :class:`tk.model.FullAlbum` object from the API.
@@ -514,24 +679,28 @@ class SpotifyAPIClient:
                 # Calling the API to get FullAlbums for the given albums' ID's.
                 # Parameter `market` is not sent, in order to get the Available Markets for each album.
                 # client.albums() is chunked, meaning a single call returns *all* the desired results without paging.
-                full_albums = self.client.albums(album_ids = unique_albums_list)
+                full_albums = self.__get_through_cache(
+                    entity_type = CACHE.ALBUM,
+                    entities_ids = unique_albums_list,
+                    fetch_func = lambda ids: self.client.albums(album_ids = ids))
 
                 log.write(message = log.ALBUMS_ATTRS_FETCHED.format(len(full_albums)))
 
             except tk.ServiceUnavailable as ex:
                 message = log.API_SERVICE_UNAVAILABLE.format(ex)
-                log.write(message = message)
+                log.write(message = message, level = log.ERROR)
 
                 raise tk.ServiceUnavailable(message = message, request = ex.request, response = ex.response)
 
             except tk.Unauthorised as ex:
                 message = log.API_SERVICE_UNAUTHORIZED.format(ex)
-                log.write(message = message)
+                log.write(message = message, level = log.ERROR)
 
                 raise tk.Unauthorised(message = message, request = ex.request, response = ex.response)
 
         return full_albums
 
+    @metrics.timed
     def get_tracks_audio_features(self,
                                   tracks_ids: str | set | list | pd.Series) -> tk.model.ModelList[tk.model.AudioFeatures]:
         """
@@ -555,24 +724,28 @@ class SpotifyAPIClient:
                 # Calling the API to get Audio Features for the given tracks' ID's.
                 # client.tracks_audio_features() is chunked, meaning a single call returns *all* the desired results
                 # without paging.
-                all_tracks_features = self.client.tracks_audio_features(track_ids = unique_tracks_list)
+                all_tracks_features = self.__get_through_cache(
+                    entity_type = CACHE.AUDIO_FEATURES,
+                    entities_ids = unique_tracks_list,
+                    fetch_func = lambda ids: self.client.tracks_audio_features(track_ids = ids))
 
                 log.write(message = log.AUDIO_FEATURES_ATTRS_FETCHED.format(len(all_tracks_features)))
 
             except tk.ServiceUnavailable as ex:
                 message = log.API_SERVICE_UNAVAILABLE.format(ex)
-                log.write(message = message)
+                log.write(message = message, level = log.ERROR)
 
                 raise tk.ServiceUnavailable(message = message, request = ex.request, response = ex.response)
 
             except tk.Unauthorised as ex:
                 message = log.API_SERVICE_UNAUTHORIZED.format(ex)
-                log.write(message = message)
+                log.write(message = message, level = log.ERROR)
 
                 raise tk.Unauthorised(message = message, request = ex.request, response = ex.response)
 
         return all_tracks_features
 
+    @metrics.timed
     def get_specific_audio_feature(self,
                                    tracks_ids: list[str],
                                    audio_feature: str):
@@ -617,6 +790,7 @@ class SpotifyAPIClient:
 
         return result
 
+    @metrics.timed
     def get_tracks_audio_analysis(self,
                                   tracks_ids: str | set | list | pd.Series) -> None | tk.model.AudioAnalysis | list[
         tk.model.AudioAnalysis]:
@@ -651,6 +825,7 @@ class SpotifyAPIClient:
 
         return tracks_analysis
 
+    @metrics.timed
     def get_track_known_id_map(self,
                                full_tracks: tk.model.ModelList[tk.model.FullTrack],
                                tracks: pd.Series = None) -> dict:
@@ -688,6 +863,6 @@ class SpotifyAPIClient:
                         tracks_known_ids_map[track.id] = track.id
 
         except tk.ServiceUnavailable as ex:
-            log.write(log.API_SERVICE_UNAVAILABLE.format(ex))
+            log.write(log.API_SERVICE_UNAVAILABLE.format(ex), level = log.ERROR)
 
         return tracks_known_ids_map
@@ -1,11 +1,117 @@
-from logic.app_logic import Logic as lg
-from logic.frontend import plotting as plt
+import argparse
+from logic.frontend import log, metrics
 import config
 
-# Initializing the application:
-my_lg = lg(listen_history_from = config.LISTEN_HISTORY_SRC)
+# Heavy dependencies (pandas, Tekore, matplotlib) are imported only by the commands that need them, so that
+# data-only commands start faster and don't require a display.
 
-plt.top_artists_by_listen_count(my_lg)
-plt.top_artists_by_total_listen_time(my_lg)
-plt.top_artists_albums_completion_percentage(my_lg)
-plt.top_tracks_audio_features(my_lg)
+COMMAND_PLOT = 'plot'
+COMMAND_REFRESH = 'refresh'
+COMMAND_EXPORT_CSV = 'export-csv'
+COMMAND_ADVISE_INDEXES = 'advise-indexes'
+
+
+def plot(args: argparse.Namespace) -> None:
+    """
+    Loads the listen history (as configured in ``config.LISTEN_HISTORY_SRC``) and displays the plots.
+    Only the listens of the requested users and time window are loaded (when importing from the JSON files, all the
+    listens are imported into the DB first).
+    """
+    from logic.app_logic import Logic as lg
+    from logic.frontend import plotting as plt
+
+    my_lg = lg(listen_history_from = config.LISTEN_HISTORY_SRC,
+               usernames = args.username,
+               from_timestamp = args.from_time,
+               to_timestamp = args.to_time)
+
+    plt.top_artists_by_listen_count(my_lg)
+    plt.top_artists_by_total_listen_time(my_lg)
+    plt.top_artists_albums_completion_percentage(my_lg)
+    plt.top_tracks_audio_features(my_lg)
+
+
+def refresh(args: argparse.Namespace) -> None:
+    """Imports the listen history from the JSON files into the DB, without displaying anything."""
+    from logic.app_logic import Logic as lg
+
+    lg(listen_history_from = args.source)
+
+
+def export_csv(args: argparse.Namespace) -> None:
+    """Exports the listen history from the DB into a CSV file."""
+    from logic.app_logic import Logic as lg
+
+    lg(listen_history_from = lg.HISTORY_FROM_DB).save_listen_history_to_csv(args.file_name)
+
+
+def advise_indexes(args: argparse.Namespace) -> None:
+    """Reports the DB's planned indexes that aren't used, and the app's queries that read whole tables."""
+    from logic.app_logic import Logic as lg
+    from logic.db import index_advisor
+    from logic.db.db import DB
+
+    db = DB()
+    index_advisor.advise(db, lg.ENRICHMENT_STAGES_EXISTING_KEYS, include_writes = args.include_writes)
+    db.close()
+
+
+def get_args_parser() -> argparse.ArgumentParser:
+    """
+    Builds the parser of the command-line arguments.
+
+    Returns:
+        The arguments parser.
+    """
+    parser = argparse.ArgumentParser(
+        description = "Spotistics: Analysis & Statistics of your Spotify Listening History")
+    parser.set_defaults(func = plot, username = None, from_time = None, to_time = None)
+    commands = parser.add_subparsers(title = 'commands')
+
+    plot_parser = commands.add_parser(COMMAND_PLOT,
+                                      help = "Display the plots (default).")
+    plot_parser.add_argument('--username',
+                             action = 'append',
+                             help = "Plot only the listens of this user (can be given multiple times).")
+    plot_parser.add_argument('--from',
+                             dest = 'from_time',
+                             help = "Plot only the listens from this time on (e.g. '2021' or '2021-03-01').")
+    plot_parser.add_argument('--to',
+                             dest = 'to_time',
+                             help = "Plot only the listens before this time (e.g. '2022').")
+    plot_parser.set_defaults(func = plot)
+
+    refresh_parser = commands.add_parser(COMMAND_REFRESH,
+                                         help = "Import the listen history JSON files into the DB.")
+    refresh_parser.add_argument('--source',
+                                choices = ['json', 'json_incremental'],
+                                default = 'json_incremental',
+                                help = "'json' imports all the files, 'json_incremental' only the new listens.")
+    refresh_parser.set_defaults(func = refresh)
+
+    export_csv_parser = commands.add_parser(COMMAND_EXPORT_CSV,
+                                            help = "Export the listen history from the DB into a CSV file.")
+    export_csv_parser.add_argument('--file-name',
+                                   default = 'all_tracks_raw_{0}.csv',
+                                   help = "Name of the CSV file ('{0}' is replaced with the current time).")
+    export_csv_parser.set_defaults(func = export_csv)
+
+    advise_indexes_parser = commands.add_parser(COMMAND_ADVISE_INDEXES,
+                                                help = "Report full table scans in the app's queries on the DB.")
+    advise_indexes_parser.add_argument('--include-writes',
+                                       action = 'store_true',
+                                       help = "Also check the refreshing of the known listen history (rolled back).")
+    advise_indexes_parser.set_defaults(func = advise_indexes)
+
+    return parser
+
+
+# The guard is needed, because reading the JSON files in parallel spawns worker processes which re-import this module:
+if __name__ == '__main__':
+    parsed_args = get_args_parser().parse_args()
+    parsed_args.func(parsed_args)
+
+    report_file_path = metrics.write_report()
+
+    if report_file_path is not None:
+        log.write(log.FILE_WRITTEN.format(report_file_path))
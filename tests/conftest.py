@@ -0,0 +1,18 @@
+import os
+import pytest
+from logic.db import db_names as SPDBNM
+from logic.db.db import DB
+
+SCHEMA_FILE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'logic', 'db', 'my_spotify_data_db_scheme.sql')
+
+
+@pytest.fixture
+def empty_db(monkeypatch) -> DB:
+    """An in-memory DB, built from the app's schema."""
+    monkeypatch.setattr(SPDBNM, 'DB_FILE_NAME', ':memory:')
+    monkeypatch.setattr(SPDBNM, 'DB_SCHEMA_FILE_NAME', SCHEMA_FILE_PATH)
+
+    db = DB()
+    yield db
+    db.close()
@@ -0,0 +1,144 @@
+import sqlite3
+import pytest
+from collections.abc import Iterator
+from logic.db import db_names as SPDBNM
+
+
+def _save_album(db, artist_id: str, album_id: str, album_group: str, tracks_ids: list[str]) -> None:
+    db.insert_artists_albums({SPDBNM.ARTISTS_ALBUMS.ARTIST_ID  : artist_id,
+                              SPDBNM.ARTISTS_ALBUMS.ALBUM_ID   : album_id,
+                              SPDBNM.ARTISTS_ALBUMS.ALBUM_GROUP: album_group})
+    db.insert_albums_tracks([{SPDBNM.ALBUMS_TRACKS.ALBUM_ID: album_id,
+                              SPDBNM.ALBUMS_TRACKS.TRACK_ID: track_id} for track_id in tracks_ids])
+    db.insert_tracks_artists([{SPDBNM.TRACKS_ARTISTS.TRACK_ID : track_id,
+                               SPDBNM.TRACKS_ARTISTS.ARTIST_ID: artist_id} for track_id in tracks_ids])
+
+
+def _link_tracks(db, links: list[tuple[str, str]]) -> None:
+    db.insert_linked_tracks([{SPDBNM.LINKED_TRACKS.FROM_ID    : linked_from_id,
+                              SPDBNM.LINKED_TRACKS.RELINKED_ID: relinked_id} for linked_from_id, relinked_id in links])
+
+
+def _get_discographies_tracks(db, artists_ids: list[str], album_groups: list[str]) -> set[tuple[str, str, str]]:
+    discographies_df = db.get_artists_discographies_tracks(artists_ids, album_groups)
+
+    return set(discographies_df.itertuples(index = False, name = None))
+
+
+def test_discographies_tracks_exclude_relinked_tracks_obsolete_ids(empty_db):
+    _save_album(empty_db, 'artist', 'album', 'album', ['known1', 'known2'])
+    # The listened (obsolete) track was relinked to 'known1', and was linked to the album it was listened from:
+    empty_db.insert_albums_tracks({SPDBNM.ALBUMS_TRACKS.ALBUM_ID: 'album',
+                                   SPDBNM.ALBUMS_TRACKS.TRACK_ID: 'obsolete'})
+    _link_tracks(empty_db, [('obsolete', 'known1'), ('known1', 'known1'), ('known2', 'known2')])
+
+    assert _get_discographies_tracks(empty_db, ['artist'], ['album']) == {('artist', 'album', 'known1'),
+                                                                          ('artist', 'album', 'known2')}
+
+
+def test_discographies_tracks_keep_tracks_that_were_not_relinked(empty_db):
+    _save_album(empty_db, 'artist', 'album', 'album', ['track1', 'track2'])
+    _link_tracks(empty_db, [('track1', 'track1')])
+
+    assert _get_discographies_tracks(empty_db, ['artist'], ['album']) == {('artist', 'album', 'track1'),
+                                                                          ('artist', 'album', 'track2')}
+
+
+def test_discographies_tracks_of_appears_on_albums_are_the_artists_tracks(empty_db):
+    _save_album(empty_db, 'artist', 'compilation', SPDBNM.ARTISTS_ALBUMS.ALBUM_GROUP_APPEARS_ON, ['track1'])
+    _save_album(empty_db, 'other_artist', 'compilation', 'album', ['track2'])
+
+    assert _get_discographies_tracks(empty_db,
+                                     ['artist'],
+                                     ['album', SPDBNM.ARTISTS_ALBUMS.ALBUM_GROUP_APPEARS_ON]) == {
+        ('artist', 'compilation', 'track1')}
+
+
+def _save_named_rows(db, table_name: str, id_column_name: str, ids: list[str]) -> None:
+    db.cursor.executemany(f"INSERT INTO {table_name} ({id_column_name}, name) VALUES (?, ?);",
+                          [(row_id, row_id) for row_id in ids])
+
+
+def _save_listens(db, listens: list[tuple[str, str]]) -> None:
+    db.cursor.executemany(f"""INSERT INTO {SPDBNM.TRACKS_LISTEN_HISTORY.TBL_NAME}
+                                  ({SPDBNM.TRACKS_LISTEN_HISTORY.USERNAME},
+                                   {SPDBNM.TRACKS_LISTEN_HISTORY.TIMESTAMP},
+                                   {SPDBNM.TRACKS_LISTEN_HISTORY.TRACK_ID})
+                              VALUES ('user', ?, ?);""", listens)
+
+
+def _get_known_listen_history_rows(db, table_name: str) -> list[tuple]:
+    return db.cursor.execute(f"""SELECT {SPDBNM.KNOWN_LISTEN_HISTORY.TIMESTAMP},
+                                        {SPDBNM.KNOWN_LISTEN_HISTORY.TRACK_LISTENED_ID},
+                                        {SPDBNM.KNOWN_LISTEN_HISTORY.ALBUM_ARTIST_ID}
+                                 FROM {table_name}
+                                 ORDER BY 1, 2, 3;""").fetchall()
+
+
+def test_albums_listened_tracks_ids_are_the_tracks_linked_to_the_albums_tracks(empty_db):
+    _save_album(empty_db, 'artist', 'album', 'album', ['known1', 'known2'])
+    _save_album(empty_db, 'artist', 'other_album', 'album', ['known3'])
+    _link_tracks(empty_db, [('obsolete', 'known1'), ('known1', 'known1'), ('known3', 'known3')])
+
+    assert empty_db.get_albums_listened_tracks_ids(['album']) == {'obsolete', 'known1'}
+
+
+def test_known_listen_history_refresh_of_tracks_only(empty_db):
+    _save_named_rows(empty_db, SPDBNM.ARTISTS.TBL_NAME, SPDBNM.ARTISTS.ID, ['artist1', 'artist2', 'artist3'])
+    _save_named_rows(empty_db, SPDBNM.TRACKS.TBL_NAME, SPDBNM.TRACKS.ID, ['track1', 'track2'])
+    _save_named_rows(empty_db, SPDBNM.ALBUMS.TBL_NAME, SPDBNM.ALBUMS.ID, ['album1', 'album2'])
+    _save_album(empty_db, 'artist1', 'album1', 'album', ['track1'])
+    _save_album(empty_db, 'artist2', 'album2', 'album', ['track2'])
+    _link_tracks(empty_db, [('obsolete1', 'track1'), ('track2', 'track2')])
+    _save_listens(empty_db, [('2020-01-01 00:00:00', 'obsolete1'), ('2020-01-02 00:00:00', 'track2')])
+    empty_db.refresh_known_listen_history()
+
+    # A newly fetched discography adds an album artist to 'album1', and also makes 'artist2' an album artist of
+    # 'album2' (but the listens of 'album2' are not refreshed):
+    _save_album(empty_db, 'artist3', 'album1', 'album', ['track1'])
+    _save_album(empty_db, 'artist3', 'album2', 'album', ['track2'])
+    empty_db.refresh_known_listen_history(tracks_ids = empty_db.get_albums_listened_tracks_ids(['album1']))
+
+    assert _get_known_listen_history_rows(empty_db, SPDBNM.KNOWN_LISTEN_HISTORY.TBL_NAME) == [
+        ('2020-01-01 00:00:00', 'obsolete1', 'artist1'),
+        ('2020-01-01 00:00:00', 'obsolete1', 'artist3'),
+        ('2020-01-02 00:00:00', 'track2', 'artist2')]
+
+
+def _get_indexes_names(db, table_name: str) -> set[str]:
+    return {index_name for (index_name,) in db.cursor.execute("""SELECT name
+                                                                 FROM sqlite_master
+                                                                 WHERE type = 'index' AND tbl_name = ?;""",
+                                                              (table_name,))}
+
+
+def _get_listens_failing_mid_load(failing_row: tuple) -> Iterator[tuple]:
+    yield 'user', '2020-01-01 00:00:00', 'track1'
+    yield 'user', '2020-01-02 00:00:00', 'track2'
+
+    if failing_row is None:
+        raise ValueError('The rows could not be generated.')
+
+    yield failing_row
+
+
+@pytest.mark.parametrize('failing_row, expected_error', [(None, ValueError),
+                                                         (('user', '2020-01-03 00:00:00', None),
+                                                          sqlite3.IntegrityError)])
+def test_failed_bulk_insert_is_rolled_back(empty_db, failing_row, expected_error):
+    table_name = SPDBNM.TRACKS_LISTEN_HISTORY.TBL_NAME
+    indexes_names = _get_indexes_names(empty_db, table_name)
+    cache_size = empty_db.cursor.execute("PRAGMA cache_size;").fetchone()[0]
+
+    with pytest.raises(expected_error):
+        empty_db.bulk_insert(table_name = table_name,
+                             rows = _get_listens_failing_mid_load(failing_row),
+                             columns_names = [SPDBNM.TRACKS_LISTEN_HISTORY.USERNAME,
+                                              SPDBNM.TRACKS_LISTEN_HISTORY.TIMESTAMP,
+                                              SPDBNM.TRACKS_LISTEN_HISTORY.TRACK_ID],
+                             rebuild_indexes = True)
+
+    assert not empty_db.connection.in_transaction
+    assert empty_db.cursor.execute(f"SELECT COUNT(*) FROM {table_name};").fetchone()[0] == 0
+    assert _get_indexes_names(empty_db, table_name) == indexes_names
+    assert empty_db.cursor.execute("PRAGMA cache_size;").fetchone()[0] == cache_size
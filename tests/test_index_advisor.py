@@ -0,0 +1,29 @@
+import pytest
+from logic.db import index_advisor
+
+
+@pytest.mark.parametrize('index_name', list(index_advisor.INDEXED_ACCESS_PATHS))
+def test_planned_index_serves_its_access_path(empty_db, index_name):
+    statement, params = index_advisor.INDEXED_ACCESS_PATHS[index_name]
+
+    plan = index_advisor.explain_query_plan(empty_db.connection, statement, params)
+
+    assert any(index_name in detail for detail in plan), plan
+
+
+def test_planned_indexes_exist_in_schema(empty_db):
+    schema_indexes = {index_name for (index_name,) in empty_db.connection.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL;")}
+
+    assert set(index_advisor.INDEXED_ACCESS_PATHS) <= schema_indexes
+
+
+def test_check_indexed_access_paths_reports_all_indexes_as_used(empty_db):
+    assert all(index_advisor.check_indexed_access_paths(empty_db).values())
+
+
+def test_dropped_index_is_reported_as_unused(empty_db):
+    index_name = 'idx_known_listen_history_username_time_stamp'
+    empty_db.connection.execute(f"DROP INDEX {index_name};")
+
+    assert not index_advisor.check_indexed_access_paths(empty_db)[index_name]
@@ -0,0 +1,115 @@
+import itertools
+import random
+import pytest
+from logic.model.linkage_resolver import LinkageResolver, resolve_tracks, resolve_albums
+
+
+# region Tracks
+
+def test_chain_resolves_to_its_end():
+    assert resolve_tracks([('A', 'B'), ('B', 'C')]) == {'A': 'C', 'B': 'C', 'C': 'C'}
+
+
+def test_chain_with_self_links_resolves_to_its_end():
+    assert resolve_tracks([('A', 'B'), ('B', 'C'), ('C', 'C')]) == {'A': 'C', 'B': 'C', 'C': 'C'}
+
+
+def test_track_linked_to_itself_resolves_to_itself():
+    assert resolve_tracks([('A', 'A')]) == {'A': 'A'}
+
+
+def test_separate_chains_are_not_merged():
+    assert resolve_tracks([('A', 'B'), ('X', 'Y')]) == {'A': 'B', 'B': 'B', 'X': 'Y', 'Y': 'Y'}
+
+
+def test_chains_that_join_resolve_to_the_same_end():
+    assert resolve_tracks([('A', 'C'), ('B', 'C'), ('C', 'D')]) == {'A': 'D', 'B': 'D', 'C': 'D', 'D': 'D'}
+
+
+def test_cycle_resolves_to_its_smallest_id():
+    assert resolve_tracks([('B', 'C'), ('C', 'A'), ('A', 'B')]) == {'A': 'A', 'B': 'A', 'C': 'A'}
+
+
+def test_cycle_with_an_exit_resolves_to_the_exit():
+    assert resolve_tracks([('A', 'B'), ('B', 'A'), ('B', 'Z')]) == {'A': 'Z', 'B': 'Z', 'Z': 'Z'}
+
+
+@pytest.mark.parametrize('links', [[('A', 'B'), ('B', 'C'), ('D', 'C'), ('E', 'F')],
+                                   [('A', 'B'), ('B', 'C'), ('C', 'A'), ('D', 'A')],
+                                   [('A', 'B'), ('C', 'D'), ('B', 'C'), ('E', 'E')]])
+def test_resolution_does_not_depend_on_links_order(links):
+    expected = resolve_tracks(links)
+
+    for links_permutation in itertools.permutations(links):
+        assert resolve_tracks(links_permutation) == expected
+
+
+def test_resolution_of_a_long_chain_does_not_depend_on_links_order():
+    links = [(f"t{i:04}", f"t{i + 1:04}") for i in range(1000)]
+    shuffled_links = links.copy()
+    random.Random(0).shuffle(shuffled_links)
+
+    assert resolve_tracks(shuffled_links) == resolve_tracks(links) == {f"t{i:04}": 't1000' for i in range(1001)}
+
+
+def test_known_id_is_preferred_over_the_end_of_the_chain():
+    resolver = LinkageResolver()
+    resolver.add('B', is_known = True)
+    resolver.link('A', 'B')
+    resolver.link('B', 'C')
+
+    assert resolver.get_known_ids_map() == {'A': 'B', 'B': 'B', 'C': 'B'}
+
+
+def test_known_id_of_an_id_that_was_not_added_raises():
+    resolver = LinkageResolver()
+    resolver.link('A', 'B')
+
+    assert 'A' in resolver and len(resolver) == 2
+
+    with pytest.raises(KeyError):
+        resolver.get_known_id('C')
+
+# endregion Tracks
+
+
+# region Albums
+
+def test_album_of_an_up_to_date_track_resolves_to_itself():
+    assert resolve_albums([('K', 't1')], {'t1': 't1'}) == {'K': 'K'}
+
+
+def test_suspected_album_resolves_to_the_album_of_its_known_track():
+    assert resolve_albums([('OLD', 'o1'), ('K', 't1')], {'o1': 't1', 't1': 't1'}) == {'OLD': 'K', 'K': 'K'}
+
+
+def test_suspected_album_resolves_through_a_chain_of_tracks():
+    tracks_ids_map = resolve_tracks([('o1', 'o2'), ('o2', 't1')])
+
+    assert resolve_albums([('OLD', 'o1'), ('K', 't1')], tracks_ids_map) == {'OLD': 'K', 'K': 'K'}
+
+
+def test_album_reachable_from_several_known_albums_resolves_to_the_smallest():
+    albums_tracks = [('K2', 't1'), ('K1', 't2'), ('K3', 't1'), ('OLD', 'o1'), ('OLD', 'o2')]
+    tracks_ids_map = {'o1': 't1', 'o2': 't2'}
+
+    for albums_tracks_permutation in itertools.permutations(albums_tracks):
+        assert resolve_albums(albums_tracks_permutation, tracks_ids_map) == {'K1' : 'K1',
+                                                                             'K2' : 'K2',
+                                                                             'K3' : 'K3',
+                                                                             'OLD': 'K1'}
+
+
+def test_known_albums_with_the_same_tracks_are_not_merged():
+    assert resolve_albums([('ALBUM', 't1'), ('COMPILATION', 't1')], {}) == {'ALBUM'      : 'ALBUM',
+                                                                           'COMPILATION': 'COMPILATION'}
+
+
+def test_album_with_any_up_to_date_track_is_known():
+    assert resolve_albums([('A', 'o1'), ('A', 't2'), ('K', 't1')], {'o1': 't1'}) == {'A': 'A', 'K': 'K'}
+
+
+def test_unresolved_suspected_album_resolves_to_itself():
+    assert resolve_albums([('OLD', 'o1'), ('K', 't1')], {'o1': 't9'}) == {'OLD': 'OLD', 'K': 'K'}
+
+# endregion Albums